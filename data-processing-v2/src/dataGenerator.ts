@@ -1,9 +1,10 @@
-import { mkdir, writeFile, readFile, readdir } from 'fs/promises';
+import { mkdir, writeFile, readFile, readdir, rm } from 'fs/promises';
 import { join, dirname } from 'path';
 import { createHash } from 'crypto';
 import { contentHash, createFilename, contentHashString } from './contentHash.js';
 import { parseYAML, extractInstrumentations, extractTags, hasTelemetry } from './yamlParser.js';
 import { fetchConventionMappings } from './semconvFetcher.js';
+import { normalizeVersion } from './versionDetector.js';
 import { setSemanticConventionMappings, analyzeMetric, analyzeSpan } from './semconvAnalyzer.js';
 import {
   InstrumentationData,
@@ -13,7 +14,10 @@ import {
   VersionInfo,
   VersionManifest,
   InstrumentationReference,
-  HashMapping
+  HashMapping,
+  LibraryChangeSet,
+  LibraryVersionChanges,
+  ReadmeManifest
 } from './types.js';
 
 export interface VersionConfig {
@@ -26,6 +30,8 @@ export interface GeneratorOptions {
   versions: VersionConfig[];
   outputDir: string;
   baseUrl?: string;
+  readmeDir?: string;  // Defaults to <project root>/data/library_readme
+  changes?: LibraryChangeSet;  // Update the previous output in outputDir, rebuilding only these libraries
 }
 
 export class DataGenerator {
@@ -34,6 +40,9 @@ export class DataGenerator {
   private markdownHashToFile = new Map<string, string>();
   private markdownHashToContent = new Map<string, string>();
   private versionManifests: VersionManifest[] = [];
+  private readmeManifest?: Promise<ReadmeManifest | null>;
+  private readmeFiles?: Promise<string[]>;
+  private pendingWrites: Promise<void>[] = [];
   private options: GeneratorOptions;
 
   constructor(options: GeneratorOptions) {
@@ -66,7 +75,11 @@ export class DataGenerator {
     // Process each version
     for (const versionConfig of this.options.versions) {
       console.log(`Processing version ${versionConfig.version}...`);
-      await this.processVersion(versionConfig);
+      if (this.options.changes) {
+        await this.updateVersion(versionConfig);
+      } else {
+        await this.processVersion(versionConfig);
+      }
     }
 
     // Generate index.json (lightweight)
@@ -77,6 +90,14 @@ export class DataGenerator {
     console.log('Generating versions.json...');
     await this.generateVersionsList();
 
+    // Content files are written in the background while versions are processed
+    await Promise.all(this.pendingWrites);
+
+    if (this.options.changes) {
+      console.log('Removing unreferenced files...');
+      await this.removeUnreferencedFiles();
+    }
+
     console.log(`✅ Generation complete! Output in: ${this.options.outputDir}`);
     console.log(`   Total unique instrumentations: ${this.hashToFile.size}`);
     console.log(`   Total unique markdown files: ${this.markdownHashToFile.size}`);
@@ -129,21 +150,128 @@ export class DataGenerator {
 
     console.log(`  New/changed instrumentations: ${newCount}`);
 
-    // Create version manifest
+    await this.saveVersionManifest(config, versionRefs, instrumentations.length, newCount);
+  }
+
+  /**
+   * Update a single version in a previous output. Libraries listed in the change
+   * set (or missing from the previous manifest) are rebuilt; every other
+   * reference is reused as is. Versions without a previous manifest, or new
+   * since the previous output, are processed in full.
+   */
+  private async updateVersion(config: VersionConfig): Promise<void> {
+    const previous = await this.readOutputJson<VersionManifest>(join('versions', `${config.version}.json`));
+    const changes = this.findVersionChanges(config.version);
+    if (!previous || changes?.previous === false) {
+      await this.processVersion(config);
+      return;
+    }
+
+    const versionRefs: Record<string, InstrumentationReference> = {};
+    let totalCount = previous.metadata.total_count;
+    let newCount = 0;
+    let rebuiltCount = 0;
+
+    if (changes) {
+      const rebuild = new Set([...changes.added, ...changes.changed]);
+      const instrumentations = extractInstrumentations(await parseYAML(config.yamlPath));
+      totalCount = instrumentations.length;
+
+      for (const instr of instrumentations) {
+        const previousRef = previous.instrumentations[instr.id];
+        if (previousRef && !rebuild.has(instr.id)) {
+          versionRefs[instr.id] = previousRef;
+          if (this.reuseInstrumentation(previousRef)) {
+            newCount++;
+          }
+          continue;
+        }
+
+        let analyzedInstr = this.analyzeTelemetry(instr);
+        analyzedInstr = await this.addMarkdownReference(analyzedInstr, config.version);
+
+        const { hash, url, filename, isNew } = this.writeInstrumentation(analyzedInstr);
+        versionRefs[instr.id] = { hash, url, filename };
+        rebuiltCount++;
+
+        if (isNew) {
+          newCount++;
+        }
+      }
+    } else {
+      for (const [id, ref] of Object.entries(previous.instrumentations)) {
+        versionRefs[id] = ref;
+        if (this.reuseInstrumentation(ref)) {
+          newCount++;
+        }
+      }
+    }
+
+    console.log(`  Rebuilt instrumentations: ${rebuiltCount}, reused: ${Object.keys(versionRefs).length - rebuiltCount}`);
+
+    await this.saveVersionManifest(config, versionRefs, totalCount, newCount, previous);
+  }
+
+  /**
+   * Find the change set entry of a version (change sets use snapshot versions, e.g. '2.25')
+   */
+  private findVersionChanges(version: string): LibraryVersionChanges | undefined {
+    const versions = this.options.changes?.versions ?? {};
+    const key = Object.keys(versions).find(v => v === version || normalizeVersion(v) === version);
+    return key ? versions[key] : undefined;
+  }
+
+  /**
+   * Register an instrumentation file kept from the previous output.
+   * Returns true if no earlier version references it (counted as new/changed).
+   */
+  private reuseInstrumentation(ref: InstrumentationReference): boolean {
+    if (this.hashToFile.has(ref.hash)) {
+      return false;
+    }
+    this.hashToFile.set(ref.hash, ref.url);
+    return true;
+  }
+
+  /**
+   * Create and write a version manifest; unchanged manifests are not rewritten
+   */
+  private async saveVersionManifest(
+    config: VersionConfig,
+    versionRefs: Record<string, InstrumentationReference>,
+    totalCount: number,
+    newCount: number,
+    previous?: VersionManifest
+  ): Promise<void> {
     const manifest: VersionManifest = {
       version: config.version,
       agent_version: config.version,
       instrumentations: versionRefs,
       metadata: {
-        total_count: instrumentations.length,
+        total_count: totalCount,
         changed_from_previous: this.versionManifests.length > 0 ? newCount : undefined
       }
     };
 
     this.versionManifests.push(manifest);
 
+    const content = JSON.stringify(manifest, null, 2);
+    if (previous && JSON.stringify(previous, null, 2) === content) {
+      return;
+    }
     const manifestPath = join(this.options.outputDir, 'versions', `${config.version}.json`);
-    await writeFile(manifestPath, JSON.stringify(manifest, null, 2));
+    await writeFile(manifestPath, content);
+  }
+
+  /**
+   * Read a JSON file from the previous output; null if it does not exist
+   */
+  private async readOutputJson<T>(path: string): Promise<T | null> {
+    try {
+      return JSON.parse(await readFile(join(this.options.outputDir, path), 'utf-8')) as T;
+    } catch {
+      return null;
+    }
   }
 
   /**
@@ -177,42 +305,82 @@ export class DataGenerator {
     };
   }
 
+  /**
+   * Shared README directory written by scripts/update-library-readmes.py
+   */
+  private getReadmeDir(): string {
+    if (this.options.readmeDir) {
+      return this.options.readmeDir;
+    }
+    const projectRoot = dirname(dirname(dirname(this.options.outputDir)));
+    return join(projectRoot, 'data', 'library_readme');
+  }
+
+  /**
+   * Load the README manifest once; null if it does not exist yet
+   */
+  private loadReadmeManifest(): Promise<ReadmeManifest | null> {
+    if (!this.readmeManifest) {
+      const manifestPath = join(dirname(this.getReadmeDir()), 'library_readme_manifest.json');
+      this.readmeManifest = readFile(manifestPath, 'utf-8')
+        .then(content => JSON.parse(content) as ReadmeManifest)
+        .catch(() => null);
+    }
+    return this.readmeManifest;
+  }
+
+  /**
+   * Find the README filename for an instrumentation in a version.
+   * The manifest is authoritative when present; without one, fall back to
+   * scanning the directory (once) for {id}-{hash}.md.
+   */
+  private async findReadmeFile(id: string, version: string): Promise<string | undefined> {
+    const manifest = await this.loadReadmeManifest();
+    if (manifest) {
+      // Manifest versions are releases (2.25.0); generator versions are minors (2.25)
+      const releases = Object.keys(manifest.versions)
+        .filter(release => release === version || release.startsWith(`${version}.`))
+        .sort((a, b) => Number(a.split('.')[2] ?? 0) - Number(b.split('.')[2] ?? 0));
+      if (releases.length > 0) {
+        return manifest.versions[releases[releases.length - 1]].readmes[id];
+      }
+      return manifest.current[id];
+    }
+
+    if (!this.readmeFiles) {
+      this.readmeFiles = readdir(this.getReadmeDir()).catch(() => []);
+    }
+    const pattern = new RegExp(`^${id.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}-[0-9a-f]{12}\\.md$`);
+    return (await this.readmeFiles).find(file => pattern.test(file));
+  }
+
   /**
    * Add markdown content reference to instrumentation data
    */
   private async addMarkdownReference(data: InstrumentationData, version: string): Promise<InstrumentationData> {
-    const projectRoot = dirname(dirname(dirname(this.options.outputDir)));
-    const sharedReadmeDir = join(projectRoot, 'data', 'library_readme');
+    const file = await this.findReadmeFile(data.id, version);
+    const match = file?.match(/-([0-9a-f]{12})\.md$/);
+    if (!file || !match) {
+      // No README found for this instrumentation
+      return data;
+    }
 
     try {
-      // Look for files matching pattern: {id}-{hash}.md
-      const files = await readdir(sharedReadmeDir);
-      const pattern = new RegExp(`^${data.id.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}-([0-9a-f]{12})\\.md$`);
-
-      for (const file of files) {
-        const match = file.match(pattern);
-        if (match) {
-          // Found matching README
-          const readmePath = join(sharedReadmeDir, file);
-          const markdownContent = await readFile(readmePath, 'utf-8');
-          const hash = match[1]; // Extract hash from filename
-
-          // Write to frontend markdown directory (with ID prefix)
-          const { url } = this.writeMarkdown(markdownContent, data.id, hash);
-
-          return {
-            ...data,
-            markdown_hash: hash,
-            markdown_url: url
-          };
-        }
-      }
+      const markdownContent = await readFile(join(this.getReadmeDir(), file), 'utf-8');
+      const hash = match[1]; // Extract hash from filename
+
+      // Write to frontend markdown directory (with ID prefix)
+      const { url } = this.writeMarkdown(markdownContent, data.id, hash);
+
+      return {
+        ...data,
+        markdown_hash: hash,
+        markdown_url: url
+      };
     } catch (error) {
-      // Shared directory doesn't exist or no matching file - that's ok
+      // Listed README is missing on disk - that's ok
+      return data;
     }
-
-    // No README found for this instrumentation
-    return data;
   }
 
   /**
@@ -242,9 +410,9 @@ export class DataGenerator {
     this.markdownHashToContent.set(contentHash, content);
 
     const fullPath = join(this.options.outputDir, filepath);
-    writeFile(fullPath, content, 'utf-8').catch(err => {
+    this.pendingWrites.push(writeFile(fullPath, content, 'utf-8').catch(err => {
       console.error(`Failed to write ${fullPath}:`, err);
-    });
+    }));
 
     return { hash: contentHash, url };
   }
@@ -260,6 +428,10 @@ export class DataGenerator {
 
     // Check if we already have this exact file
     if (this.hashToFile.has(hash)) {
+      // The file may come from a previous output (incremental updates)
+      if (!this.hashToData.has(hash)) {
+        this.hashToData.set(hash, data);
+      }
       return {
         hash,
         url: this.hashToFile.get(hash)!,
@@ -274,9 +446,9 @@ export class DataGenerator {
     this.hashToData.set(hash, data);
 
     const fullPath = join(this.options.outputDir, filepath);
-    writeFile(fullPath, JSON.stringify(data, null, 2)).catch(err => {
+    this.pendingWrites.push(writeFile(fullPath, JSON.stringify(data, null, 2)).catch(err => {
       console.error(`Failed to write ${fullPath}:`, err);
-    });
+    }));
 
     return { hash, url, data, filename, isNew: true };
   }
@@ -295,10 +467,27 @@ export class DataGenerator {
       throw new Error('No latest version found');
     }
 
+    // Incremental updates keep the previous entries of libraries that were not rebuilt
+    const previousIndex = this.options.changes ? await this.readOutputJson<IndexData>('index.json') : null;
+    const previousEntries = new Map<string, IndexInstrumentation>(
+      previousIndex && previousIndex.latest_version === latestManifest.version
+        ? previousIndex.instrumentations.map(entry => [entry.id, entry] as const)
+        : []
+    );
+
     const indexInstrumentations: IndexInstrumentation[] = [];
 
     for (const [id, ref] of Object.entries(latestManifest.instrumentations)) {
-      const data = this.hashToData.get(ref.hash);
+      let data = this.hashToData.get(ref.hash);
+
+      if (!data && this.options.changes) {
+        const previousEntry = previousEntries.get(id);
+        if (previousEntry) {
+          indexInstrumentations.push(previousEntry);
+          continue;
+        }
+        data = await this.readOutputJson<InstrumentationData>(join('instrumentations', ref.filename)) ?? undefined;
+      }
       
       if (!data) {
         console.warn(`Warning: No data found for hash ${ref.hash} (${id})`);
@@ -342,6 +531,51 @@ export class DataGenerator {
     await writeFile(versionsPath, JSON.stringify(versionsData, null, 2));
   }
 
+  /**
+   * After an incremental update, delete the version manifests, instrumentation
+   * files and markdown files that no version references any more
+   */
+  private async removeUnreferencedFiles(): Promise<void> {
+    const manifests = new Set(this.versionManifests.map(m => `${m.version}.json`));
+    const referenced = new Set(
+      this.versionManifests.flatMap(m => Object.values(m.instrumentations).map(ref => ref.filename))
+    );
+    const ids = new Set(this.versionManifests.flatMap(m => Object.keys(m.instrumentations)));
+
+    const removeUnlisted = async (dir: string, keep: (file: string) => boolean): Promise<number> => {
+      const files = await readdir(join(this.options.outputDir, dir)).catch(() => [] as string[]);
+      const stale = files.filter(file => !keep(file));
+      await Promise.all(stale.map(file => rm(join(this.options.outputDir, dir, file), { force: true })));
+      return stale.length;
+    };
+
+    const removedManifests = await removeUnlisted('versions', file => manifests.has(file));
+    const removedInstrumentations = await removeUnlisted('instrumentations', file => referenced.has(file));
+
+    // Markdown is shared by content hash, so only files named after a library that
+    // no version lists any more can be unreferenced; check those against the data
+    const markdownFiles = await readdir(join(this.options.outputDir, 'markdown')).catch(() => [] as string[]);
+    const candidates = markdownFiles.filter(file => !ids.has(file.replace(/-[0-9a-f]{12}\.md$/, '')));
+    let removedMarkdown = 0;
+    if (candidates.length > 0) {
+      // Data built during this run is still in memory; the rest is read back
+      const written = new Map<string, InstrumentationData>(
+        [...this.hashToData].map(([hash, data]) => [createFilename(data.id, hash, 'json'), data] as const)
+      );
+      const referencedMarkdown = new Set<string>();
+      for (const filename of referenced) {
+        const data = written.get(filename)
+          ?? await this.readOutputJson<InstrumentationData>(join('instrumentations', filename));
+        if (data?.markdown_url) {
+          referencedMarkdown.add(data.markdown_url.split('/').pop()!);
+        }
+      }
+      removedMarkdown = await removeUnlisted('markdown', file => !candidates.includes(file) || referencedMarkdown.has(file));
+    }
+
+    console.log(`   Removed ${removedManifests} manifests, ${removedInstrumentations} instrumentation files, ${removedMarkdown} markdown files`);
+  }
+
   /**
    * Get generation statistics
    */
@@ -1,8 +1,10 @@
 #!/usr/bin/env node
-import { join, dirname } from 'path';
+import { readFile } from 'fs/promises';
+import { join, dirname, resolve } from 'path';
 import { fileURLToPath } from 'url';
 import { DataGenerator, VersionConfig } from './dataGenerator.js';
 import { detectVersions, getLatestVersion, getRecentVersions } from './versionDetector.js';
+import { LibraryChangeSet } from './types.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
@@ -12,6 +14,8 @@ interface CliOptions {
   count?: number;
   versions?: string[];
   include3_0?: boolean;
+  changes?: string;
+  outputDir?: string;
 }
 
 function parseArgs(): CliOptions {
@@ -49,6 +53,16 @@ function parseArgs(): CliOptions {
   if (args.includes('--include-3.0')) {
     options.include3_0 = true;
   }
+
+  const changesIdx = args.indexOf('--changes');
+  if (changesIdx !== -1) {
+    options.changes = args[changesIdx + 1];
+  }
+
+  const outputIdx = args.indexOf('--output-dir');
+  if (outputIdx !== -1) {
+    options.outputDir = args[outputIdx + 1];
+  }
   
   return options;
 }
@@ -66,6 +80,9 @@ Options:
   --all                 Process all available versions
   --versions V1 V2...   Process specific versions (e.g., --versions 2.19.0 2.20.0)
   --include-3.0         Include the hypothetical 3.0 version
+  --output-dir DIR      Write the data to DIR (default: dist/output)
+  --changes FILE        Update the previous data in the output directory, rebuilding
+                        only the libraries listed in FILE (data/library_changes.json)
   -h, --help            Show this help message
 
 Examples:
@@ -74,11 +91,13 @@ Examples:
   npm run generate -- --recent 3      # Process 3 most recent versions
   npm run generate -- --all           # Process all versions
   npm run generate -- --versions 2.20.0   # Process only 2.20.0
+  npm run generate -- --changes ../data/library_changes.json --output-dir ../frontend/public/data
 
 Notes:
   - YAML files are auto-detected from instrumentation-list-*.yaml in repo root
   - Default behavior matches CI: process all versions including 3.0
   - The latest stable version is always marked as isLatest=true
+  - With --changes, versions without a previous manifest are generated in full
   `);
 }
 
@@ -93,7 +112,11 @@ async function main() {
   if (options.mode === 'recent') {
     console.log(`Count: ${options.count}`);
   }
-  console.log(`Include 3.0: ${options.include3_0}\n`);
+  console.log(`Include 3.0: ${options.include3_0}`);
+  if (options.changes) {
+    console.log(`Incremental: ${options.changes}`);
+  }
+  console.log();
 
   let detectedVersions: Awaited<ReturnType<typeof detectVersions>> = [];
 
@@ -170,12 +193,22 @@ async function main() {
       isLatest: v.isLatest
     }));
 
-    const outputDir = join(__dirname, '../output');
+    const outputDir = options.outputDir ? resolve(options.outputDir) : join(__dirname, '../output');
+
+    let changes: LibraryChangeSet | undefined;
+    if (options.changes) {
+      changes = JSON.parse(await readFile(options.changes, 'utf-8')) as LibraryChangeSet;
+      for (const [version, change] of Object.entries(changes.versions)) {
+        console.log(`   ${version}: ${change.added.length} added, ${change.changed.length} changed, ${change.removed.length} removed`);
+      }
+      console.log();
+    }
 
     const generator = new DataGenerator({
       versions,
       outputDir,
-      baseUrl: '/data'
+      baseUrl: '/data',
+      changes
     });
 
     await generator.generate();
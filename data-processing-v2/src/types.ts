@@ -113,6 +113,36 @@ export interface VersionManifest {
   };
 }
 
+/**
+ * Per-library change set written by scripts/update-instrumentation-list.py
+ * (data/library_changes.json), keyed by snapshot version (e.g. '2.25', '3.0')
+ */
+export interface LibraryChangeSet {
+  versions: Record<string, LibraryVersionChanges>;
+}
+
+export interface LibraryVersionChanges {
+  snapshot: string;   // e.g. 'instrumentation-list-2.25.yaml'
+  sha256: string;     // Snapshot hash after the change
+  previous: boolean;  // false if the version had no earlier snapshot
+  added: string[];
+  changed: string[];
+  removed: string[];
+}
+
+/**
+ * README manifest written by scripts/update-library-readmes.py
+ * (data/library_readme_manifest.json) - maps library IDs to README filenames
+ */
+export interface ReadmeManifest {
+  current: Record<string, string>;
+  versions: Record<string, {
+    source?: string;
+    commit_sha?: string;
+    readmes: Record<string, string>;
+  }>;
+}
+
 export interface InstrumentationReference {
   hash: string;
   url: string;
@@ -1,16 +1,29 @@
 import { describe, it, expect, beforeEach, afterEach } from 'vitest';
-import { mkdir, rm, readFile, writeFile } from 'fs/promises';
+import { mkdir, rm, readFile, readdir, writeFile } from 'fs/promises';
 import { join } from 'path';
 import { DataGenerator, VersionConfig } from '../src/dataGenerator.js';
 import {
   InstrumentationData,
   IndexData,
+  LibraryChangeSet,
   VersionsData,
   VersionManifest
 } from '../src/types.js';
 
 const TEST_OUTPUT_DIR = join(process.cwd(), 'tests', 'test-output');
 
+// Helper to read every generated file, keyed by relative path
+async function readOutput(dir: string): Promise<Record<string, string>> {
+  const files: Record<string, string> = {};
+  for (const sub of ['', 'versions', 'instrumentations', 'markdown']) {
+    const entries = await readdir(join(dir, sub), { withFileTypes: true });
+    for (const entry of entries.filter(e => e.isFile())) {
+      files[join(sub, entry.name)] = await readFile(join(dir, sub, entry.name), 'utf-8');
+    }
+  }
+  return files;
+}
+
 // Helper to create a mock YAML file
 async function createMockYAML(path: string, instrumentations: any[]) {
   const yaml = {
@@ -265,5 +278,103 @@ describe('DataGenerator', () => {
     const stats = generator.getStats();
     expect(stats.uniqueInstrumentations).toBe(2);
   });
-});
 
+  it('should pick READMEs from the README manifest', async () => {
+    const versions: VersionConfig[] = [
+      {
+        version: 'test-1.0',
+        yamlPath: join(TEST_OUTPUT_DIR, 'test-1.0.yaml'),
+        isLatest: true
+      }
+    ];
+
+    await createMockYAML(versions[0].yamlPath, [
+      { name: 'test-lib-1.0', display_name: 'Test Library' }
+    ]);
+
+    // A stale README sorts first; the manifest points at the current one
+    const readmeDir = join(TEST_OUTPUT_DIR, 'data', 'library_readme');
+    await mkdir(readmeDir, { recursive: true });
+    await writeFile(join(readmeDir, 'test-lib-1.0-000000000000.md'), '# Stale');
+    await writeFile(join(readmeDir, 'test-lib-1.0-111111111111.md'), '# Current');
+    await writeFile(join(TEST_OUTPUT_DIR, 'data', 'library_readme_manifest.json'), JSON.stringify({
+      current: { 'test-lib-1.0': 'test-lib-1.0-111111111111.md' },
+      versions: {}
+    }));
+
+    const outputDir = join(TEST_OUTPUT_DIR, 'output');
+    const generator = new DataGenerator({ versions, outputDir, readmeDir });
+
+    await generator.generate();
+
+    const manifest: VersionManifest = JSON.parse(
+      await readFile(join(outputDir, 'versions', 'test-1.0.json'), 'utf-8')
+    );
+    const ref = manifest.instrumentations['test-lib-1.0'];
+    const data: InstrumentationData = JSON.parse(
+      await readFile(join(outputDir, 'instrumentations', ref.filename), 'utf-8')
+    );
+
+    expect(data.markdown_hash).toBe('111111111111');
+  });
+
+  it('should update incrementally to the same output as a full run', async () => {
+    const versions: VersionConfig[] = [
+      {
+        version: 'test-1.0',
+        yamlPath: join(TEST_OUTPUT_DIR, 'test-1.0.yaml'),
+        isLatest: false
+      },
+      {
+        version: 'test-2.0',
+        yamlPath: join(TEST_OUTPUT_DIR, 'test-2.0.yaml'),
+        isLatest: true
+      }
+    ];
+
+    await createMockYAML(versions[0].yamlPath, [
+      { name: 'test-lib-1.0', display_name: 'Test Library' }
+    ]);
+    await createMockYAML(versions[1].yamlPath, [
+      { name: 'test-lib-1.0', display_name: 'Test Library' },
+      { name: 'test-lib-2.0', display_name: 'Another Library' },
+      { name: 'test-lib-3.0', display_name: 'Removed Library' }
+    ]);
+
+    const incrementalDir = join(TEST_OUTPUT_DIR, 'incremental');
+    await new DataGenerator({ versions, outputDir: incrementalDir }).generate();
+
+    // Upstream changes one library, adds one and removes one in the latest version
+    await createMockYAML(versions[1].yamlPath, [
+      { name: 'test-lib-1.0', display_name: 'Test Library' },
+      { name: 'test-lib-2.0', display_name: 'Another Library Updated' },
+      { name: 'test-lib-4.0', display_name: 'New Library' }
+    ]);
+    const changes: LibraryChangeSet = {
+      versions: {
+        'test-2.0': {
+          snapshot: 'test-2.0.yaml',
+          sha256: '',
+          previous: true,
+          added: ['test-lib-4.0'],
+          changed: ['test-lib-2.0'],
+          removed: ['test-lib-3.0']
+        }
+      }
+    };
+    const generator = new DataGenerator({ versions, outputDir: incrementalDir, changes });
+    await generator.generate();
+
+    const fullDir = join(TEST_OUTPUT_DIR, 'full');
+    await new DataGenerator({ versions, outputDir: fullDir }).generate();
+
+    expect(await readOutput(incrementalDir)).toEqual(await readOutput(fullDir));
+
+    // Only the changed and added libraries are new files
+    const manifest: VersionManifest = JSON.parse(
+      await readFile(join(incrementalDir, 'versions', 'test-2.0.json'), 'utf-8')
+    );
+    expect(Object.keys(manifest.instrumentations)).toEqual(['test-lib-1.0', 'test-lib-2.0', 'test-lib-4.0']);
+    expect(manifest.metadata.changed_from_previous).toBe(2);
+  });
+});
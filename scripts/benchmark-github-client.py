@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark GitHubClient and the refresh pipelines against the offline stand-in.
+This script starts github-stand-in.py in-process, runs the README and
+instrumentation-list pipelines against it under the configured latency,
+rate limit and error injection, and reports wall time and request counts.
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline_common import load_script
+from pipeline_github import GitHubClient, HTTPCache
+
+REPO = "open-telemetry/opentelemetry-java-instrumentation"
+
+
+def run_scenario(name, server, func, verbose=False):
+    """Run one scenario; returns a result row."""
+    server.state.reset_stats()
+    start = time.perf_counter()
+    with contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO()):
+        try:
+            outcome = func()
+        except SystemExit as e:
+            # The scripts exit on unrecoverable download errors
+            outcome = f"exited ({e.code})"
+    elapsed = time.perf_counter() - start
+    stats = server.state.stats()
+    return {
+        "name": name,
+        "seconds": elapsed,
+        "requests": stats["total"],
+        "statuses": stats["statuses"],
+        "outcome": outcome,
+    }
+
+
+def readme_scenario(readmes, search_index, server_url, data_dir, workers=1, cache_dir=None, use_index=False,
+                    bulk=False):
+    """
+    Build a README pipeline run against the stand-in writing into data_dir,
+    including the search index it updates, so the working tree is not touched.
+    """
+
+    def run():
+        readmes.get_readme_dir = lambda: Path(data_dir) / "library_readme"
+        readmes.update_search_index = lambda: search_index.update_index(
+            project_root=Path(data_dir),
+            output_dir=Path(data_dir) / "search-index",
+            sources_path=Path(data_dir) / "search-index-sources.json",
+        )
+        cache = HTTPCache(Path(cache_dir)) if cache_dir else None
+        client = GitHubClient(pool_size=max(workers, 10), cache=cache, base_url=server_url)
+        tag = client.get_latest_release_tag(REPO)
+        if not tag:
+            return "failed, no release tag"
+        ok = readmes.process_single_version(client, tag, workers=workers, use_index=use_index, bulk=bulk, delay=0)
+        version = readmes.load_readme_manifest()["versions"].get(tag.lstrip('v'), {})
+        saved = len(version.get("readmes", {}))
+        return f"{'ok' if ok else 'failed'}, {saved} READMEs"
+
+    return run
+
+
+def instrumentation_list_scenario(updater, server_url, data_dir):
+    """
+    Build an instrumentation-list run (download, parse, 3.0 transform, dump)
+    against the stand-in, keeping its tag index in data_dir.
+    """
+
+    def run():
+        updater.GITHUB_API_URL = server_url
+        updater.GITHUB_RAW_URL = server_url
+        updater.TAG_INDEX_PATH = Path(data_dir) / "github-tags.json"
+        version = updater.get_latest_release_version()
+        content = updater.get_latest_instrumentation_data()
+        data = updater.parse_instrumentation_yaml(content)
+        transformed = updater.generate_3_0_version(data)
+        updater.dump_instrumentation_yaml(transformed)
+        return f"version {version}, {len(content) // 1024}KB"
+
+    return run
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the refresh pipelines against the offline GitHub stand-in"
+    )
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Per-request latency in ms (default: 50).")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Requests allowed per window (default: 5000).")
+    parser.add_argument("--error-403-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a secondary-rate-limit 403 (default: 0).")
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a 502 (default: 0).")
+    parser.add_argument("--workers", type=int, default=8, help="Workers for the concurrent scenarios (default: 8).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for error injection (default: 1).")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipelines' own output.")
+    return parser.parse_args()
+
+
+def main():
+    """Start the stand-in, run every scenario and print a summary table."""
+    args = parse_arguments()
+    stand_in = load_script("github-stand-in")
+    readmes = load_script("update-library-readmes")
+    search_index = load_script("search-index")
+    updater = load_script("update-instrumentation-list")
+
+    fixture = stand_in.RepositoryFixture(Path(__file__).parent.parent)
+    state = stand_in.StandInState(
+        fixture,
+        latency=args.latency_ms / 1000,
+        rate_limit=args.rate_limit,
+        error_403_rate=args.error_403_rate,
+        error_5xx_rate=args.error_5xx_rate,
+        seed=args.seed,
+    )
+    server = stand_in.StandInServer(state).start()
+
+    print(f"Stand-in at {server.url}: {fixture.tag}, {len(fixture.files)} files, "
+          f"{args.latency_ms:.0f}ms latency, 403 rate {args.error_403_rate}, 5xx rate {args.error_5xx_rate}\n")
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            cache_dir = tmp / "http-cache"
+            scenarios = [
+                ("readmes sequential", readme_scenario(readmes, search_index, server.url, tmp / "seq")),
+                (f"readmes {args.workers} workers",
+                 readme_scenario(readmes, search_index, server.url, tmp / "par", args.workers)),
+                ("readmes cold HTTP cache",
+                 readme_scenario(readmes, search_index, server.url, tmp / "cold", args.workers, cache_dir)),
+                ("readmes warm HTTP cache",
+                 readme_scenario(readmes, search_index, server.url, tmp / "warm", args.workers, cache_dir)),
+                ("readmes blob SHA index",
+                 readme_scenario(readmes, search_index, server.url, tmp / "par", args.workers, use_index=True)),
+                ("readmes index (2nd run)",
+                 readme_scenario(readmes, search_index, server.url, tmp / "par", args.workers, use_index=True)),
+                ("readmes bulk tarball", readme_scenario(readmes, search_index, server.url, tmp / "bulk", bulk=True)),
+                ("instrumentation list", instrumentation_list_scenario(updater, server.url, tmp)),
+            ]
+            for name, func in scenarios:
+                results.append(run_scenario(name, server, func, args.verbose))
+    finally:
+        server.stop()
+
+    print(f"{'Scenario':<28} {'Wall time':>10} {'Requests':>9}  {'Statuses':<32} Outcome")
+    print("-" * 108)
+    for row in results:
+        statuses = ", ".join(f"{k}:{v}" for k, v in row["statuses"].items())
+        print(f"{row['name']:<28} {row['seconds']:>9.2f}s {row['requests']:>9}  {statuses:<32} {row['outcome']}")
+
+
+if __name__ == "__main__":
+    main()
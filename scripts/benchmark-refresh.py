@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the data-refresh scripts.
+This script measures throughput and peak memory of the main steps of
+update-instrumentation-list.py and update-library-readmes.py against the real
+instrumentation-list-*.yaml snapshots and synthetic lists scaled up in
+libraries (and therefore telemetry blocks), to show how much headroom the
+daily job has as the upstream list grows.
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from pipeline_common import load_script
+
+
+def scale_instrumentation_list(data, factor):
+    """
+    Build a synthetic instrumentation list with `factor` times the libraries.
+    Each copy keeps its versions and telemetry blocks, so telemetry scales too.
+    """
+    if factor == 1:
+        return data
+    libraries = {}
+    for copy_index in range(factor):
+        suffix = "" if copy_index == 0 else f"-copy{copy_index}"
+        for group, versions in data['libraries'].items():
+            new_versions = []
+            for version in versions:
+                new_version = copy.deepcopy(version)
+                if 'name' in new_version:
+                    new_version['name'] = f"{new_version['name']}{suffix}"
+                if 'source_path' in new_version:
+                    new_version['source_path'] = f"{new_version['source_path']}{suffix}"
+                new_versions.append(new_version)
+            libraries[f"{group}{suffix}"] = new_versions
+    scaled = dict(data)
+    scaled['libraries'] = libraries
+    return scaled
+
+
+def synthetic_tree(data):
+    """Build a GitHub tree listing resembling the upstream repo for a list."""
+    tree = []
+    for versions in data['libraries'].values():
+        for version in versions:
+            source_path = version.get('source_path') or f"instrumentation/{version.get('name', 'unknown')}"
+            for module in ("javaagent", "library", "testing"):
+                base = f"{source_path}/{module}"
+                tree.append({"path": base, "type": "tree", "sha": "0" * 40})
+                for filename in ("build.gradle.kts", "src/main/java/Instrumentation.java", "src/test/java/InstrumentationTest.java"):
+                    tree.append({"path": f"{base}/{filename}", "type": "blob", "sha": "1" * 40})
+            tree.append({"path": f"{source_path}/library/README.md", "type": "blob", "sha": "2" * 40})
+    return {"tree": tree, "truncated": False}
+
+
+class TreeOnlyClient:
+    """Stand-in client that serves a fixed tree listing."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def get_repository_tree(self, repository, commit_sha):
+        return self.tree
+
+
+def measure(func, track_memory):
+    """Run func once; return (result, seconds, peak bytes or None)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+
+        peak = None
+        if track_memory:
+            # Separate run so tracemalloc overhead does not skew the timing
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_rate(amount, unit, seconds):
+    """Format a throughput figure, using MB/s for byte counts."""
+    if seconds <= 0:
+        return "-"
+    rate = amount / seconds
+    if unit == "B":
+        return f"{rate / 1024 / 1024:.1f} MB/s"
+    return f"{rate:,.0f} {unit}/s"
+
+
+def report(dataset, step, amount, unit, seconds, peak):
+    """Print one result row."""
+    peak_text = f"{peak / 1024 / 1024:.1f} MB" if peak is not None else "-"
+    print(f"{dataset:<34} {step:<20} {seconds:>9.3f}s {format_rate(amount, unit, seconds):>18} {peak_text:>10}")
+
+
+def benchmark_list(updater, readmes, dataset, content, data, track_memory):
+    """Run the instrumentation-list and tree-discovery benchmarks for one dataset."""
+    entries = sum(len(versions) for versions in data['libraries'].values())
+
+    _, seconds, peak = measure(lambda: updater.parse_instrumentation_yaml(content), track_memory)
+    report(dataset, "validate (parse)", len(content), "B", seconds, peak)
+
+    transformed, seconds, peak = measure(lambda: updater.generate_3_0_version(data), track_memory)
+    report(dataset, "generate_3_0", entries, "entries", seconds, peak)
+
+    _, seconds, peak = measure(lambda: updater.dump_instrumentation_yaml(transformed), track_memory)
+    report(dataset, "dump", len(content), "B", seconds, peak)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target = Path(tmp_dir) / "instrumentation-list-3.0.yaml"
+        _, seconds, peak = measure(lambda: updater.stream_3_0_version(io.StringIO(content), target), track_memory)
+        report(dataset, "generate_3_0 stream", len(content), "B", seconds, peak)
+
+    client = TreeOnlyClient(synthetic_tree(data))
+    tree_size = len(client.tree["tree"])
+    _, seconds, peak = measure(lambda: readmes.discover_library_readmes(client, "0" * 40, tree_mode="recursive"), track_memory)
+    report(dataset, "discover (tree)", tree_size, "entries", seconds, peak)
+
+
+def benchmark_readmes(readmes, readme_contents, factor, track_memory):
+    """Run the README hashing and saving benchmarks, with `factor` times the READMEs."""
+    dataset = f"library_readme x{factor}"
+    contents = [
+        (f"{name}-copy{i}" if i else name, content)
+        for i in range(factor)
+        for name, content in readme_contents
+    ]
+    total_bytes = sum(len(content.encode('utf-8')) for _, content in contents)
+
+    _, seconds, peak = measure(lambda: [readmes.compute_content_hash(c) for _, c in contents], track_memory)
+    report(dataset, "compute_content_hash", total_bytes, "B", seconds, peak)
+
+    original_get_readme_dir = readmes.get_readme_dir
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        readmes.get_readme_dir = lambda: Path(tmp_dir)
+        try:
+            def save_all():
+                for name, content in contents:
+                    readmes.save_readme(content, name)
+
+            # The first pass writes every file; later passes take the "unchanged" path
+            _, seconds, _ = measure(save_all, False)
+            report(dataset, "save_readme (new)", len(contents), "files", seconds, None)
+            _, seconds, peak = measure(save_all, track_memory)
+            report(dataset, "save_readme (same)", len(contents), "files", seconds, peak)
+        finally:
+            readmes.get_readme_dir = original_get_readme_dir
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the data-refresh scripts against real and synthetic inputs"
+    )
+    parser.add_argument(
+        "--scales",
+        type=str,
+        default="10,100",
+        help="Comma-separated synthetic scale factors applied to the latest snapshot (default: 10,100)."
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the tracemalloc peak-memory runs."
+    )
+    parser.add_argument(
+        "--skip-snapshots",
+        action="store_true",
+        help="Only run the synthetic datasets."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Run the benchmark suite and print a results table."""
+    args = parse_arguments()
+    track_memory = not args.no_memory
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+
+    updater = load_script("update-instrumentation-list")
+    readmes = load_script("update-library-readmes")
+    project_root = Path(__file__).parent.parent
+
+    snapshots = sorted(project_root.glob("instrumentation-list-*.yaml"))
+    if not snapshots:
+        print("No instrumentation-list-*.yaml files found")
+        sys.exit(1)
+
+    print(f"YAML backend: {updater.YamlLoader.__name__} / {updater.YamlDumper.__name__}")
+    print(f"{'Dataset':<34} {'Step':<20} {'Time':>10} {'Throughput':>18} {'Peak mem':>10}")
+    print("-" * 96)
+
+    if not args.skip_snapshots:
+        for path in snapshots:
+            content = path.read_text(encoding='utf-8')
+            data = updater.parse_instrumentation_yaml(content)
+            benchmark_list(updater, readmes, path.name, content, data, track_memory)
+
+    # Synthetic lists are derived from the newest stable snapshot
+    stable = [p for p in snapshots if p.name != "instrumentation-list-3.0.yaml"] or snapshots
+    base_path = max(stable, key=lambda p: [int(x) for x in p.stem.split("-")[-1].split(".") if x.isdigit()])
+    base_data = updater.parse_instrumentation_yaml(base_path.read_text(encoding='utf-8'))
+    for factor in scales:
+        data = scale_instrumentation_list(base_data, factor)
+        content = updater.dump_instrumentation_yaml(data)
+        benchmark_list(updater, readmes, f"{base_path.stem} x{factor}", content, data, track_memory)
+
+    readme_dir = project_root / "data" / "library_readme"
+    readme_contents = [
+        (path.stem[:-13], path.read_text(encoding='utf-8'))
+        for path in sorted(readme_dir.glob("*.md"))
+    ]
+    if readme_contents:
+        for factor in [1] + scales:
+            benchmark_readmes(readmes, readme_contents, factor, track_memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Script to compare YAML parse/dump timings for the instrumentation lists.
+This script times the previous pure-Python double-parse path against the
+single-parse libyaml path used by update-instrumentation-list.py, for every
+instrumentation-list-*.yaml file in the project root.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import yaml
+from pathlib import Path
+
+from pipeline_common import load_script
+
+
+def best_of(repeat, func):
+    """Return the fastest wall time (seconds) of `repeat` calls to func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_file(updater, content, repeat):
+    """Time both pipelines on one instrumentation list; returns (baseline, single_parse)."""
+
+    def baseline():
+        # Previous behaviour: validate, parse again for 3.0, pure-Python dump
+        yaml.safe_load(content)
+        data = yaml.safe_load(content)
+        transformed = updater.generate_3_0_version(data)
+        yaml.dump(transformed, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+    def single_parse():
+        data = updater.parse_instrumentation_yaml(content)
+        transformed = updater.generate_3_0_version(data)
+        updater.dump_instrumentation_yaml(transformed)
+
+    return best_of(repeat, baseline), best_of(repeat, single_parse)
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare YAML parse/dump timings across instrumentation-list-*.yaml files"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of runs per measurement; the fastest is reported (default: 3)."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Run the timing comparison and print a table."""
+    args = parse_arguments()
+    updater = load_script("update-instrumentation-list")
+    project_root = Path(__file__).parent.parent
+
+    files = sorted(project_root.glob("instrumentation-list-*.yaml"))
+    if not files:
+        print("No instrumentation-list-*.yaml files found")
+        sys.exit(1)
+
+    print(f"Loader: {updater.YamlLoader.__name__}, Dumper: {updater.YamlDumper.__name__}")
+    print(f"Best of {args.repeat} runs\n")
+    print(f"{'File':<34} {'Size':>8} {'Baseline':>10} {'Single':>10} {'Speedup':>8}")
+    print("-" * 74)
+
+    total_baseline = 0.0
+    total_single = 0.0
+    for path in files:
+        content = path.read_text(encoding="utf-8")
+        baseline, single = time_file(updater, content, args.repeat)
+        total_baseline += baseline
+        total_single += single
+        print(f"{path.name:<34} {len(content) // 1024:>6}KB {baseline:>9.3f}s {single:>9.3f}s {baseline / single:>7.1f}x")
+
+    print("-" * 74)
+    print(f"{'Total':<34} {'':>8} {total_baseline:>9.3f}s {total_single:>9.3f}s {total_baseline / total_single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
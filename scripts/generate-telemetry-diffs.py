@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Script to precompute telemetry diffs between adjacent instrumentation-list snapshots.
+This script compares each pair of consecutive instrumentation-list-*.yaml files and
+writes one JSON file per pair, keyed by library, listing the metrics, spans,
+attributes and configurations that were added or removed.
+
+Library entries and telemetry blocks are hashed first, so identical subtrees are
+skipped without being walked. Each output records the content hashes of its two
+snapshots; pairs whose snapshots are unchanged are not recomputed, so adding a new
+release only parses and diffs the new pair.
+
+This is a standalone tool for reviewing what changed between releases; the
+pipeline does not run it and the frontend diffs versions itself, so the output
+goes to .cache/telemetry-diffs/ and is not committed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import yaml
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pipeline_common import YamlLoader, get_project_root, list_snapshots
+
+# Bump when the diff output changes shape so existing pair files are recomputed
+DIFF_FORMAT = 1
+
+
+def get_diff_dir() -> Path:
+    """Return the directory the pair diffs are written to."""
+    return get_project_root() / ".cache" / "telemetry-diffs"
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def hash_value(value) -> str:
+    """Return a stable hash of a parsed YAML subtree."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Snapshot:
+    """A parsed instrumentation list with per-library and per-block hashes."""
+
+    def __init__(self, path: Path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=YamlLoader) or {}
+        self.libraries: Dict[str, dict] = {}
+        for libraries in (data.get("libraries") or {}).values():
+            for library in libraries or []:
+                if library.get("name"):
+                    self.libraries[library["name"]] = library
+        self.library_hashes = {name: hash_value(library) for name, library in self.libraries.items()}
+
+    def telemetry_blocks(self, name: str) -> Dict[str, Tuple[str, dict]]:
+        """Return {when: (hash, block)} for a library's telemetry."""
+        blocks = {}
+        for block in self.libraries[name].get("telemetry") or []:
+            blocks[block.get("when", "default")] = (hash_value(block), block)
+        return blocks
+
+
+def block_items(when: str, block: dict) -> Tuple[set, set, set]:
+    """Return the (metric, span, attribute) identities found in one telemetry block."""
+    metrics, spans, attributes = set(), set(), set()
+    for metric in block.get("metrics") or []:
+        metrics.add((when, metric.get("name")))
+        for attribute in metric.get("attributes") or []:
+            attributes.add((when, f"metric:{metric.get('name')}", attribute.get("name")))
+    for span in block.get("spans") or []:
+        spans.add((when, span.get("span_kind")))
+        for attribute in span.get("attributes") or []:
+            attributes.add((when, f"span:{span.get('span_kind')}", attribute.get("name")))
+    return metrics, spans, attributes
+
+
+def configuration_names(library: Optional[dict]) -> set:
+    """Return the configuration option identities of a library entry."""
+    if not library:
+        return set()
+    return {(config["name"],) for config in library.get("configurations") or [] if config.get("name")}
+
+
+def added_removed(before: set, after: set, fields: Tuple[str, ...]) -> Dict[str, list]:
+    """Format the set difference of two identity sets as sorted dicts."""
+    result = {}
+    for key, items in (("added", after - before), ("removed", before - after)):
+        if items:
+            result[key] = [dict(zip(fields, item)) for item in sorted(items, key=str)]
+    return result
+
+
+def diff_library(name: str, base: Snapshot, compare: Snapshot) -> dict:
+    """Diff one library between two snapshots; only differing telemetry blocks are walked."""
+    in_base = name in base.libraries
+    in_compare = name in compare.libraries
+    base_blocks = base.telemetry_blocks(name) if in_base else {}
+    compare_blocks = compare.telemetry_blocks(name) if in_compare else {}
+
+    before = (set(), set(), set())
+    after = (set(), set(), set())
+    for when in set(base_blocks) | set(compare_blocks):
+        base_block = base_blocks.get(when)
+        compare_block = compare_blocks.get(when)
+        if base_block and compare_block and base_block[0] == compare_block[0]:
+            continue
+        if base_block:
+            for acc, items in zip(before, block_items(when, base_block[1])):
+                acc.update(items)
+        if compare_block:
+            for acc, items in zip(after, block_items(when, compare_block[1])):
+                acc.update(items)
+
+    diff = {"status": "changed" if in_base and in_compare else ("added" if in_compare else "removed")}
+    sections = {
+        "metrics": added_removed(before[0], after[0], ("when", "name")),
+        "spans": added_removed(before[1], after[1], ("when", "span_kind")),
+        "attributes": added_removed(before[2], after[2], ("when", "on", "name")),
+        "configurations": added_removed(
+            configuration_names(base.libraries.get(name)),
+            configuration_names(compare.libraries.get(name)),
+            ("name",),
+        ),
+    }
+    diff.update({section: changes for section, changes in sections.items() if changes})
+    return diff
+
+
+def diff_snapshots(base: Snapshot, compare: Snapshot) -> Dict[str, dict]:
+    """Diff two snapshots, skipping libraries whose entries hash identically."""
+    libraries = {}
+    for name in sorted(set(base.libraries) | set(compare.libraries)):
+        if base.library_hashes.get(name) == compare.library_hashes.get(name):
+            continue
+        diff = diff_library(name, base, compare)
+        # Entries can differ only in fields the diff does not report on (descriptions, links)
+        if diff["status"] != "changed" or len(diff) > 1:
+            libraries[name] = diff
+    return libraries
+
+
+def pair_filename(base_version: str, compare_version: str) -> str:
+    """Return the output filename for a version pair."""
+    return f"{base_version}_{compare_version}.json"
+
+
+def load_pair(path: Path) -> Optional[dict]:
+    """Load an existing pair diff, or None if missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Path, data) -> None:
+    """Write JSON atomically."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def generate_diffs(project_root: Path, output_dir: Path, force: bool = False) -> Tuple[int, int]:
+    """
+    Write a diff file for every adjacent snapshot pair plus an index.json.
+    Returns (computed, skipped) pair counts.
+    """
+    snapshots = list_snapshots(project_root)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    file_hashes = {version: hash_file(path) for version, path in snapshots}
+    parsed: Dict[str, Snapshot] = {}
+
+    def snapshot(version: str, path: Path) -> Snapshot:
+        if version not in parsed:
+            parsed[version] = Snapshot(path)
+        return parsed[version]
+
+    computed = skipped = 0
+    pairs = []
+    for (base_version, base_path), (compare_version, compare_path) in zip(snapshots, snapshots[1:]):
+        filename = pair_filename(base_version, compare_version)
+        existing = None if force else load_pair(output_dir / filename)
+        if (existing and existing.get("format") == DIFF_FORMAT
+                and existing.get("base_sha256") == file_hashes[base_version]
+                and existing.get("compare_sha256") == file_hashes[compare_version]):
+            print(f"Skipping {base_version} -> {compare_version}: snapshots unchanged")
+            libraries = existing["libraries"]
+            skipped += 1
+        else:
+            print(f"Diffing {base_version} -> {compare_version}...")
+            libraries = diff_snapshots(snapshot(base_version, base_path), snapshot(compare_version, compare_path))
+            write_json(output_dir / filename, {
+                "format": DIFF_FORMAT,
+                "base": base_version,
+                "compare": compare_version,
+                "base_sha256": file_hashes[base_version],
+                "compare_sha256": file_hashes[compare_version],
+                "libraries": libraries,
+            })
+            computed += 1
+        pairs.append({
+            "base": base_version,
+            "compare": compare_version,
+            "file": filename,
+            "changed_libraries": len(libraries),
+        })
+
+    # Drop diffs for pairs that are no longer adjacent (e.g. a snapshot was inserted)
+    current = {pair["file"] for pair in pairs}
+    for path in output_dir.glob("*_*.json"):
+        if path.name not in current:
+            path.unlink()
+
+    write_json(output_dir / "index.json", {"format": DIFF_FORMAT, "pairs": pairs})
+    return computed, skipped
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Precompute telemetry diffs between adjacent instrumentation-list snapshots"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory for the pair diffs (default: .cache/telemetry-diffs)."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute every pair even if its snapshots are unchanged."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_arguments()
+    project_root = get_project_root()
+    if not list_snapshots(project_root):
+        print("No instrumentation-list-*.yaml files found")
+        sys.exit(1)
+
+    computed, skipped = generate_diffs(project_root, args.output_dir or get_diff_dir(), args.force)
+    print(f"\nTelemetry diffs: {computed} computed, {skipped} unchanged")
+
+
+if __name__ == "__main__":
+    main()
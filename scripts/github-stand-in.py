@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the parts of the GitHub API used by the refresh scripts.
+This script serves the refs, releases, commits, trees, contents, tarball and
+raw endpoints for a synthetic opentelemetry-java-instrumentation repository
+built from data/library_readme/ and the latest instrumentation-list-*.yaml.
+Per-request latency, rate-limit headers and injected 403/5xx responses are
+configurable, so GitHubClient can be load-tested without network access.
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import random
+import re
+import tarfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+REPO = "open-telemetry/opentelemetry-java-instrumentation"
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Compute the git blob SHA-1 of some content."""
+    return hashlib.sha1(f"blob {len(content)}\0".encode('utf-8') + content).hexdigest()
+
+
+class RepositoryFixture:
+    """Synthetic repository contents for one release tag."""
+
+    def __init__(self, project_root: Path, filler_files: int = 20, tree_limit: Optional[int] = None,
+                 old_tags: int = 150):
+        project_root = Path(project_root)
+        self.files = {}
+        # Recursive tree listings longer than this are truncated, as GitHub does past its limit
+        self.tree_limit = tree_limit
+
+        # One README per library: the lexicographically last hashed file
+        readmes = {}
+        for path in sorted((project_root / "data" / "library_readme").glob("*.md")):
+            readmes[path.stem[:-13]] = path
+        for library_name, path in readmes.items():
+            base = f"instrumentation/{library_name}"
+            self.files[f"{base}/library/README.md"] = path.read_bytes()
+            for i in range(filler_files):
+                self.files[f"{base}/javaagent/src/main/java/File{i}.java"] = f"// {library_name} {i}\n".encode('utf-8')
+
+        snapshots = [p for p in project_root.glob("instrumentation-list-*.yaml") if p.stem != "instrumentation-list-3.0"]
+        latest = max(snapshots, key=lambda p: [int(x) for x in p.stem.split("-")[-1].split(".")], default=None)
+        if latest is not None:
+            self.files["docs/instrumentation-list.yaml"] = latest.read_bytes()
+            self.tag = f"v{latest.stem.split('-')[-1]}.0"
+        else:
+            self.tag = "v0.0.0"
+
+        self.blob_shas = {path: git_blob_sha(content) for path, content in self.files.items()}
+        self.commit_sha = hashlib.sha1("".join(sorted(self.blob_shas.values())).encode('utf-8')).hexdigest()
+        self._build_trees()
+
+        # Older releases as annotated tags (tag name -> tag object SHA), so ref listings
+        # paginate and need dereferencing like upstream's
+        self.annotated_tags = {
+            f"v1.{minor}.0": hashlib.sha1(f"tag v1.{minor}.0".encode('utf-8')).hexdigest()
+            for minor in range(old_tags)
+        }
+
+    def tag_refs(self, base_url: str) -> List[dict]:
+        """Return every tag ref, sorted by ref name, as the matching-refs API does."""
+        refs = [{"ref": f"refs/tags/{self.tag}", "object": {"type": "commit", "sha": self.commit_sha}}]
+        for tag, sha in self.annotated_tags.items():
+            refs.append({"ref": f"refs/tags/{tag}", "object": {
+                "type": "tag", "sha": sha, "url": f"{base_url}/repos/{REPO}/git/tags/{sha}"}})
+        return sorted(refs, key=lambda ref: ref["ref"])
+
+    def _build_trees(self):
+        """Index directories by a content-derived tree SHA, so unchanged directories keep their SHA."""
+        children: Dict[str, Dict[str, dict]] = {"": {}}
+        for path in self.files:
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                children.setdefault("/".join(parts[:i]), {})
+            parent = "/".join(parts[:-1])
+            children[parent][parts[-1]] = {"mode": "100644", "type": "blob", "sha": self.blob_shas[path],
+                                           "size": len(self.files[path])}
+
+        self.tree_shas: Dict[str, str] = {}
+        for directory in sorted(children, key=lambda d: d.count("/") if d else -1, reverse=True):
+            if directory:
+                parent, _, name = directory.rpartition("/")
+                children[parent][name] = {"mode": "040000", "type": "tree"}
+            lines = []
+            for name, entry in sorted(children[directory].items()):
+                if entry["type"] == "tree":
+                    entry["sha"] = self.tree_shas["/".join(filter(None, (directory, name)))]
+                lines.append(f"{entry['mode']} {entry['type']} {entry['sha']} {name}")
+            self.tree_shas[directory] = hashlib.sha1("\n".join(lines).encode('utf-8')).hexdigest()
+        self.directories = {sha: directory for directory, sha in self.tree_shas.items()}
+        self.children = children
+
+    def tree(self, sha: str, recursive: bool = False) -> Optional[dict]:
+        """
+        Return the listing of a tree (or of a commit's root tree), like the git trees
+        API: direct children only, or every entry below it when recursive.
+        """
+        directory = "" if sha == self.commit_sha else self.directories.get(sha)
+        if directory is None:
+            return None
+        entries = []
+        pending = [""]
+        while pending:
+            relative = pending.pop()
+            for name, entry in self.children["/".join(filter(None, (directory, relative)))].items():
+                path = "/".join(filter(None, (relative, name)))
+                entries.append(dict(entry, path=path))
+                if recursive and entry["type"] == "tree":
+                    pending.append(path)
+        entries.sort(key=lambda e: e["path"])
+        truncated = bool(recursive and self.tree_limit is not None and len(entries) > self.tree_limit)
+        if truncated:
+            entries = entries[:self.tree_limit]
+        return {"sha": self.tree_shas[directory], "tree": entries, "truncated": truncated}
+
+    def tarball(self):
+        """Build a gzipped tarball of the repository, GitHub-style prefixed."""
+        buffer = io.BytesIO()
+        prefix = f"{REPO.replace('/', '-')}-{self.commit_sha[:7]}"
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, content in sorted(self.files.items()):
+                info = tarfile.TarInfo(f"{prefix}/{path}")
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        return buffer.getvalue()
+
+
+class StandInState:
+    """Shared configuration and counters for the stand-in server."""
+
+    def __init__(self, fixture, latency=0.0, rate_limit=5000, rate_limit_window=3600,
+                 error_403_rate=0.0, error_5xx_rate=0.0, seed=None):
+        self.fixture = fixture
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.error_403_rate = error_403_rate
+        self.error_5xx_rate = error_5xx_rate
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + rate_limit_window
+        self.lock = threading.Lock()
+        self._tarball = None
+
+    def tarball(self):
+        if self._tarball is None:
+            self._tarball = self.fixture.tarball()
+        return self._tarball
+
+    def take_rate_limit(self):
+        """Consume one request from the budget; returns (allowed, remaining, reset)."""
+        with self.lock:
+            now = int(time.time())
+            if now >= self.reset_at:
+                self.remaining = self.rate_limit
+                self.reset_at = now + self.rate_limit_window
+            if self.remaining <= 0:
+                return False, 0, self.reset_at
+            self.remaining -= 1
+            return True, self.remaining, self.reset_at
+
+    def inject_error(self):
+        """Decide whether to fail this request; returns a status code or None."""
+        with self.lock:
+            roll = self.random.random()
+        if roll < self.error_403_rate:
+            return 403
+        if roll < self.error_403_rate + self.error_5xx_rate:
+            return 502
+        return None
+
+    def record(self, endpoint, status):
+        with self.lock:
+            self.requests[endpoint] += 1
+            self.statuses[status] += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "total": sum(self.requests.values()),
+                "endpoints": dict(sorted(self.requests.items())),
+                "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+                "rate_limit_remaining": self.remaining,
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.statuses.clear()
+
+
+ROUTES = [
+    ("refs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/refs/tags/(?P<tag>.+)$")),
+    ("matching_refs", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/matching-refs/(?P<ref>tags.*)$")),
+    ("tag_objects", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/tags/(?P<sha>[0-9a-f]+)$")),
+    ("tag_release", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/releases/tags/(?P<tag>.+)$")),
+    ("latest_release", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/releases/latest$")),
+    ("commits", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/commits$")),
+    ("trees", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/git/trees/(?P<sha>[^/]+)$")),
+    ("contents", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/contents/(?P<path>.+)$")),
+    ("tarball", re.compile(r"^/repos/(?P<repo>[^/]+/[^/]+)/tarball/(?P<ref>.+)$")),
+    ("raw", re.compile(r"^/(?P<repo>[^/]+/[^/]+)/(?P<ref>[^/]+)/(?P<path>docs/.+)$")),
+]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler serving the fixture repository."""
+
+    server_version = "GitHubStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == "/_stats":
+            self._send(200, self.state.stats(), endpoint=None)
+            return
+
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+        endpoint, match = "unknown", None
+        for name, pattern in ROUTES:
+            match = pattern.match(parsed.path)
+            if match:
+                endpoint = name
+                break
+
+        allowed, remaining, reset = self.state.take_rate_limit()
+        rate_headers = {
+            "X-RateLimit-Limit": str(self.state.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+        if not allowed:
+            self._send(403, {"message": "API rate limit exceeded"}, endpoint, rate_headers)
+            return
+
+        injected = self.state.inject_error()
+        if injected == 403:
+            headers = dict(rate_headers, **{"Retry-After": "1"})
+            self._send(403, {"message": "You have exceeded a secondary rate limit"}, endpoint, headers)
+            return
+        if injected:
+            self._send(injected, {"message": "Server Error"}, endpoint, rate_headers)
+            return
+
+        if match is None or match.group("repo") != REPO:
+            self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+            return
+
+        fixture = self.state.fixture
+        groups = match.groupdict()
+
+        base_url = f"http://{self.headers.get('Host', 'localhost')}"
+        if endpoint == "refs":
+            refs = [ref for ref in fixture.tag_refs(base_url) if ref["ref"] == f"refs/tags/{groups['tag']}"]
+            if not refs:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+            body = refs[0]
+        elif endpoint == "matching_refs":
+            prefix = "refs/" + groups["ref"]
+            refs = [ref for ref in fixture.tag_refs(base_url) if ref["ref"].startswith(prefix)]
+            per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+            page = int(query.get("page", ["1"])[0])
+            body = refs[(page - 1) * per_page:page * per_page]
+            if page * per_page < len(refs):
+                next_url = f"{base_url}{parsed.path}?per_page={per_page}&page={page + 1}"
+                rate_headers = dict(rate_headers, Link=f'<{next_url}>; rel="next"')
+        elif endpoint == "tag_objects":
+            tags = [tag for tag, sha in fixture.annotated_tags.items() if sha == groups["sha"]]
+            if not tags:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+            body = {"sha": groups["sha"], "tag": tags[0], "object": {"type": "commit", "sha": fixture.commit_sha}}
+        elif endpoint == "tag_release":
+            if groups["tag"] != fixture.tag:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+            body = {"tag_name": fixture.tag, "target_commitish": fixture.commit_sha}
+        elif endpoint == "latest_release":
+            body = {"tag_name": fixture.tag, "target_commitish": "main"}
+        elif endpoint == "commits":
+            body = [{"sha": fixture.commit_sha}]
+        elif endpoint == "trees":
+            body = fixture.tree(groups["sha"], recursive=query.get("recursive", ["0"])[0] not in ("0", "false"))
+            if body is None:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+        elif endpoint == "contents":
+            path = groups["path"]
+            if path not in fixture.files:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+            content = fixture.files[path]
+            body = {
+                "path": path,
+                "sha": fixture.blob_shas[path],
+                "encoding": "base64",
+                "content": base64.encodebytes(content).decode('ascii'),
+            }
+        elif endpoint == "tarball":
+            self._send_bytes(200, self.state.tarball(), "application/x-gzip", endpoint, rate_headers)
+            return
+        else:  # raw
+            path = groups["path"]
+            if path not in fixture.files:
+                self._send(404, {"message": "Not Found"}, endpoint, rate_headers)
+                return
+            self._send_bytes(200, fixture.files[path], "text/plain; charset=utf-8", endpoint, rate_headers)
+            return
+
+        self._send(200, body, endpoint, rate_headers)
+
+    def _send(self, status, body, endpoint, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self._send_bytes(status, payload, "application/json; charset=utf-8", endpoint, headers)
+
+    def _send_bytes(self, status, payload, content_type, endpoint, headers=None):
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, payload = 304, b""
+
+        if endpoint is not None:
+            self.state.record(endpoint, status)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+
+class StandInServer:
+    """Run the stand-in on a background thread, e.g. from a benchmark."""
+
+    def __init__(self, state: StandInState, host: str = "127.0.0.1", port: int = 0):
+        self.state = state
+        self.httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = state
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve an offline stand-in for the GitHub endpoints used by the refresh scripts"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8787, help="Port to listen on (default: 8787).")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request in ms (default: 0).")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Requests allowed per window (default: 5000).")
+    parser.add_argument("--rate-limit-window", type=int, default=3600,
+                        help="Rate-limit window in seconds (default: 3600).")
+    parser.add_argument("--error-403-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a secondary-rate-limit 403 (default: 0).")
+    parser.add_argument("--error-5xx-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with a 502 (default: 0).")
+    parser.add_argument("--seed", type=int, help="Random seed for error injection.")
+    parser.add_argument("--tree-limit", type=int, default=None,
+                        help="Truncate recursive tree listings past this many entries (default: no limit).")
+    return parser.parse_args()
+
+
+def main():
+    """Start the stand-in server in the foreground."""
+    args = parse_arguments()
+    fixture = RepositoryFixture(Path(__file__).parent.parent, tree_limit=args.tree_limit)
+    state = StandInState(
+        fixture,
+        latency=args.latency_ms / 1000,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        error_403_rate=args.error_403_rate,
+        error_5xx_rate=args.error_5xx_rate,
+        seed=args.seed,
+    )
+    server = StandInServer(state, args.host, args.port)
+
+    print(f"Serving {REPO} at {fixture.tag} ({fixture.commit_sha[:8]}) with {len(fixture.files)} files")
+    print("Point the scripts at it with:")
+    print(f"  GITHUB_API_URL={server.url} GITHUB_RAW_URL={server.url}")
+    print(f"Request counters: {server.url}/_stats")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
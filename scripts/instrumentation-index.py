@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Script to build and query a compact index over the instrumentation-list snapshots.
+This script parses every instrumentation-list-*.yaml file once and persists an
+index of libraries, metrics, span kinds and attributes per version to a single
+memory-mappable file. Later runs map the file instead of re-parsing the YAML, and
+rebuild it automatically when the snapshots' content changes. Opening checks the
+snapshots' sizes and mtimes, and hashes their content only when those differ.
+
+Usage:
+    python scripts/instrumentation-index.py metric http.server.request.duration --version 2.23
+    python scripts/instrumentation-index.py library akka-actor-2.3
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+import yaml
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pipeline_common import YamlLoader, get_project_root, list_snapshots
+
+INDEX_MAGIC = b"IEIDX002"
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+# magic, byte order, source digest, source stat digest, strings, versions, terms, postings
+HEADER = struct.Struct("<8sB3x32s32sIIII")
+STAT_DIGEST_OFFSET = 12 + 32
+
+# Term kinds; a term is (kind, interned string) with (version, library) postings
+TERM_LIBRARY = 0
+TERM_METRIC = 1
+TERM_SPAN_KIND = 2
+TERM_ATTRIBUTE = 3
+TERM_GROUP = 4
+TERM_KINDS = {
+    "library": TERM_LIBRARY,
+    "metric": TERM_METRIC,
+    "span-kind": TERM_SPAN_KIND,
+    "attribute": TERM_ATTRIBUTE,
+    "group": TERM_GROUP,
+}
+
+
+def get_index_path() -> Path:
+    """Return the default location of the persisted index."""
+    return get_project_root() / ".cache" / "instrumentation-index.bin"
+
+
+def snapshot_digest(snapshots: List[Tuple[str, Path]]) -> bytes:
+    """Hash the snapshots' versions and content; any change invalidates the index."""
+    digest = hashlib.sha256()
+    for version, path in snapshots:
+        digest.update(version.encode("utf-8") + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.digest()
+
+
+def snapshot_stat_digest(snapshots: List[Tuple[str, Path]]) -> bytes:
+    """Hash the snapshots' versions, sizes and mtimes: a cheap check that they are untouched."""
+    digest = hashlib.sha256()
+    for version, path in snapshots:
+        stat = path.stat()
+        digest.update(f"{version}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+    return digest.digest()
+
+
+def iter_terms(library: dict):
+    """Yield (kind, value) terms for one library entry's telemetry."""
+    for telemetry in library.get("telemetry") or []:
+        for metric in telemetry.get("metrics") or []:
+            if metric.get("name"):
+                yield TERM_METRIC, metric["name"]
+            for attribute in metric.get("attributes") or []:
+                if attribute.get("name"):
+                    yield TERM_ATTRIBUTE, attribute["name"]
+        for span in telemetry.get("spans") or []:
+            if span.get("span_kind"):
+                yield TERM_SPAN_KIND, span["span_kind"]
+            for attribute in span.get("attributes") or []:
+                if attribute.get("name"):
+                    yield TERM_ATTRIBUTE, attribute["name"]
+
+
+def collect_postings(snapshots: List[Tuple[str, Path]]) -> Dict[Tuple[int, str], set]:
+    """Parse each snapshot once and gather (kind, value) -> {(version_idx, library)}."""
+    postings: Dict[Tuple[int, str], set] = {}
+    for version_idx, (version, path) in enumerate(snapshots):
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=YamlLoader)
+        if not isinstance(data, dict) or not isinstance(data.get("libraries"), dict):
+            print(f"Skipping {path.name}: no 'libraries' section")
+            continue
+        for group, libraries in data["libraries"].items():
+            for library in libraries or []:
+                name = library.get("name")
+                if not name:
+                    continue
+                entry = (version_idx, name)
+                postings.setdefault((TERM_LIBRARY, name), set()).add(entry)
+                postings.setdefault((TERM_GROUP, group), set()).add(entry)
+                for term in iter_terms(library):
+                    postings.setdefault(term, set()).add(entry)
+    return postings
+
+
+def build_index(project_root: Path, index_path: Path) -> None:
+    """Parse the snapshots and write the index file atomically."""
+    snapshots = list_snapshots(project_root)
+    postings = collect_postings(snapshots)
+
+    # Intern every string (versions, libraries, term values) in byte order so
+    # lookups can binary-search the mapped table.
+    strings = {version for version, _ in snapshots}
+    for (_, value), entries in postings.items():
+        strings.add(value)
+        strings.update(library for _, library in entries)
+    encoded = sorted(s.encode("utf-8") for s in strings)
+    string_ids = {s.decode("utf-8"): i for i, s in enumerate(encoded)}
+
+    string_offsets = array("I", [0])
+    for s in encoded:
+        string_offsets.append(string_offsets[-1] + len(s))
+    string_blob = b"".join(encoded)
+
+    versions = array("I", (string_ids[version] for version, _ in snapshots))
+
+    terms = array("I")
+    pairs = array("I")
+    for kind, value in sorted(postings, key=lambda term: (term[0], string_ids[term[1]])):
+        entries = sorted((v, string_ids[library]) for v, library in postings[(kind, value)])
+        terms.extend((kind, string_ids[value], len(pairs) // 2, len(entries)))
+        for v, library_id in entries:
+            pairs.extend((v, library_id))
+
+    header = HEADER.pack(INDEX_MAGIC, BYTE_ORDER, snapshot_digest(snapshots), snapshot_stat_digest(snapshots),
+                         len(encoded), len(versions), len(terms) // 4, len(pairs) // 2)
+    blob_padding = b"\0" * (-len(string_blob) % 4)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(index_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(string_offsets.tobytes())
+        f.write(string_blob + blob_padding)
+        f.write(versions.tobytes())
+        f.write(terms.tobytes())
+        f.write(pairs.tobytes())
+    os.replace(tmp_path, index_path)
+
+
+class InstrumentationIndex:
+    """
+    Read-only view over a persisted index file.
+
+    Arrays are memoryviews over the mapped file, so opening the index costs a
+    header read regardless of how many snapshots it covers.
+    """
+
+    def __init__(self, index_path: Path):
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, byte_order, self.digest, self.stat_digest,
+         n_strings, n_versions, n_terms, n_pairs) = HEADER.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or byte_order != BYTE_ORDER:
+            self._mmap.close()
+            raise ValueError(f"{index_path} is not a compatible index file")
+
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self._string_offsets = view[offset:offset + 4 * (n_strings + 1)].cast("I")
+        offset += 4 * (n_strings + 1)
+        blob_size = self._string_offsets[n_strings]
+        self._blob_start = offset
+        offset += blob_size + (-blob_size % 4)
+        self._versions = view[offset:offset + 4 * n_versions].cast("I")
+        offset += 4 * n_versions
+        self._terms = view[offset:offset + 16 * n_terms].cast("I")
+        offset += 16 * n_terms
+        self._pairs = view[offset:offset + 8 * n_pairs].cast("I")
+        self._n_strings = n_strings
+        self._n_terms = n_terms
+
+    @classmethod
+    def load(cls, project_root: Optional[Path] = None, index_path: Optional[Path] = None,
+             rebuild: bool = False) -> "InstrumentationIndex":
+        """
+        Open the index, (re)building it when missing or out of date with the
+        snapshots. Unchanged sizes and mtimes are trusted; otherwise the content
+        is hashed, and if only the mtimes moved (a fresh checkout) the recorded
+        stat digest is refreshed instead of rebuilding.
+        """
+        project_root = project_root or get_project_root()
+        index_path = index_path or get_index_path()
+        if not rebuild and index_path.exists():
+            try:
+                index = cls(index_path)
+            except (ValueError, struct.error):
+                index = None
+            if index:
+                snapshots = list_snapshots(project_root)
+                stat_digest = snapshot_stat_digest(snapshots)
+                if index.stat_digest == stat_digest:
+                    return index
+                if index.digest == snapshot_digest(snapshots):
+                    with open(index_path, "r+b") as f:
+                        f.seek(STAT_DIGEST_OFFSET)
+                        f.write(stat_digest)
+                    index.stat_digest = stat_digest
+                    return index
+                index.close()
+        build_index(project_root, index_path)
+        return cls(index_path)
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        base = self._blob_start
+        return self._mmap[base + self._string_offsets[string_id]:base + self._string_offsets[string_id + 1]]
+
+    def _string(self, string_id: int) -> str:
+        return self._string_bytes(string_id).decode("utf-8")
+
+    def _string_id(self, value: str) -> Optional[int]:
+        target = value.encode("utf-8")
+        lo, hi = 0, self._n_strings
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_strings and self._string_bytes(lo) == target:
+            return lo
+        return None
+
+    def _postings(self, kind: int, value: str) -> List[Tuple[int, int]]:
+        """Return the (version_idx, library_id) postings for a term."""
+        string_id = self._string_id(value)
+        if string_id is None:
+            return []
+        key = (kind, string_id)
+        lo, hi = 0, self._n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (self._terms[4 * mid], self._terms[4 * mid + 1]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self._n_terms or (self._terms[4 * lo], self._terms[4 * lo + 1]) != key:
+            return []
+        start, length = self._terms[4 * lo + 2], self._terms[4 * lo + 3]
+        pairs = self._pairs[2 * start:2 * (start + length)]
+        return list(zip(pairs[0::2], pairs[1::2]))
+
+    def versions(self) -> List[str]:
+        """Return the indexed version labels, oldest first."""
+        return [self._string(string_id) for string_id in self._versions]
+
+    def _version_idx(self, version: Optional[str]) -> Optional[int]:
+        if version is None:
+            return None
+        versions = self.versions()
+        if version not in versions:
+            raise KeyError(f"Version {version} is not indexed (have: {', '.join(versions)})")
+        return versions.index(version)
+
+    def query(self, kind: str, value: str, version: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Return {library: [versions]} for libraries matching a term, optionally
+        restricted to one version. kind is one of TERM_KINDS.
+        """
+        version_idx = self._version_idx(version)
+        versions = self.versions()
+        result: Dict[str, List[str]] = {}
+        for v, library_id in self._postings(TERM_KINDS[kind], value):
+            if version_idx is None or v == version_idx:
+                result.setdefault(self._string(library_id), []).append(versions[v])
+        return dict(sorted(result.items()))
+
+    def library_versions(self, library: str) -> List[str]:
+        """Return the versions that include a library."""
+        return self.query("library", library).get(library, [])
+
+    def libraries(self, version: str) -> List[str]:
+        """Return every library name present in a version."""
+        version_idx = self._version_idx(version)
+        names = set()
+        for t in range(self._n_terms):
+            if self._terms[4 * t] != TERM_LIBRARY:
+                continue
+            start, length = self._terms[4 * t + 2], self._terms[4 * t + 3]
+            if any(self._pairs[2 * p] == version_idx for p in range(start, start + length)):
+                names.add(self._string(self._terms[4 * t + 1]))
+        return sorted(names)
+
+    def close(self):
+        """Release the mapping."""
+        for name in ("_string_offsets", "_versions", "_terms", "_pairs"):
+            getattr(self, name).release()
+        self._mmap.close()
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Build and query an index over the instrumentation-list snapshots"
+    )
+    parser.add_argument(
+        "kind",
+        choices=["build", "versions", "libraries"] + list(TERM_KINDS),
+        help="Query to run: build the index, list versions, list a version's libraries, "
+             "or find libraries by library/metric/span-kind/attribute/group name."
+    )
+    parser.add_argument("value", nargs="?", help="Name to look up (not needed for build/versions).")
+    parser.add_argument("--version", type=str, help="Restrict the query to one version (e.g. 2.23).")
+    parser.add_argument("--index-path", type=Path, default=None,
+                        help="Index file location (default: .cache/instrumentation-index.bin).")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index even if it is up to date.")
+    parser.add_argument("--timing", action="store_true", help="Print how long opening the index took.")
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_arguments()
+
+    start = time.perf_counter()
+    index = InstrumentationIndex.load(index_path=args.index_path, rebuild=args.rebuild or args.kind == "build")
+    if args.timing:
+        print(f"Index ready in {(time.perf_counter() - start) * 1000:.1f}ms", file=sys.stderr)
+
+    try:
+        if args.kind == "build":
+            print(f"Indexed {len(index.versions())} versions: {', '.join(index.versions())}")
+        elif args.kind == "versions":
+            for version in index.versions():
+                print(version)
+        elif args.kind == "libraries":
+            if not (args.version or args.value):
+                print("libraries needs a version (positional or --version)")
+                sys.exit(1)
+            for name in index.libraries(args.version or args.value):
+                print(name)
+        else:
+            if not args.value:
+                print(f"{args.kind} needs a name to look up")
+                sys.exit(1)
+            results = index.query(args.kind, args.value, args.version)
+            if not results:
+                print(f"No libraries found for {args.kind} '{args.value}'")
+            for library, versions in results.items():
+                print(f"{library}: {', '.join(versions)}")
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(1)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Helpers shared by the pipeline scripts: locating the repository and its
+instrumentation-list snapshots, the preferred YAML loader, and loading the
+hyphenated scripts as modules.
+
+    from pipeline_common import YamlLoader, get_project_root, list_snapshots, load_script, version_key
+
+    updater = load_script("update-instrumentation-list")
+    for version, path in list_snapshots(get_project_root()):
+        data = yaml.load(path.read_text(), Loader=YamlLoader)
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import List, Tuple
+
+# Prefer the libyaml-backed loader; fall back to pure Python when PyYAML was
+# built without libyaml.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def get_project_root() -> Path:
+    """Return the repository root."""
+    return SCRIPTS_DIR.parent
+
+
+def load_script(name: str):
+    """Load a hyphenated script from the scripts directory as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def version_key(version: str) -> List[int]:
+    """Sort key for version labels like 2.19 or 3.0."""
+    return [int(part) for part in version.split(".") if part.isdigit()]
+
+
+def list_snapshots(project_root: Path) -> List[Tuple[str, Path]]:
+    """Return (version, path) for each instrumentation-list-*.yaml, oldest first."""
+    snapshots = [
+        (path.stem[len("instrumentation-list-"):], path)
+        for path in project_root.glob("instrumentation-list-*.yaml")
+    ]
+    return sorted(snapshots, key=lambda item: version_key(item[0]))
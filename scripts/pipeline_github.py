@@ -0,0 +1,911 @@
+"""
+GitHub client and the caches behind it, shared by the refresh scripts:
+conditional requests (HTTPCache), rate-limit pacing and retries
+(RateLimitScheduler), streamed tree listings (TreeListing, TreeCache) and the
+tag index (TagIndex).
+
+    from pipeline_github import GitHubClient, HTTPCache, TagIndex
+
+    client = GitHubClient(cache=HTTPCache(cache_dir), tag_index=TagIndex(tag_index_path))
+    tag = client.get_latest_release_tag("open-telemetry/opentelemetry-java-instrumentation")
+"""
+
+import base64
+import codecs
+import hashlib
+import json
+import os
+import random
+import requests
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pipeline_trace import NOOP_SPAN, SPAN_KIND_CLIENT, tracer
+
+
+class HTTPCache:
+    """
+    On-disk cache for conditional GET requests.
+
+    Entries are keyed by URL + params and store the response body together with
+    its ETag / Last-Modified validators. A 304 Not Modified reply is answered
+    from the stored body. The cache is trimmed to max_bytes by evicting the
+    least recently used entries; the directory is scanned once and its size is
+    tracked from then on.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 100 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Body filename -> size, least recently used first
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        bodies = []
+        for body_path in self.cache_dir.glob("*.body"):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, body_path.name, stat.st_size))
+        for _, name, size in sorted(bodies):
+            self._track(name, size)
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        """Compute the cache key for a URL and its query parameters."""
+        canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _track(self, name: str, size: int):
+        """Record a body as the most recently used. Caller holds the lock (or is __init__)."""
+        self._total += size - self._sizes.pop(name, 0)
+        self._sizes[name] = size
+
+    def lookup(self, url: str, params: Optional[dict] = None) -> Optional[dict]:
+        """
+        Return the cached entry for a request, or None. The body is read now, so
+        a concurrent eviction cannot remove it before a 304 is replayed.
+        """
+        meta_path, body_path = self._paths(self.key(url, params))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['body'] = body_path.read_bytes()
+        except (IOError, ValueError):
+            return None
+        entry['body_path'] = str(body_path)
+        return entry
+
+    def conditional_headers(self, entry: Optional[dict]) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def replay(self, entry: dict, not_modified: requests.Response) -> requests.Response:
+        """Turn a 304 response into a 200 response carrying the cached body."""
+        body = entry['body']
+        try:
+            os.utime(entry['body_path'])  # mark as recently used
+        except OSError:
+            pass  # evicted since lookup; the body is already in memory
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.headers = requests.structures.CaseInsensitiveDict(entry.get('headers', {}))
+        response.headers.update(not_modified.headers)
+        response.encoding = entry.get('encoding')
+        response._content = body
+
+        with self._lock:
+            self.hits += 1
+            name = Path(entry['body_path']).name
+            if name in self._sizes:
+                self._sizes.move_to_end(name)
+        return response
+
+    def store(self, url: str, params: Optional[dict], response: requests.Response):
+        """Store a 200 response if it carries a validator."""
+        with self._lock:
+            self.misses += 1
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        meta_path, body_path = self._paths(self.key(url, params))
+        entry = {
+            'url': url,
+            'params': params,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {
+                name: response.headers[name]
+                for name in ('Content-Type', 'Link')
+                if name in response.headers
+            },
+        }
+        try:
+            # Write body first so a metadata file never points at a missing body
+            tmp_body = body_path.with_suffix(f".body.{threading.get_ident()}.tmp")
+            tmp_body.write_bytes(response.content)
+            os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_suffix(f".json.{threading.get_ident()}.tmp")
+            tmp_meta.write_text(json.dumps(entry), encoding='utf-8')
+            os.replace(tmp_meta, meta_path)
+        except IOError as e:
+            print(f"Warning: could not write HTTP cache entry for {url}: {e}")
+            return
+
+        with self._lock:
+            self.stores += 1
+            self._track(body_path.name, len(response.content))
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            while self._total > self.max_bytes and self._sizes:
+                name, size = self._sizes.popitem(last=False)
+                body_path = self.cache_dir / name
+                body_path.with_suffix('.json').unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+                self._total -= size
+                self.evictions += 1
+
+    def report(self):
+        """Print cache-hit statistics for this run."""
+        requests_made = self.hits + self.misses
+        hit_rate = (self.hits / requests_made * 100) if requests_made else 0.0
+        print("HTTP cache statistics:")
+        print(f"- Requests: {requests_made}")
+        print(f"- Not modified (served from cache): {self.hits} ({hit_rate:.1f}%)")
+        print(f"- Downloaded: {self.misses}")
+        print(f"- Entries stored: {self.stores}")
+        print(f"- Entries evicted: {self.evictions}")
+        print(f"- Cache directory: {self.cache_dir}")
+
+
+class RateLimitScheduler:
+    """
+    Paces requests by GitHub's advertised rate-limit budget.
+
+    Shared by every request a GitHubClient makes (across worker threads). While
+    plenty of quota remains requests go out immediately; once X-RateLimit-Remaining
+    drops to the reserve, the remaining budget is spread evenly until
+    X-RateLimit-Reset. 403/429 rate-limit responses and transient 5xx errors are
+    retried, honouring Retry-After, waiting for the reset on an exhausted primary
+    limit, and otherwise backing off exponentially with jitter.
+    """
+
+    RETRYABLE_SERVER_ERRORS = (500, 502, 503, 504)
+
+    def __init__(self, max_retries: int = 5, backoff_base: float = 1.0, backoff_cap: float = 60.0,
+                 reserve: int = 50, max_wait: float = 900.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.not_before = 0.0
+        self.waited = 0.0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next request may be sent."""
+        with self._lock:
+            now = time.time()
+            start = max(now, self.not_before)
+            if self.remaining is not None and self.reset_at is not None and self.remaining <= self.reserve:
+                window = max(self.reset_at - now, 0.0)
+                if self.remaining <= 0:
+                    start = max(start, self.reset_at)
+                else:
+                    # Spread what is left of the budget until the reset
+                    interval = window / self.remaining
+                    start = max(start, self.not_before + interval)
+                    self.remaining -= 1
+            self.not_before = start
+            delay = min(start - now, self.max_wait)
+        if delay > 0:
+            self.waited += delay
+            time.sleep(delay)
+
+    def update(self, response: requests.Response):
+        """Record the budget advertised by a response."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self.remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.reset_at = float(reset)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return delay + random.uniform(0, delay)
+
+    def retry_delay(self, response: Optional[requests.Response], attempt: int) -> Optional[float]:
+        """
+        Return how long to wait before retrying, or None if the response should
+        not be retried. A None response means the request raised a connection error.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if response is None or response.status_code in self.RETRYABLE_SERVER_ERRORS:
+            return self._backoff(attempt)
+
+        if response.status_code not in (403, 429):
+            return None
+
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_wait)
+
+        if response.headers.get('X-RateLimit-Remaining') == '0' and self.reset_at:
+            # Primary limit exhausted: wait for the window to reset
+            return min(max(self.reset_at - time.time(), 0.0) + 1.0, self.max_wait)
+
+        if response.status_code == 429 or 'rate limit' in response.text.lower():
+            # Secondary limit without guidance
+            return self._backoff(attempt)
+
+        # A plain 403 (e.g. permissions) will not succeed on retry
+        return None
+
+    def block_for(self, delay: float):
+        """Hold back every request (on all threads) for delay seconds."""
+        with self._lock:
+            self.retries += 1
+            self.not_before = max(self.not_before, time.time() + delay)
+
+    def report(self):
+        """Print scheduler statistics for this run."""
+        print("Rate-limit scheduler statistics:")
+        print(f"- Retries: {self.retries}")
+        print(f"- Time spent waiting: {self.waited:.1f}s")
+        if self.remaining is not None:
+            print(f"- Remaining quota: {self.remaining}")
+
+
+class TreeListing:
+    """
+    Incrementally parsed response of the git trees API.
+
+    Iterating yields the tree entries one at a time as the body streams in, so a
+    large recursive listing is never held in memory whole. The top-level `sha`
+    and `truncated` fields are available once iteration has finished.
+    """
+
+    def __init__(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.sha: Optional[str] = None
+        self.truncated = False
+
+    def _chunks(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in self.response.iter_content(self.chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    def __iter__(self) -> Iterator[dict]:
+        json_decoder = json.JSONDecoder()
+        chunks = self._chunks()
+        buffer = ""
+        pos = 0
+        exhausted = False
+
+        def more() -> bool:
+            nonlocal buffer, pos, exhausted
+            if exhausted:
+                return False
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip(characters: str) -> str:
+            """Skip whitespace and the given separators; return the next character ('' at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] in characters):
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not more():
+                    return ""
+
+        def value():
+            """Decode the JSON value at pos, reading more of the body until it is complete."""
+            nonlocal pos
+            skip("")
+            while True:
+                try:
+                    result, end = json_decoder.raw_decode(buffer, pos)
+                    # A scalar ending at the buffer edge may continue in the next chunk
+                    if end < len(buffer) or exhausted or buffer[end - 1] in '"}]':
+                        pos = end
+                        return result
+                except ValueError:
+                    if exhausted:
+                        raise
+                more()
+
+        try:
+            if skip("") != "{":
+                raise ValueError("tree response is not a JSON object")
+            pos += 1
+            while skip(",") not in ("}", ""):
+                key = value()
+                if skip("") != ":":
+                    raise ValueError("malformed tree response")
+                pos += 1
+                if key == "tree" and skip("") == "[":
+                    pos += 1
+                    while skip(",") not in ("]", ""):
+                        yield value()
+                    pos += 1
+                elif key == "sha":
+                    self.sha = value()
+                elif key == "truncated":
+                    self.truncated = bool(value())
+                else:
+                    value()
+        finally:
+            self.response.close()
+
+
+class TreeCache:
+    """
+    On-disk map of git tree SHA -> library README candidates below that tree.
+
+    Tree SHAs are content addresses, so an entry never goes stale: a directory
+    whose SHA is cached is not listed again. Only READMEs at `README.md` or
+    `.../library/README.md` (relative to the tree) are kept, so entries stay small.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, List[List[str]]] = {}
+        self.hits = 0
+        self.listed = 0
+        self._lock = threading.Lock()
+        if self.path:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (IOError, ValueError) as e:
+                print(f"Warning: ignoring unreadable tree cache {self.path}: {e}")
+
+    def get(self, tree_sha: str) -> Optional[List[List[str]]]:
+        """Return the cached README candidates of a tree, or None."""
+        with self._lock:
+            entry = self.entries.get(tree_sha)
+            if entry is not None:
+                self.hits += 1
+            return entry
+
+    def __contains__(self, tree_sha: str) -> bool:
+        with self._lock:
+            return tree_sha in self.entries
+
+    def note_listing(self):
+        """Count one tree listing request."""
+        with self._lock:
+            self.listed += 1
+
+    def put(self, tree_sha: str, readmes: List[List[str]]):
+        """Record the README candidates ([relative path, blob SHA]) of a tree."""
+        with self._lock:
+            self.entries[tree_sha] = readmes
+
+    def save(self):
+        """Write the cache atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except IOError as e:
+                print(f"Error saving tree cache {self.path}: {e}")
+
+
+class TagIndex:
+    """
+    On-disk index of a repository's tags: tag name -> commit SHA, plus the latest
+    release tag, built from one paginated ref listing (see GitHubClient.refresh_tag_index).
+
+    Entries expire after `ttl` seconds so new releases are picked up. The latest
+    release is revalidated with a conditional request (see
+    GitHubClient.get_latest_release_tag); while it is unchanged the listed tags stay
+    fresh, so a daily run does not relist them. The commit SHAs of dereferenced
+    annotated tag objects never change and are kept across refreshes, so only new
+    annotated tags cost a request.
+    """
+
+    def __init__(self, path: Optional[Path], ttl: float = 3600.0):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.data = {"repos": {}, "tag_objects": {}}
+        self._lock = threading.Lock()
+        if self.path:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (IOError, ValueError) as e:
+                print(f"Warning: ignoring unreadable tag index {self.path}: {e}")
+
+    def is_fresh(self, repo: str) -> bool:
+        """True if the repository's tags were listed less than ttl seconds ago."""
+        with self._lock:
+            entry = self.data["repos"].get(repo)
+            return bool(entry) and time.time() < entry.get("expires_at", 0)
+
+    def lookup(self, repo: str, tag: str) -> Optional[str]:
+        """Return the commit SHA of a tag, or None if it is not in the index."""
+        with self._lock:
+            return self.data["repos"].get(repo, {}).get("tags", {}).get(tag)
+
+    def latest_release(self, repo: str) -> Optional[str]:
+        """Return the latest release tag recorded for the repository, or None."""
+        with self._lock:
+            return self.data["repos"].get(repo, {}).get("latest_release")
+
+    def latest_release_validators(self, repo: str) -> dict:
+        """Return the If-None-Match / If-Modified-Since headers of the recorded latest release."""
+        with self._lock:
+            return dict(self.data["repos"].get(repo, {}).get("latest_release_validators", {}))
+
+    def record_latest_release(self, repo: str, tag: str, validators: dict):
+        """
+        Record the latest release as reported by /releases/latest. If it is the
+        release the tags were listed with, they are still current and stay fresh
+        for another ttl; a new release leaves them to be relisted.
+        """
+        with self._lock:
+            entry = self.data["repos"].setdefault(repo, {})
+            if entry.get("latest_release") == tag and "tags" in entry:
+                entry["expires_at"] = int(time.time() + self.ttl)
+            entry["latest_release"] = tag
+            entry["latest_release_validators"] = validators
+
+    def tag_object(self, sha: str) -> Optional[str]:
+        """Return the commit SHA an annotated tag object points to, if known."""
+        with self._lock:
+            return self.data["tag_objects"].get(sha)
+
+    def update(self, repo: str, tags: Dict[str, str], latest_release: Optional[str], tag_objects: Dict[str, str]):
+        """Replace the repository's tags and record newly dereferenced tag objects."""
+        with self._lock:
+            now = time.time()
+            previous = self.data["repos"].get(repo, {})
+            self.data["repos"][repo] = {
+                "fetched_at": int(now),
+                "expires_at": int(now + self.ttl),
+                "latest_release": latest_release,
+                "tags": tags,
+            }
+            if latest_release and previous.get("latest_release") == latest_release:
+                self.data["repos"][repo]["latest_release_validators"] = previous.get("latest_release_validators", {})
+            self.data["tag_objects"].update(tag_objects)
+
+    def save(self):
+        """Write the index atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, indent=1, sort_keys=True)
+                    f.write("\n")
+                os.replace(tmp_path, self.path)
+            except IOError as e:
+                print(f"Error saving tag index {self.path}: {e}")
+
+
+class GitHubClient:
+    """Simple GitHub API client for fetching repository data."""
+    
+    def __init__(self, pool_size: int = 10, cache: Optional[HTTPCache] = None, base_url: Optional[str] = None,
+                 scheduler: Optional[RateLimitScheduler] = None, tree_cache: Optional[TreeCache] = None,
+                 tag_index: Optional[TagIndex] = None):
+        self.session = requests.Session()
+        # Size the connection pool so concurrent workers can reuse connections
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        github_token = os.environ.get("GITHUB_TOKEN")
+        if github_token:
+            self.session.headers.update({'Authorization': f'Bearer {github_token}'})
+        # GITHUB_API_URL is set by GitHub Actions and lets the client target a stand-in server
+        self.base_url = (base_url or os.environ.get("GITHUB_API_URL") or 'https://api.github.com').rstrip('/')
+        self.cache = cache
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.tree_cache = tree_cache or TreeCache(None)
+        # Without a tag index every tag is resolved with the per-tag requests below
+        self.tag_index = tag_index
+        self._tag_index_lock = threading.Lock()
+        self._tag_index_refreshed = set()
+
+    def _send(self, url, params=None, headers=None, stream=False, span=NOOP_SPAN):
+        """
+        Send a GET through the rate-limit scheduler, retrying rate-limited and
+        transient failures. Returns the final response; raises on connection errors
+        once retries are exhausted. Status and retry count are recorded on span.
+        """
+        attempt = 0
+        while True:
+            self.scheduler.wait()
+            span.set_attribute("http.request.resend_count", attempt or None)
+            try:
+                response = self.session.get(url, params=params, headers=headers, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = self.scheduler.retry_delay(None, attempt)
+                if delay is None:
+                    raise
+                print(f"  Connection error for {url}, retrying in {delay:.1f}s...")
+            else:
+                self.scheduler.update(response)
+                span.set_attribute("http.response.status_code", response.status_code)
+                delay = self.scheduler.retry_delay(response, attempt)
+                if delay is None:
+                    return response
+                print(f"  HTTP {response.status_code} for {url}, retrying in {delay:.1f}s...")
+                response.close()
+            self.scheduler.block_for(delay)
+            attempt += 1
+    
+    def _get(self, url, params=None):
+        """Make a GET request with error handling (conditional when cached)."""
+        with tracer.span("GET", SPAN_KIND_CLIENT, **{"http.request.method": "GET", "url.full": url}) as span:
+            try:
+                entry = self.cache.lookup(url, params) if self.cache else None
+                headers = self.cache.conditional_headers(entry) if self.cache else None
+                response = self._send(url, params=params, headers=headers, span=span)
+                if response.status_code == 304 and entry:
+                    span.set_attribute("refresh.cache_hit", True)
+                    return self.cache.replay(entry, response)
+                response.raise_for_status()
+                span.set_attributes(**{"refresh.cache_hit": False, "http.response.body.size": len(response.content)})
+                if self.cache:
+                    self.cache.store(url, params, response)
+                return response
+            except requests.exceptions.RequestException as e:
+                span.set_error(str(e))
+                print(f"Error making request to {url}: {e}")
+                return None
+    
+    def get_most_recent_commit(self, repo: str, branch: str = "main"):
+        """Get the most recent commit SHA for a branch."""
+        api_url = f"{self.base_url}/repos/{repo}/commits"
+        params = {
+            "per_page": 1,
+            "sha": branch
+        }
+        
+        response = self._get(api_url, params=params)
+        if response and response.status_code == 200:
+            commits = response.json()
+            if commits:
+                return commits[0]['sha']
+        return None
+    
+    def _get_all_pages(self, url: str, params: Optional[dict] = None) -> Optional[list]:
+        """GET a paginated list endpoint, following Link rel="next"; None on failure."""
+        items = []
+        params = dict(params or {}, per_page=100)
+        while url:
+            response = self._get(url, params=params)
+            if not response or response.status_code != 200:
+                return None
+            items.extend(response.json())
+            url = response.links.get("next", {}).get("url")
+            # The next link already carries the query string
+            params = None
+        return items
+
+    def _dereference_tag_object(self, repo: str, sha: str) -> Optional[str]:
+        """Follow an annotated tag object (possibly a chain of them) to its commit SHA."""
+        for _ in range(5):
+            response = self._get(f"{self.base_url}/repos/{repo}/git/tags/{sha}")
+            if not response or response.status_code != 200:
+                return None
+            target = response.json()["object"]
+            if target["type"] != "tag":
+                return target["sha"] if target["type"] == "commit" else None
+            sha = target["sha"]
+        return None
+
+    def refresh_tag_index(self, repo: str, workers: int = 8) -> bool:
+        """
+        Rebuild the tag index for a repository: one paginated matching-refs listing
+        of all tags, the latest release, and a concurrent dereference of annotated
+        tag objects the index has not seen before. Returns False if it failed.
+        """
+        with tracer.span("tag index refresh", **{"refresh.repository": repo}) as span:
+            print("Listing repository tags...")
+            refs = self._get_all_pages(f"{self.base_url}/repos/{repo}/git/matching-refs/tags")
+            if refs is None:
+                span.set_error("tag listing failed")
+                print("Warning: could not list tags, resolving tags one by one")
+                return False
+
+            tags = {}
+            pending = {}
+            for ref in refs:
+                tag = ref["ref"][len("refs/tags/"):]
+                target = ref["object"]
+                if target["type"] == "commit":
+                    tags[tag] = target["sha"]
+                elif target["type"] == "tag":
+                    known = self.tag_index.tag_object(target["sha"])
+                    if known:
+                        tags[tag] = known
+                    else:
+                        pending[tag] = target["sha"]
+
+            tag_objects = {}
+            if pending:
+                print(f"Dereferencing {len(pending)} annotated tags...")
+                with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending))),
+                                        thread_name_prefix="readmes") as executor:
+                    commits = list(executor.map(
+                        tracer.wrap(lambda sha: self._dereference_tag_object(repo, sha)), pending.values()))
+                for (tag, sha), commit_sha in zip(pending.items(), commits):
+                    if commit_sha:
+                        tags[tag] = commit_sha
+                        tag_objects[sha] = commit_sha
+
+            latest_release = None
+            response = self._get(f"{self.base_url}/repos/{repo}/releases/latest")
+            if response and response.status_code == 200:
+                latest_release = response.json()["tag_name"]
+
+            self.tag_index.update(repo, tags, latest_release, tag_objects)
+            if latest_release:
+                # So the index's first expiry is revalidated with a 304, not a full response
+                self.tag_index.record_latest_release(repo, latest_release, self._release_validators(response))
+            self.tag_index.save()
+            span.set_attributes(**{"refresh.tags": len(tags), "refresh.dereferenced": len(tag_objects)})
+            print(f"Indexed {len(tags)} tags ({len(tag_objects)} annotated tags dereferenced)")
+            return True
+
+    def _tag_index_ready(self, repo: str, refresh: bool = False) -> bool:
+        """
+        Make sure the tag index covers repo, listing the tags when it has expired
+        (or when refresh is set and it was not listed during this run). Returns
+        True if lookups in it are authoritative for this run.
+        """
+        if self.tag_index is None:
+            return False
+        with self._tag_index_lock:
+            if repo in self._tag_index_refreshed:
+                return True
+            if self.tag_index.is_fresh(repo) and not refresh:
+                return True
+            if self.refresh_tag_index(repo):
+                self._tag_index_refreshed.add(repo)
+                return True
+            return False
+
+    def invalidate_tag_index(self, repo: str):
+        """Let the next unknown tag list the repository's tags again (a new release has appeared)."""
+        with self._tag_index_lock:
+            self._tag_index_refreshed.discard(repo)
+
+    def get_commit_sha_for_tag(self, repo: str, tag: str):
+        """Get the commit SHA for a specific tag (from the tag index when there is one)."""
+        if self._tag_index_ready(repo):
+            commit_sha = self.tag_index.lookup(repo, tag)
+            # A tag newer than the saved index is picked up by listing the tags again
+            if not commit_sha and self._tag_index_ready(repo, refresh=True):
+                commit_sha = self.tag_index.lookup(repo, tag)
+            if commit_sha or repo in self._tag_index_refreshed:
+                return commit_sha
+
+        # Try the specific tag ref endpoint first
+        api_url = f"{self.base_url}/repos/{repo}/git/refs/tags/{tag}"
+        
+        response = self._get(api_url)
+        if response and response.status_code == 200:
+            ref_data = response.json()
+            
+            # Handle case where API returns a list of refs
+            if isinstance(ref_data, list):
+                if not ref_data:
+                    return None
+                # Find exact match or take the first one
+                for ref in ref_data:
+                    if ref["ref"] == f"refs/tags/{tag}":
+                        ref_data = ref
+                        break
+                else:
+                    ref_data = ref_data[0]
+            
+            # Handle both lightweight and annotated tags
+            if ref_data["object"]["type"] == "commit":
+                return ref_data["object"]["sha"]
+            elif ref_data["object"]["type"] == "tag":
+                # For annotated tags, we need to get the commit from the tag object
+                tag_url = ref_data["object"]["url"]
+                tag_response = self._get(tag_url)
+                if tag_response and tag_response.status_code == 200:
+                    tag_data = tag_response.json()
+                    return tag_data["object"]["sha"]
+        
+        # Fallback: try to get commit SHA from releases API
+        releases_url = f"{self.base_url}/repos/{repo}/releases/tags/{tag}"
+        response = self._get(releases_url)
+        if response and response.status_code == 200:
+            release_data = response.json()
+            return release_data.get("target_commitish")
+            
+        return None
+    
+    @staticmethod
+    def _release_validators(response: requests.Response) -> dict:
+        """Return the conditional request headers that revalidate a latest-release response."""
+        headers = {}
+        if response.headers.get("ETag"):
+            headers["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+        return headers
+
+    def get_latest_release_tag(self, repo: str):
+        """
+        Get the latest release tag. With a tag index, a fresh index answers without
+        a request; otherwise the recorded release is revalidated with a conditional
+        request, and a 304 (which costs no rate limit) also keeps the indexed tags
+        fresh instead of relisting them.
+        """
+        api_url = f"{self.base_url}/repos/{repo}/releases/latest"
+
+        if self.tag_index is None:
+            response = self._get(api_url)
+            if response and response.status_code == 200:
+                release_data = response.json()
+                return release_data["tag_name"]
+            return None
+
+        recorded = self.tag_index.latest_release(repo)
+        if recorded and self.tag_index.is_fresh(repo):
+            return recorded
+
+        headers = self.tag_index.latest_release_validators(repo) if recorded else {}
+        with tracer.span("GET", SPAN_KIND_CLIENT, **{"http.request.method": "GET", "url.full": api_url}) as span:
+            try:
+                response = self._send(api_url, headers=headers, span=span)
+            except requests.exceptions.RequestException as e:
+                span.set_error(str(e))
+                print(f"Error making request to {api_url}: {e}")
+                return None
+            span.set_attribute("refresh.cache_hit", response.status_code == 304)
+
+        if response.status_code == 304 and recorded:
+            tag = recorded
+        elif response.status_code == 200:
+            tag = response.json()["tag_name"]
+            headers = self._release_validators(response)
+        else:
+            print(f"Error fetching the latest release: HTTP {response.status_code}")
+            return None
+        self.tag_index.record_latest_release(repo, tag, headers)
+        self.tag_index.save()
+        return tag
+    
+    def get_repository_tree(self, repository: str, commit_sha: str):
+        """Get the complete repository tree structure at a specific commit."""
+        api_url = f"{self.base_url}/repos/{repository}/git/trees/{commit_sha}?recursive=1"
+        
+        response = self._get(api_url)
+        if response and response.status_code == 200:
+            return response.json()
+        return None
+    
+    def stream_tree(self, repository: str, tree_sha: str, recursive: bool = False) -> Optional[TreeListing]:
+        """
+        List a tree (or a commit's root tree) without loading the response at once.
+        Returns a TreeListing to iterate, or None if the request failed.
+        """
+        api_url = f"{self.base_url}/repos/{repository}/git/trees/{tree_sha}"
+        params = {"recursive": 1} if recursive else None
+
+        with tracer.span("GET", SPAN_KIND_CLIENT, **{"http.request.method": "GET", "url.full": api_url}) as span:
+            try:
+                response = self._send(api_url, params=params, stream=True, span=span)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                span.set_error(str(e))
+                print(f"Error making request to {api_url}: {e}")
+                return None
+        return TreeListing(response)
+
+    def get_file_content(self, repository: str, filepath: str, commit_sha: str):
+        """Get file content at a specific commit."""
+        api_url = f"{self.base_url}/repos/{repository}/contents/{filepath}"
+        
+        response = self._get(api_url, params={"ref": commit_sha})
+        if response and response.status_code == 200:
+            # File content is base64 encoded, decode it
+            content = response.json().get("content", "")
+            try:
+                decoded_content = base64.b64decode(content)
+                return decoded_content.decode('utf-8')
+            except Exception as e:
+                print(f"Error decoding content for {filepath}: {e}")
+                return None
+        return None
+
+    def open_archive(self, repository: str, commit_sha: str, archive_format: str = "tarball"):
+        """
+        Open a streaming download of the repository archive at a specific commit.
+        Returns the raw response stream (not decompressed by requests), or None.
+        """
+        api_url = f"{self.base_url}/repos/{repository}/{archive_format}/{commit_sha}"
+
+        with tracer.span("GET", SPAN_KIND_CLIENT, **{"http.request.method": "GET", "url.full": api_url}) as span:
+            try:
+                response = self._send(api_url, stream=True, span=span)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                span.set_error(str(e))
+                print(f"Error making request to {api_url}: {e}")
+                return None
+
+        # Only undo transport encodings; the gzip archive itself is read by tarfile
+        response.raw.decode_content = True
+        return response.raw
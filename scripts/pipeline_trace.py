@@ -0,0 +1,241 @@
+"""
+Minimal tracing for the refresh scripts, written as OTLP/JSON.
+
+The refresh scripts wrap their stages in spans (download, YAML parse/transform/dump,
+tree discovery, README fetch/save, subprocesses). Tracing is off unless a script is
+run with --trace-file, in which case every finished span is written to that file
+in the OTLP/JSON trace format (an ExportTraceServiceRequest), which collectors and
+trace viewers can import directly. No collector or OpenTelemetry SDK is needed.
+
+Shared by update-instrumentation-list.py and update-library-readmes.py:
+
+    from pipeline_trace import tracer, trace_to_file
+
+    with trace_to_file(args.trace_file, "update-library-readmes"):
+        with tracer.span("download", url=url) as span:
+            span.set_attribute("http.response.status_code", 200)
+"""
+
+import contextlib
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+SCOPE_NAME = "instrumentation-explorer.refresh"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def otlp_value(value) -> dict:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def otlp_attributes(attributes: dict) -> List[dict]:
+    """Encode an attribute dict as an OTLP KeyValue list."""
+    return [{"key": key, "value": otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Span:
+    """One timed operation; attributes can be added until it ends."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status_code = STATUS_OK
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value):
+        """Set one attribute (None values are dropped on export)."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        """Set several attributes at once."""
+        self.attributes.update(attributes)
+
+    def set_error(self, message: str):
+        """Mark the span as failed."""
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> dict:
+        """Encode the span as an OTLP/JSON Span."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class NoopSpan:
+    """Stand-in returned while tracing is disabled, so call sites need no checks."""
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Tracer:
+    """
+    Records spans for one run. The current span is tracked per thread; work handed
+    to a thread pool keeps its parent through wrap().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.service_name = None
+        self.trace_id = None
+        self.finished: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self, service_name: str):
+        """Enable tracing with a fresh trace id."""
+        self.enabled = True
+        self.service_name = service_name
+        self.trace_id = secrets.token_hex(16)
+        self.finished = []
+
+    def current(self) -> Optional[Span]:
+        """Return the innermost open span of the calling thread."""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Optional[Span] = None,
+             **attributes) -> Iterator[Span]:
+        """
+        Time a block as a child of `parent` (default: the current span). An escaping
+        exception marks the span as failed and is re-raised; a zero exit does not.
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        parent = parent or self.current()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, kind, attributes)
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+        try:
+            yield span
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                span.set_error(f"exit {e.code}")
+            raise
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            stack.pop()
+            span.end_ns = time.time_ns()
+            with self._lock:
+                self.finished.append(span)
+
+    def wrap(self, func: Callable) -> Callable:
+        """Bind func to the current span so spans it opens on another thread nest under it."""
+        if not self.enabled:
+            return func
+        parent = self.current()
+
+        def wrapped(*args, **kwargs):
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            stack.append(parent)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stack.pop()
+
+        return wrapped if parent else func
+
+    def to_otlp(self) -> dict:
+        """Return the finished spans as an OTLP/JSON ExportTraceServiceRequest."""
+        with self._lock:
+            spans = sorted(self.finished, key=lambda span: span.start_ns)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": otlp_attributes({
+                    "service.name": self.service_name,
+                    "process.pid": os.getpid(),
+                })},
+                "scopeSpans": [{
+                    "scope": {"name": SCOPE_NAME},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+
+    def write(self, path: Path):
+        """Write the finished spans to path atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_otlp(), f, indent=1)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+
+tracer = Tracer()
+
+
+@contextlib.contextmanager
+def trace_to_file(trace_file: Optional[str], service_name: str) -> Iterator[Span]:
+    """
+    Trace the enclosed run under one root span named after the service and write
+    the spans to trace_file when it ends, even on sys.exit. Does nothing without a
+    trace file.
+    """
+    if not trace_file:
+        yield NOOP_SPAN
+        return
+    tracer.start(service_name)
+    try:
+        with tracer.span(service_name) as root:
+            yield root
+    finally:
+        tracer.write(Path(trace_file))
+        print(f"Wrote {len(tracer.finished)} spans to {trace_file}")
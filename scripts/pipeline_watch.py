@@ -0,0 +1,119 @@
+"""
+Watch mode for the refresh scripts: poll upstream cheaply, refresh only on change.
+
+Instead of a cold start per run, a watching process keeps its HTTP session,
+validators (ETag / Last-Modified) and last-seen upstream state in memory and polls
+with conditional requests. An unchanged upstream answers 304 with no body (and
+304s do not count against the GitHub API rate limit), so a poll costs a couple of
+empty responses. When something changed, only the affected stages run; a refresh
+that fails is retried on the next poll.
+
+Shared by update-instrumentation-list.py and update-library-readmes.py:
+
+    from pipeline_watch import ConditionalPoller, watch
+
+    poller = ConditionalPoller(session.get)
+    watch("instrumentation list", poll, refresh, interval=300)
+"""
+
+import random
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+from pipeline_trace import SPAN_KIND_CLIENT, tracer
+
+
+class ConditionalPoller:
+    """
+    Conditional GETs with the validators of each URL kept in memory.
+
+    `send(url, headers=...)` performs the request (a session's get, or a client
+    method that adds rate limiting and retries).
+    """
+
+    def __init__(self, send: Callable[..., requests.Response], headers: Optional[dict] = None):
+        self.send = send
+        self.headers = dict(headers or {})
+        self.validators: Dict[str, dict] = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def poll(self, url: str) -> Optional[requests.Response]:
+        """Return the response if the resource changed since the last poll (or is new), None if not or on error."""
+        headers = dict(self.headers)
+        headers.update(self.validators.get(url, {}))
+        with tracer.span("poll", SPAN_KIND_CLIENT, **{"http.request.method": "GET", "url.full": url}) as span:
+            self.requests += 1
+            try:
+                response = self.send(url, headers=headers)
+            except requests.exceptions.RequestException as e:
+                span.set_error(str(e))
+                print(f"Error polling {url}: {e}")
+                return None
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code == 304:
+                self.not_modified += 1
+                span.set_attribute("refresh.cache_hit", True)
+                return None
+            if response.status_code != 200:
+                print(f"Error polling {url}: HTTP {response.status_code}")
+                return None
+            validators = {}
+            if response.headers.get("ETag"):
+                validators["If-None-Match"] = response.headers["ETag"]
+            if response.headers.get("Last-Modified"):
+                validators["If-Modified-Since"] = response.headers["Last-Modified"]
+            self.validators[url] = validators
+            span.set_attributes(**{"refresh.cache_hit": False, "http.response.body.size": len(response.content)})
+            return response
+
+    def forget(self, url: str):
+        """Drop the validators of a URL so the next poll fetches it in full."""
+        self.validators.pop(url, None)
+
+    def report(self):
+        """Print how many polls were answered without a body."""
+        print(f"Polls: {self.requests} requests, {self.not_modified} not modified")
+
+
+def watch(name: str, poll: Callable[[], Optional[object]], refresh: Callable[[object], None],
+          interval: float, polls: Optional[int] = None, report: Optional[Callable[[], None]] = None):
+    """
+    Call poll() every `interval` seconds (with up to 10% jitter) and refresh(change)
+    whenever it returns a change. A refresh that raises or exits is reported and
+    retried with the next poll, so the watcher survives transient failures. Runs
+    until interrupted, or for `polls` polls.
+    """
+    print(f"Watching {name} every {interval:g}s (Ctrl-C to stop)")
+    pending = None
+    count = 0
+    try:
+        while polls is None or count < polls:
+            count += 1
+            change = poll()
+            if change is None and pending is not None:
+                print("Retrying the failed refresh...")
+            change = change if change is not None else pending
+            if change is not None:
+                with tracer.span("watch refresh", **{"refresh.watch.poll": count}) as span:
+                    try:
+                        refresh(change)
+                        pending = None
+                    except SystemExit as e:
+                        # The stage scripts exit on unrecoverable errors
+                        pending = None if e.code in (None, 0) else change
+                        if pending is not None:
+                            span.set_error(f"exit {e.code}")
+                            print(f"Refresh failed (exit {e.code}); will retry")
+                    except Exception as e:
+                        pending = change
+                        span.set_error(f"{type(e).__name__}: {e}")
+                        print(f"Refresh failed ({type(e).__name__}: {e}); will retry")
+                if report:
+                    report()
+            if polls is None or count < polls:
+                time.sleep(interval * (1 + random.uniform(0, 0.1)))
+    except KeyboardInterrupt:
+        print("\nStopped watching")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Script to run the whole daily refresh in one process.
+This script resolves the latest release once and then runs the instrumentation
+list stage (download, 3.0 transform, search index, V2 data processing) and the
+library README stage concurrently, sharing one GitHub client and its connection
+pool. Both stages print as they go, prefixed with their name, and the run ends
+with a summary of the files each category gained, changed or lost.
+
+The download and transforms run alongside the README stage. V2 data
+processing reads the READMEs and their manifest, so it waits until the README
+stage, including --gc, has finished; the published data then always reflects
+this run's READMEs, and GC never deletes a README V2 is reading.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from pipeline_common import load_script
+from pipeline_github import GitHubClient, HTTPCache, TagIndex, TreeCache
+from pipeline_trace import trace_to_file, tracer
+
+REPO = "open-telemetry/opentelemetry-java-instrumentation"
+
+# Generated outputs by category, as (label, directory, glob) relative to the project root
+OUTPUT_CATEGORIES = [
+    ("Instrumentation lists", ".", "instrumentation-list-*.yaml"),
+    ("V2 data files", "frontend/public/data", "**/*"),
+    ("Library READMEs", "data/library_readme", "*.md"),
+    ("Search index", "frontend/public/search-index", "**/*"),
+    ("Other data files", "data", "*.json"),
+]
+
+STAGES = ("list", "readmes")
+
+
+class StageOutput(io.TextIOBase):
+    """
+    stdout replacement that prefixes each line with the stage printing it, so the
+    two concurrent stages stay readable. The stage is taken from the thread name
+    ("list", "readmes", or a pool thread named "readmes_N"); other threads print
+    unprefixed. Lines are written whole, never interleaved mid-line.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._partial: Dict[str, str] = {}
+
+    @staticmethod
+    def stage() -> Optional[str]:
+        name = threading.current_thread().name
+        for stage in STAGES:
+            if name == stage or name.startswith(f"{stage}_"):
+                return stage
+        return None
+
+    def write(self, text: str) -> int:
+        stage = self.stage()
+        if stage is None:
+            with self._lock:
+                self.stream.write(text)
+            return len(text)
+        with self._lock:
+            *lines, rest = (self._partial.get(stage, "") + text).split("\n")
+            self._partial[stage] = rest
+            for line in lines:
+                self.stream.write(f"[{stage}] {line}\n")
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            for stage, rest in self._partial.items():
+                if rest:
+                    self.stream.write(f"[{stage}] {rest}\n")
+            self._partial.clear()
+            self.stream.flush()
+
+
+def snapshot_outputs(project_root: Path) -> Dict[str, Dict[str, str]]:
+    """Return {category: {relative path: sha256}} for the generated files."""
+    snapshot = {}
+    for label, directory, pattern in OUTPUT_CATEGORIES:
+        files = {}
+        for path in sorted((project_root / directory).glob(pattern)):
+            if path.is_file() and not path.name.endswith(".tmp"):
+                files[path.relative_to(project_root).as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+        snapshot[label] = files
+    return snapshot
+
+
+def summarize_changes(before: Dict[str, Dict[str, str]], after: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, List[str]]]:
+    """Return {category: {"added"|"changed"|"removed": [paths]}} for categories that changed."""
+    summary = {}
+    for label in after:
+        old, new = before.get(label, {}), after[label]
+        changes = {
+            "added": sorted(set(new) - set(old)),
+            "changed": sorted(path for path in set(new) & set(old) if new[path] != old[path]),
+            "removed": sorted(set(old) - set(new)),
+        }
+        changes = {kind: paths for kind, paths in changes.items() if paths}
+        if changes:
+            summary[label] = changes
+    return summary
+
+
+class Stage(threading.Thread):
+    """Run one refresh stage on its own named thread, recording its outcome."""
+
+    def __init__(self, name: str, func: Callable[[], object]):
+        super().__init__(name=name, target=tracer.wrap(self._run))
+        self.func = func
+        self.ok = False
+        self.error = None
+        self.seconds = 0.0
+
+    def _run(self):
+        start = time.perf_counter()
+        with tracer.span(f"stage {self.name}") as span:
+            try:
+                result = self.func()
+                self.ok = result is not False
+            except SystemExit as e:
+                # The stage scripts exit on unrecoverable errors
+                self.ok = e.code in (None, 0)
+                self.error = None if self.ok else f"exited ({e.code})"
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                span.set_error(self.error)
+                print(f"Error: {self.error}")
+            span.set_attribute("refresh.ok", self.ok)
+        self.seconds = time.perf_counter() - start
+
+
+def refresh(args) -> dict:
+    """Run both stages concurrently; returns the combined summary."""
+    updater = load_script("update-instrumentation-list")
+    readmes = load_script("update-library-readmes")
+    project_root = Path(__file__).parent.parent
+
+    # One client (and connection pool) for both stages
+    cache = None if args.no_cache else HTTPCache(Path(args.cache_dir), max_bytes=args.cache_max_mb * 1024 * 1024)
+    tree_cache = TreeCache(None if args.no_cache else Path(args.tree_cache))
+    tag_index = None if args.no_cache else TagIndex(Path(args.tag_index))
+    github_client = GitHubClient(pool_size=max(args.workers, 10) + 2, cache=cache, tree_cache=tree_cache,
+                                 tag_index=tag_index)
+    journal = readmes.CheckpointJournal(None if args.no_checkpoint else Path(args.checkpoint_dir))
+
+    print("Resolving latest release...")
+    latest_tag = github_client.get_latest_release_tag(REPO)
+    if not latest_tag:
+        print("Error: could not determine the latest release")
+        sys.exit(1)
+    readme_tag = args.readme_version or latest_tag
+    print(f"Latest release: {latest_tag}" + (f", READMEs for {readme_tag}" if readme_tag != latest_tag else ""))
+
+    before = snapshot_outputs(project_root)
+
+    readmes_done = threading.Event()
+
+    def wait_for_readmes():
+        if not readmes_done.is_set():
+            print("Waiting for the README stage before V2 data processing...")
+        with tracer.span("wait for readmes"):
+            readmes_done.wait()
+
+    def list_stage():
+        list_args = updater.parse_arguments(["--force"] if args.force else [])
+        updater.run_update(list_args, session=github_client.session, release_tag=latest_tag,
+                           before_v2=wait_for_readmes)
+
+    def readme_stage():
+        try:
+            ok = readmes.process_single_version(github_client, readme_tag, workers=args.workers,
+                                                tree_mode=args.tree_mode, journal=journal)
+            if ok and args.gc:
+                print("\nCollecting unreferenced README files...")
+                with tracer.span("readme gc"):
+                    readmes.collect_readme_garbage()
+            return ok
+        finally:
+            readmes_done.set()
+
+    stages = [Stage("list", list_stage), Stage("readmes", readme_stage)]
+    output = StageOutput(sys.stdout)
+    original_stdout, sys.stdout = sys.stdout, output
+    start = time.perf_counter()
+    try:
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+    finally:
+        output.flush()
+        sys.stdout = original_stdout
+    elapsed = time.perf_counter() - start
+
+    return {
+        "release": latest_tag,
+        "readme_release": readme_tag,
+        "seconds": round(elapsed, 2),
+        "stages": {
+            stage.name: {"ok": stage.ok, "seconds": round(stage.seconds, 2), "error": stage.error}
+            for stage in stages
+        },
+        "changes": summarize_changes(before, snapshot_outputs(project_root)),
+    }
+
+
+def print_summary(summary: dict):
+    """Print the combined change summary."""
+    print(f"\n{'='*60}")
+    print("REFRESH COMPLETE")
+    print(f"{'='*60}")
+    print(f"- Release: {summary['release']}")
+    for name, stage in summary["stages"].items():
+        status = "ok" if stage["ok"] else f"FAILED ({stage['error'] or 'see output'})"
+        print(f"- Stage {name}: {status} in {stage['seconds']:.1f}s")
+    print(f"- Wall time: {summary['seconds']:.1f}s")
+    if not summary["changes"]:
+        print("- No generated files changed")
+    for label, changes in summary["changes"].items():
+        counts = ", ".join(f"{len(paths)} {kind}" for kind, paths in changes.items())
+        print(f"- {label}: {counts}")
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Refresh the instrumentation lists, V2 data and library READMEs concurrently"
+    )
+    parser.add_argument(
+        "--readme-version",
+        type=str,
+        default="",
+        help="Version/tag to fetch READMEs for (default: the latest release)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent README downloads (default: 8)."
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="After the README stage, delete README files no release references."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the instrumentation list stage cache and run every step."
+    )
+    parser.add_argument(
+        "--tree-mode",
+        choices=("subtree", "recursive"),
+        default="subtree",
+        help="README discovery mode, as in update-library-readmes.py (default: subtree)."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-http"),
+        help="Directory for the conditional-request HTTP cache (default: .cache/github-http)."
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=100,
+        help="Maximum size of the HTTP cache in MB (default: 100)."
+    )
+    parser.add_argument(
+        "--tree-cache",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-trees.json"),
+        help="File caching the README candidates of each tree SHA (default: .cache/github-trees.json)."
+    )
+    parser.add_argument(
+        "--tag-index",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-tags.json"),
+        help="File indexing every tag's commit SHA and the latest release (default: .cache/github-tags.json)."
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "readme-checkpoints"),
+        help="Directory of per-commit journals the README stage resumes from (default: .cache/readme-checkpoints)."
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not resume the README stage from or write to the checkpoint journal."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the HTTP and tree caches and the tag index."
+    )
+    parser.add_argument(
+        "--summary-file",
+        type=str,
+        help="Also write the combined change summary to this JSON file."
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        help="Write OTLP/JSON spans for both stages to this file."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Run the refresh and report what changed."""
+    args = parse_arguments()
+    with trace_to_file(args.trace_file, "refresh-all"):
+        summary = refresh(args)
+    print_summary(summary)
+
+    if args.summary_file:
+        with open(args.summary_file, "w") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+
+    if not all(stage["ok"] for stage in summary["stages"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
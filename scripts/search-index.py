@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Script to build and query the full-text search index over the library READMEs
+and the telemetry names in the instrumentation-list snapshots.
+
+The index maps each token to postings per field: the libraries and versions
+whose name, description, configurations, metrics, span kinds or attributes
+contain it, and the hashed README files (with term counts) whose text does.
+It is written to frontend/public/search-index/ as small JSON shards keyed by the
+first two characters of the token, plus a manifest, so a consumer loads the
+manifest and then only the shards its query touches.
+
+Updates are incremental. The terms of each snapshot (by content hash) and of
+each README file (hashed names never change content) are kept in
+.cache/search-index-sources.json, so an update only parses new or changed
+snapshots and tokenizes new README files, and only shards whose content changed
+are written. Shard files are content-addressed, so unchanged shards keep their
+names and can be cached indefinitely.
+
+Usage:
+    python scripts/search-index.py update
+    python scripts/search-index.py query http server duration --version 2.25
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import yaml
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pipeline_common import YamlLoader, get_project_root, version_key
+
+# Bump when the tokenizer or the source or manifest format changes; cached sources are then discarded
+FORMAT = 3
+
+# Fields of library postings; README postings use "readme"
+LIBRARY_FIELDS = ("name", "description", "configuration", "metric", "span", "attribute")
+README_FIELD = "readme"
+
+MAX_TOKEN_LENGTH = 64
+
+STOPWORDS = {
+    "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it", "of", "on", "or",
+    "the", "this", "to", "with",
+}
+
+# Runs of letters/digits, optionally joined by ".", "_" or "-" (telemetry names, library ids)
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def get_output_dir() -> Path:
+    """Return the default location of the published index."""
+    return get_project_root() / "frontend" / "public" / "search-index"
+
+
+def get_sources_path() -> Path:
+    """Return the default location of the cached per-source terms."""
+    return get_project_root() / ".cache" / "search-index-sources.json"
+
+
+def tokenize(text: str) -> Iterable[str]:
+    """
+    Yield the tokens of text, lowercased. A joined name such as
+    http.server.request.duration yields itself and each of its parts.
+    """
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        parts = PART_PATTERN.findall(token)
+        if len(parts) > 1 and len(token) <= MAX_TOKEN_LENGTH:
+            yield token
+        for part in parts:
+            if len(part) >= 2 and part not in STOPWORDS and len(part) <= MAX_TOKEN_LENGTH:
+                yield part
+
+
+def shard_key(token: str) -> str:
+    """The shard holding a token: its first two characters ("_" for anything but a-z, 0-9)."""
+    return "".join(char if char.isalnum() else "_" for char in token[:2])
+
+
+def library_texts(library: dict) -> Iterable[Tuple[str, str]]:
+    """Yield (field, text) for the searchable parts of one library entry."""
+    yield "name", library["name"]
+    if library.get("display_name"):
+        yield "name", str(library["display_name"])
+    if library.get("description"):
+        yield "description", str(library["description"])
+    for configuration in library.get("configurations") or []:
+        if configuration.get("name"):
+            yield "configuration", configuration["name"]
+    for telemetry in library.get("telemetry") or []:
+        for metric in telemetry.get("metrics") or []:
+            if metric.get("name"):
+                yield "metric", metric["name"]
+            for attribute in metric.get("attributes") or []:
+                if attribute.get("name"):
+                    yield "attribute", attribute["name"]
+        for span in telemetry.get("spans") or []:
+            if span.get("span_kind"):
+                yield "span", span["span_kind"]
+            for attribute in span.get("attributes") or []:
+                if attribute.get("name"):
+                    yield "attribute", attribute["name"]
+
+
+def snapshot_terms(path: Path) -> Dict[str, Dict[str, List[str]]]:
+    """Parse one snapshot and return {token: {field: [libraries]}}."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    if not isinstance(data, dict) or not isinstance(data.get("libraries"), dict):
+        print(f"Skipping {path.name}: no 'libraries' section")
+        return {}
+    terms: Dict[str, Dict[str, set]] = {}
+    for libraries in data["libraries"].values():
+        for library in libraries or []:
+            if not library.get("name"):
+                continue
+            for field, text in library_texts(library):
+                for token in tokenize(text):
+                    terms.setdefault(token, {}).setdefault(field, set()).add(library["name"])
+    return {
+        token: {field: sorted(names) for field, names in fields.items()}
+        for token, fields in terms.items()
+    }
+
+
+def readme_terms(path: Path) -> Dict[str, int]:
+    """Tokenize one README file and return {token: count}."""
+    counts: Dict[str, int] = {}
+    for token in tokenize(path.read_text(encoding="utf-8")):
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+def parse_readme_filename(filename: str) -> Tuple[str, str]:
+    """Split "<library>-<12 hex hash>.md" into (library, hash)."""
+    stem = filename[:-3]
+    return stem[:-13], stem[-12:]
+
+
+def load_sources(sources_path: Path) -> dict:
+    """Load the cached per-source terms, or an empty cache if missing or outdated."""
+    try:
+        with open(sources_path, "r", encoding="utf-8") as f:
+            sources = json.load(f)
+    except FileNotFoundError:
+        sources = {}
+    except (IOError, ValueError) as e:
+        print(f"Warning: could not read {sources_path}, rebuilding: {e}")
+        sources = {}
+    if sources.get("format") != FORMAT:
+        sources = {"format": FORMAT}
+    sources.setdefault("versions", [])
+    sources.setdefault("snapshots", {})
+    sources.setdefault("readmes", {})
+    return sources
+
+
+def write_json(path: Path, data, **kwargs):
+    """Write JSON atomically."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **kwargs)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def refresh_sources(sources: dict, project_root: Path) -> bool:
+    """
+    Bring the cached terms in line with the snapshots and README files on disk,
+    parsing only new or changed ones. Returns whether anything changed.
+    """
+    changed = False
+
+    snapshots = {
+        path.stem[len("instrumentation-list-"):]: path
+        for path in project_root.glob("instrumentation-list-*.yaml")
+    }
+    for version in sorted(set(sources["snapshots"]) - set(snapshots), key=version_key):
+        print(f"Dropping removed snapshot {version}")
+        del sources["snapshots"][version]
+        changed = True
+    for version in sorted(snapshots, key=version_key):
+        digest = hashlib.sha256(snapshots[version].read_bytes()).hexdigest()
+        cached = sources["snapshots"].get(version)
+        if cached and cached["sha256"] == digest:
+            continue
+        print(f"Indexing {snapshots[version].name}")
+        sources["snapshots"][version] = {"sha256": digest, "terms": snapshot_terms(snapshots[version])}
+        changed = True
+
+    # Versions keep the bit position they were first given, so adding a release
+    # does not change the postings of the others; a removed version's slot is freed
+    slots = [version if version in snapshots else None for version in sources["versions"]]
+    for version in sorted(snapshots, key=version_key):
+        if version in slots:
+            continue
+        if None in slots:
+            slots[slots.index(None)] = version
+        else:
+            slots.append(version)
+    while slots and slots[-1] is None:
+        slots.pop()
+    if slots != sources["versions"]:
+        sources["versions"] = slots
+        changed = True
+
+    readme_dir = project_root / "data" / "library_readme"
+    readme_files = set()
+    if readme_dir.is_dir():
+        with os.scandir(readme_dir) as entries:
+            readme_files = {entry.name for entry in entries if entry.is_file() and entry.name.endswith(".md")}
+    for filename in sorted(set(sources["readmes"]) - readme_files):
+        del sources["readmes"][filename]
+        changed = True
+    new_readmes = sorted(readme_files - set(sources["readmes"]))
+    for filename in new_readmes:
+        sources["readmes"][filename] = {"terms": readme_terms(readme_dir / filename)}
+        changed = True
+    if new_readmes:
+        print(f"Indexed {len(new_readmes)} new README file(s)")
+
+    return changed
+
+
+def minor_version(version: str) -> str:
+    """Reduce a release or tag (v2.25.1) to the major.minor of the snapshots (2.25)."""
+    return ".".join(version.lstrip("v").split(".")[:2])
+
+
+def readme_versions(project_root: Path, versions: List[str], filenames: List[str]) -> Dict[str, List[str]]:
+    """
+    Return {README filename: [snapshot versions]}. Each snapshot version takes
+    its READMEs the way dataGenerator.ts does: those of its newest release in the
+    README manifest, or the manifest's "current" ones if it has no release there.
+    Without a manifest, every README file applies to every version.
+    """
+    manifest_path = project_root / "data" / "library_readme_manifest.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = None
+    except (IOError, ValueError) as e:
+        print(f"Warning: could not read README manifest {manifest_path}: {e}")
+        manifest = None
+    if manifest is None:
+        return {filename: list(versions) for filename in filenames}
+
+    releases = manifest.get("versions", {})
+    result: Dict[str, List[str]] = {}
+    for version in versions:
+        matching = [release for release in releases if release == version or release.startswith(f"{version}.")]
+        if matching:
+            readmes = releases[max(matching, key=version_key)].get("readmes", {})
+        else:
+            readmes = manifest.get("current", {})
+        for filename in set(readmes.values()):
+            result.setdefault(filename, []).append(version)
+    return result
+
+
+def build_shards(sources: dict) -> Dict[str, Dict[str, dict]]:
+    """
+    Merge the cached terms into {shard key: {token: postings}}. Library fields
+    map library -> bitmask of version slots; "readme" maps library -> {hash: count}.
+    """
+    slot_bits = {version: 1 << slot for slot, version in enumerate(sources["versions"]) if version}
+    tokens: Dict[str, dict] = {}
+    for version, snapshot in sources["snapshots"].items():
+        bit = slot_bits[version]
+        for token, fields in snapshot["terms"].items():
+            postings = tokens.setdefault(token, {})
+            for field, libraries in fields.items():
+                masks = postings.setdefault(field, {})
+                for library in libraries:
+                    masks[library] = masks.get(library, 0) | bit
+    for filename, readme in sources["readmes"].items():
+        library, content_hash = parse_readme_filename(filename)
+        for token, count in readme["terms"].items():
+            tokens.setdefault(token, {}).setdefault(README_FIELD, {}).setdefault(library, {})[content_hash] = count
+
+    shards: Dict[str, Dict[str, dict]] = {}
+    for token in sorted(tokens):
+        shards.setdefault(shard_key(token), {})[token] = tokens[token]
+    return shards
+
+
+def write_index(sources: dict, project_root: Path, output_dir: Path) -> Tuple[int, int, bool]:
+    """
+    Write the shards and manifest, leaving unchanged files untouched and deleting
+    shards no longer referenced. Returns (shards written, shards total, manifest written).
+    """
+    shards_dir = output_dir / "shards"
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    existing = {path.name for path in shards_dir.glob("*.json")}
+
+    written = 0
+    shard_entries = {}
+    for key, tokens in build_shards(sources).items():
+        content = json.dumps(tokens, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        filename = f"{key}-{hashlib.sha256(content).hexdigest()[:12]}.json"
+        if filename not in existing:
+            tmp_path = shards_dir / (filename + ".tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, shards_dir / filename)
+            written += 1
+        shard_entries[key] = {"file": f"shards/{filename}", "tokens": len(tokens), "bytes": len(content)}
+
+    versions = readme_versions(project_root, [version for version in sources["versions"] if version],
+                               sorted(sources["readmes"]))
+    readmes = {}
+    for filename in sorted(sources["readmes"]):
+        # Keyed by filename: libraries with identical README text share a content hash
+        library, content_hash = parse_readme_filename(filename)
+        readmes[filename] = {
+            "library": library,
+            "hash": content_hash,
+            "versions": sorted(versions.get(filename, []), key=version_key),
+        }
+
+    manifest = {
+        "format": FORMAT,
+        "versions": sources["versions"],
+        "fields": list(LIBRARY_FIELDS) + [README_FIELD],
+        "readmes": readmes,
+        "shards": shard_entries,
+    }
+    manifest_path = output_dir / "manifest.json"
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest_unchanged = json.load(f) == manifest
+    except (IOError, ValueError):
+        manifest_unchanged = False
+    if not manifest_unchanged:
+        write_json(manifest_path, manifest, indent=1, sort_keys=True)
+
+    referenced = {entry["file"][len("shards/"):] for entry in shard_entries.values()}
+    for filename in sorted(existing - referenced):
+        (shards_dir / filename).unlink()
+    return written, len(shard_entries), not manifest_unchanged
+
+
+def update_index(project_root: Optional[Path] = None, output_dir: Optional[Path] = None,
+                 sources_path: Optional[Path] = None, rebuild: bool = False) -> bool:
+    """
+    Fold new or changed snapshots and README files into the index. Concurrent
+    updates (the list and README stages of refresh-all) are serialized with a
+    lock file. Returns whether the published index changed.
+    """
+    project_root = project_root or get_project_root()
+    output_dir = output_dir or get_output_dir()
+    sources_path = sources_path or get_sources_path()
+    sources_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(sources_path.with_name(sources_path.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        start = time.perf_counter()
+        sources = {"format": FORMAT, "versions": [], "snapshots": {}, "readmes": {}} if rebuild \
+            else load_sources(sources_path)
+        sources_changed = refresh_sources(sources, project_root)
+        if sources_changed:
+            write_json(sources_path, sources, separators=(",", ":"))
+
+        written, total, manifest_written = write_index(sources, project_root, output_dir)
+        elapsed = time.perf_counter() - start
+        if written or manifest_written:
+            print(f"Search index updated: {written} of {total} shards written in {elapsed:.2f}s")
+        else:
+            print(f"Search index is up to date ({total} shards, {elapsed:.2f}s)")
+        return bool(written or manifest_written)
+
+
+class SearchIndex:
+    """
+    Read-side view over a published index that loads shards on demand, the way
+    a browser consumer would: the manifest first, then one shard per query token.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        with open(output_dir / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._shards: Dict[str, dict] = {}
+
+    def shard(self, key: str) -> dict:
+        """Return a shard's tokens, loading it on first use."""
+        if key not in self._shards:
+            entry = self.manifest["shards"].get(key)
+            if entry is None:
+                self._shards[key] = {}
+            else:
+                with open(self.output_dir / entry["file"], "r", encoding="utf-8") as f:
+                    self._shards[key] = json.load(f)
+        return self._shards[key]
+
+    def versions(self, mask: int) -> List[str]:
+        """Decode a version bitmask."""
+        return [version for slot, version in enumerate(self.manifest["versions"]) if version and mask >> slot & 1]
+
+    def lookup(self, token: str, prefix: bool = False) -> Dict[str, dict]:
+        """Return {token: postings} for a token, or for every token it prefixes."""
+        if not prefix:
+            postings = self.shard(shard_key(token)).get(token)
+            return {token: postings} if postings else {}
+        keys = [key for key in self.manifest["shards"] if key.startswith(shard_key(token))]
+        return {
+            candidate: postings
+            for key in keys
+            for candidate, postings in self.shard(key).items()
+            if candidate.startswith(token)
+        }
+
+    def search(self, query: str, version: Optional[str] = None, prefix: bool = False) -> List[dict]:
+        """
+        Return the libraries matching every token of the query (the last one as a
+        prefix if asked), with the fields that matched and the matching READMEs,
+        best matches first. A version (2.25, or a release such as 2.25.1) keeps
+        only matches in that snapshot version.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+        if version:
+            version = minor_version(version)
+        results: Optional[Dict[str, dict]] = None
+        for i, token in enumerate(query_tokens):
+            matches: Dict[str, dict] = {}
+            for postings in self.lookup(token, prefix=prefix and i == len(query_tokens) - 1).values():
+                for field, libraries in postings.items():
+                    for library, value in libraries.items():
+                        if field == README_FIELD:
+                            readmes = {
+                                f"{library}-{content_hash}.md": count for content_hash, count in value.items()
+                                if not version
+                                or version in self.manifest["readmes"][f"{library}-{content_hash}.md"]["versions"]
+                            }
+                            if not readmes:
+                                continue
+                            match = matches.setdefault(library, {"fields": {}, "readmes": {}})
+                            for filename, count in readmes.items():
+                                match["readmes"][filename] = match["readmes"].get(filename, 0) + count
+                        else:
+                            versions = self.versions(value)
+                            if version and version not in versions:
+                                continue
+                            match = matches.setdefault(library, {"fields": {}, "readmes": {}})
+                            match["fields"].setdefault(field, set()).update(versions)
+            if results is None:
+                results = matches
+            else:
+                results = {library: results[library] for library in results if library in matches}
+                for library, match in results.items():
+                    for field, versions in matches[library]["fields"].items():
+                        match["fields"].setdefault(field, set()).update(versions)
+                    for filename, count in matches[library]["readmes"].items():
+                        match["readmes"][filename] = match["readmes"].get(filename, 0) + count
+            if not results:
+                return []
+
+        ranked = []
+        for library, match in results.items():
+            score = 2 * len(match["fields"]) + sum(match["readmes"].values()) / 10
+            ranked.append({
+                "library": library,
+                "score": score,
+                "fields": {field: sorted(versions, key=version_key) for field, versions in sorted(match["fields"].items())},
+                "readmes": sorted(match["readmes"]),
+            })
+        return sorted(ranked, key=lambda result: (-result["score"], result["library"]))
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Build or query the full-text search index over library READMEs and telemetry names"
+    )
+    parser.add_argument(
+        "command",
+        choices=("update", "query"),
+        help="update: fold new snapshots and READMEs into the index; query: search it."
+    )
+    parser.add_argument("query", nargs="*", help="Search terms (query only).")
+    parser.add_argument("--version", type=str, help="Only match this version (query only).")
+    parser.add_argument("--prefix", action="store_true", help="Treat the last search term as a prefix (query only).")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of results (default: 20).")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the cached source terms and re-tokenize every snapshot and README."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=str(get_output_dir()),
+        help="Directory of the published index (default: frontend/public/search-index)."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Update the index, or run a query against it."""
+    args = parse_arguments()
+    output_dir = Path(args.output_dir)
+
+    if args.command == "update":
+        update_index(output_dir=output_dir, rebuild=args.rebuild)
+        return
+
+    if not args.query:
+        print("Error: query needs at least one search term")
+        sys.exit(1)
+    if not (output_dir / "manifest.json").exists():
+        update_index(output_dir=output_dir)
+
+    index = SearchIndex(output_dir)
+    results = index.search(" ".join(args.query), version=args.version, prefix=args.prefix)
+    for result in results[:args.limit]:
+        fields = "; ".join(f"{field} in {', '.join(versions)}" for field, versions in result["fields"].items())
+        print(f"{result['library']}: {fields or 'README only'}")
+        for filename in result["readmes"]:
+            print(f"  README {filename}")
+    print(f"{len(results)} librar{'y' if len(results) == 1 else 'ies'} matched; "
+          f"loaded {len(index._shards)} of {len(index.manifest['shards'])} shards")
+
+
+if __name__ == "__main__":
+    main()
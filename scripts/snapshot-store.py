@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Script to keep the instrumentation-list snapshots in a deduplicated chunk store.
+This script splits each instrumentation-list-*.yaml into chunks (the header,
+each library group line, each library entry's metadata and its telemetry
+section), stores every distinct chunk once under its content hash, and writes a
+per-version manifest listing the chunk hashes in order. Any version's YAML text
+(byte-identical to the original) or parsed document can be rebuilt on demand.
+
+This is a standalone tool for archiving snapshots or shipping them compactly.
+The pipeline does not run it. The V2 generator and the search and
+instrumentation indexes read the committed YAML files, so the store saves
+space only where it replaces them.
+
+Usage:
+    python scripts/snapshot-store.py pack
+    python scripts/snapshot-store.py materialize 2.23 --output /tmp/instrumentation-list-2.23.yaml
+    python scripts/snapshot-store.py verify
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import yaml
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pipeline_common import YamlLoader, get_project_root, list_snapshots, version_key
+
+# Chunk kinds, in the order they appear in a snapshot
+CHUNK_TOP = "top"          # a top-level key (file_format, libraries:, internal:) and comments
+CHUNK_ITEM = "item"        # "- name: ..." list item of a top-level section other than libraries
+CHUNK_GROUP = "group"      # "  <library>:" line under libraries
+CHUNK_ENTRY = "entry"      # "  - name: ..." metadata of one library entry
+CHUNK_FIELDS = "fields"    # "    telemetry:" and anything after it in the same entry
+
+TOP_LINE = re.compile(r"^[^\s#-]")
+ITEM_LINE = re.compile(r"^- ")
+GROUP_LINE = re.compile(r"^  [^\s#-][^:]*:\s*$")
+ENTRY_LINE = re.compile(r"^  - ")
+FIELDS_LINE = re.compile(r"^    telemetry:")
+
+
+def get_store_dir() -> Path:
+    """Return the default chunk store directory."""
+    return get_project_root() / "data" / "instrumentation_snapshots"
+
+
+def hash_chunk(text: str) -> str:
+    """Return the content hash a chunk is stored under."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def split_snapshot(text: str) -> List[Tuple[str, str]]:
+    """
+    Split an instrumentation list into (kind, text) chunks whose concatenation is
+    the original text. Splits follow the layout the upstream generator emits.
+    """
+    chunks: List[Tuple[str, str]] = []
+    kind = CHUNK_TOP
+    current: List[str] = []
+    in_libraries = False
+
+    for line in text.splitlines(keepends=True):
+        if TOP_LINE.match(line):
+            # Consecutive top-level scalars (file_format, ...) share one chunk
+            new_kind = CHUNK_TOP if kind != CHUNK_TOP else None
+            in_libraries = line.startswith("libraries:")
+        elif ITEM_LINE.match(line) and not in_libraries:
+            new_kind = CHUNK_ITEM
+        elif in_libraries and GROUP_LINE.match(line):
+            new_kind = CHUNK_GROUP
+        elif in_libraries and ENTRY_LINE.match(line):
+            new_kind = CHUNK_ENTRY
+        elif in_libraries and kind in (CHUNK_ENTRY, CHUNK_FIELDS) and FIELDS_LINE.match(line):
+            new_kind = CHUNK_FIELDS
+        else:
+            new_kind = None
+
+        if new_kind and current:
+            chunks.append((kind, "".join(current)))
+            current = []
+        if new_kind:
+            kind = new_kind
+        current.append(line)
+
+    if current:
+        chunks.append((kind, "".join(current)))
+    return chunks
+
+
+class SnapshotStore:
+    """
+    Content-addressed chunks plus one manifest per version.
+
+    chunks.json maps hash -> chunk text (one chunk per line, so adding a release
+    only adds lines); <version>.json lists [kind, hash] pairs in order.
+    """
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = store_dir
+        self.chunks: Dict[str, str] = {}
+        self.manifests: Dict[str, dict] = {}
+        self._parsed: Dict[str, object] = {}
+
+        chunks_path = store_dir / "chunks.json"
+        if chunks_path.exists():
+            with open(chunks_path, "r", encoding="utf-8") as f:
+                self.chunks = json.load(f)
+        if store_dir.exists():
+            for path in store_dir.glob("*.json"):
+                if path.name != "chunks.json":
+                    with open(path, "r", encoding="utf-8") as f:
+                        self.manifests[path.stem] = json.load(f)
+
+    def versions(self) -> List[str]:
+        """Return the stored versions, oldest first."""
+        return sorted(self.manifests, key=version_key)
+
+    def add_snapshot(self, version: str, text: str) -> int:
+        """Store a snapshot; returns the number of chunks that were not stored yet."""
+        entries = []
+        added = 0
+        for kind, chunk in split_snapshot(text):
+            chunk_hash = hash_chunk(chunk)
+            if chunk_hash not in self.chunks:
+                self.chunks[chunk_hash] = chunk
+                added += 1
+            entries.append([kind, chunk_hash])
+        self.manifests[version] = {
+            "version": version,
+            "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "chunks": entries,
+        }
+        if self.materialize_text(version) != text:
+            raise ValueError(f"Chunking {version} does not round-trip")
+        return added
+
+    def prune(self) -> int:
+        """Drop chunks no manifest references; returns how many were dropped."""
+        referenced = {chunk_hash for manifest in self.manifests.values() for _, chunk_hash in manifest["chunks"]}
+        unreferenced = [chunk_hash for chunk_hash in self.chunks if chunk_hash not in referenced]
+        for chunk_hash in unreferenced:
+            del self.chunks[chunk_hash]
+        return len(unreferenced)
+
+    def save(self):
+        """Write chunks.json and the manifests atomically."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        write_json(self.store_dir / "chunks.json", self.chunks, indent=0)
+        for version, manifest in self.manifests.items():
+            write_json(self.store_dir / f"{version}.json", manifest, indent=None)
+
+    def materialize_text(self, version: str) -> str:
+        """Rebuild a version's YAML text exactly as it was stored."""
+        return "".join(self.chunks[chunk_hash] for _, chunk_hash in self.manifests[version]["chunks"])
+
+    def _parse_chunk(self, chunk_hash: str):
+        if chunk_hash not in self._parsed:
+            self._parsed[chunk_hash] = yaml.load(self.chunks[chunk_hash], Loader=YamlLoader)
+        return self._parsed[chunk_hash]
+
+    def materialize_data(self, version: str) -> dict:
+        """
+        Rebuild a version's parsed document, equal to yaml-loading its text.
+
+        Chunks are parsed once per store and shared between versions, so the
+        nested values of the result must be treated as read-only.
+        """
+        data: dict = {}
+        libraries: Dict[str, list] = {}
+        section: Optional[str] = None
+        entries: Optional[list] = None
+        for kind, chunk_hash in self.manifests[version]["chunks"]:
+            parsed = self._parse_chunk(chunk_hash)
+            if parsed is None:
+                continue
+            if kind == CHUNK_TOP:
+                data.update(parsed)
+                section = list(parsed)[-1]
+                if section == "libraries":
+                    data["libraries"] = libraries
+            elif kind == CHUNK_ITEM:
+                if data[section] is None:
+                    data[section] = []
+                data[section].extend(parsed)
+            elif kind == CHUNK_GROUP:
+                (group,) = parsed
+                entries = libraries.setdefault(group, [])
+            elif kind == CHUNK_ENTRY:
+                entries.append(dict(parsed[0]))
+            else:
+                entries[-1].update(parsed)
+        return data
+
+    def changed_chunks(self, base_version: str, compare_version: str) -> List[Tuple[str, str]]:
+        """Return the (kind, hash) chunks of compare_version that base_version does not have."""
+        base = {chunk_hash for _, chunk_hash in self.manifests[base_version]["chunks"]}
+        return [(kind, chunk_hash) for kind, chunk_hash in self.manifests[compare_version]["chunks"]
+                if chunk_hash not in base]
+
+
+def write_json(path: Path, data, indent: Optional[int]):
+    """Write JSON atomically with stable ordering."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def pack(store: SnapshotStore, project_root: Path, prune: bool):
+    """Add every snapshot in the project root to the store."""
+    total_bytes = 0
+    for version, path in list_snapshots(project_root):
+        text = path.read_text(encoding="utf-8")
+        total_bytes += len(text.encode("utf-8"))
+        added = store.add_snapshot(version, text)
+        print(f"{path.name}: {len(store.manifests[version]['chunks'])} chunks, {added} new")
+    if prune:
+        print(f"Pruned {store.prune()} unreferenced chunks")
+    store.save()
+
+    stored_bytes = sum(len(chunk.encode("utf-8")) for chunk in store.chunks.values())
+    print(f"\n{len(store.chunks)} unique chunks, {stored_bytes // 1024}KB stored "
+          f"for {total_bytes // 1024}KB of snapshots")
+
+
+def verify(store: SnapshotStore, project_root: Path) -> bool:
+    """Check every version rebuilds to its recorded hash and parses like the original."""
+    ok = True
+    for version in store.versions():
+        text = store.materialize_text(version)
+        text_ok = hashlib.sha256(text.encode("utf-8")).hexdigest() == store.manifests[version]["sha256"]
+        data_ok = store.materialize_data(version) == yaml.load(text, Loader=YamlLoader)
+        snapshot_path = project_root / f"instrumentation-list-{version}.yaml"
+        file_note = ""
+        if snapshot_path.exists() and snapshot_path.read_text(encoding="utf-8") != text:
+            file_note = " (differs from the file on disk; run pack)"
+        print(f"{version}: text {'ok' if text_ok else 'MISMATCH'}, data {'ok' if data_ok else 'MISMATCH'}{file_note}")
+        ok = ok and text_ok and data_ok
+    return ok
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Store instrumentation-list snapshots as deduplicated chunks and rebuild them on demand"
+    )
+    parser.add_argument(
+        "command",
+        choices=["pack", "materialize", "verify", "changed"],
+        help="pack the snapshots, materialize a version, verify the store, or list chunks changed between two versions."
+    )
+    parser.add_argument("versions", nargs="*", help="Version(s) for materialize / changed (e.g. 2.23).")
+    parser.add_argument("--store-dir", type=Path, default=None,
+                        help="Chunk store directory (default: data/instrumentation_snapshots).")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="materialize: file to write (default: stdout).")
+    parser.add_argument("--prune", action="store_true", help="pack: drop chunks no manifest references.")
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_arguments()
+    project_root = get_project_root()
+    store = SnapshotStore(args.store_dir or get_store_dir())
+
+    if args.command == "pack":
+        pack(store, project_root, args.prune)
+        return
+
+    if args.command == "verify":
+        if not verify(store, project_root):
+            sys.exit(1)
+        return
+
+    missing = [version for version in args.versions if version not in store.manifests]
+    if missing:
+        print(f"Version(s) not in the store: {', '.join(missing)} (have: {', '.join(store.versions())})")
+        sys.exit(1)
+
+    if args.command == "materialize":
+        if len(args.versions) != 1:
+            print("materialize takes one version")
+            sys.exit(1)
+        text = store.materialize_text(args.versions[0])
+        if args.output:
+            args.output.write_text(text, encoding="utf-8")
+            print(f"Wrote {args.output}")
+        else:
+            sys.stdout.write(text)
+    else:
+        if len(args.versions) != 2:
+            print("changed takes two versions")
+            sys.exit(1)
+        changed = store.changed_chunks(*args.versions)
+        print(f"{len(changed)} of {len(store.manifests[args.versions[1]]['chunks'])} chunks changed")
+        for kind, chunk_hash in changed:
+            first_line = store.chunks[chunk_hash].splitlines()[0].strip() if store.chunks[chunk_hash] else ""
+            print(f"  {kind:<6} {chunk_hash}  {first_line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Shared fixtures: the offline GitHub stand-in serving a small synthetic repository."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_common import load_script  # noqa: E402
+
+LIBRARIES = ("grpc-1.6", "jdbc", "kafka-clients-2.6")
+
+
+@pytest.fixture(scope="session")
+def stand_in_module():
+    return load_script("github-stand-in")
+
+
+@pytest.fixture
+def stand_in(tmp_path_factory, stand_in_module):
+    """
+    Start a stand-in server for a repository with one README per library:
+    stand_in(libraries=..., tree_limit=..., old_tags=..., **StandInState options).
+    """
+    servers = []
+
+    def start(libraries=LIBRARIES, tree_limit=None, old_tags=3, **options):
+        project_root = tmp_path_factory.mktemp("upstream")
+        readme_dir = project_root / "data" / "library_readme"
+        readme_dir.mkdir(parents=True)
+        for library in libraries:
+            content = f"# {library}\n\nLibrary instrumentation for {library}.\n"
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+            (readme_dir / f"{library}-{content_hash}.md").write_text(content)
+        (project_root / "instrumentation-list-2.25.yaml").write_text("libraries: {}\n")
+
+        fixture = stand_in_module.RepositoryFixture(project_root, filler_files=2, tree_limit=tree_limit,
+                                                    old_tags=old_tags)
+        server = stand_in_module.StandInServer(stand_in_module.StandInState(fixture, **options)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
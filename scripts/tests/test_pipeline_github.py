@@ -0,0 +1,192 @@
+"""Tests for the GitHub client, its caches, tag index and rate-limit scheduler, run against the offline stand-in."""
+
+import json
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_github import GitHubClient, HTTPCache, RateLimitScheduler, TagIndex  # noqa: E402
+
+REPO = "open-telemetry/opentelemetry-java-instrumentation"
+# random.Random(1) rolls below 0.5 and then above it: the first request fails, the retry succeeds
+FAIL_ONCE_SEED = 1
+
+
+def readme_path(library):
+    return f"instrumentation/{library}/library/README.md"
+
+
+def fetch_readme(client, server, library):
+    return client.get_file_content(REPO, readme_path(library), server.state.fixture.commit_sha)
+
+
+def expire_tag_index(path):
+    data = json.loads(path.read_text())
+    data["repos"][REPO]["expires_at"] = 0
+    path.write_text(json.dumps(data))
+
+
+def test_not_modified_response_is_served_from_the_cache(stand_in, tmp_path):
+    server = stand_in()
+    client = GitHubClient(cache=HTTPCache(tmp_path / "http"), base_url=server.url)
+
+    first = fetch_readme(client, server, "jdbc")
+    second = fetch_readme(client, server, "jdbc")
+
+    assert first == second == "# jdbc\n\nLibrary instrumentation for jdbc.\n"
+    assert server.state.stats()["statuses"] == {"200": 1, "304": 1}
+    assert (client.cache.hits, client.cache.stores) == (1, 1)
+
+
+def test_validators_persist_across_runs(stand_in, tmp_path):
+    server = stand_in()
+    first = fetch_readme(GitHubClient(cache=HTTPCache(tmp_path / "http"), base_url=server.url), server, "jdbc")
+
+    # A new process: the ETag and body are read back from disk
+    client = GitHubClient(cache=HTTPCache(tmp_path / "http"), base_url=server.url)
+    assert fetch_readme(client, server, "jdbc") == first
+    assert server.state.stats()["statuses"] == {"200": 1, "304": 1}
+
+
+def test_least_recently_used_entries_are_evicted(stand_in, tmp_path):
+    server = stand_in()
+    cache = HTTPCache(tmp_path / "http")
+    client = GitHubClient(cache=cache, base_url=server.url)
+    fetch_readme(client, server, "jdbc")
+    fetch_readme(client, server, "kafka-clients-2.6")
+    # Using jdbc again makes kafka-clients the least recently used
+    fetch_readme(client, server, "jdbc")
+
+    cache.max_bytes = max(path.stat().st_size for path in (tmp_path / "http").glob("*.body"))
+    fetch_readme(client, server, "grpc-1.6")
+
+    url = f"{server.url}/repos/{REPO}/contents/"
+    params = {"ref": server.state.fixture.commit_sha}
+    assert cache.evictions == 2
+    assert cache.lookup(url + readme_path("grpc-1.6"), params) is not None
+    assert cache.lookup(url + readme_path("jdbc"), params) is None
+    assert cache.lookup(url + readme_path("kafka-clients-2.6"), params) is None
+    # The size is tracked in memory and rebuilt from disk on start
+    assert HTTPCache(tmp_path / "http", max_bytes=cache.max_bytes).evictions == 0
+
+
+def test_entry_evicted_after_lookup_still_replays(stand_in, tmp_path):
+    server = stand_in()
+    cache = HTTPCache(tmp_path / "http")
+    fetch_readme(GitHubClient(cache=cache, base_url=server.url), server, "jdbc")
+
+    url = f"{server.url}/repos/{REPO}/contents/{readme_path('jdbc')}"
+    params = {"ref": server.state.fixture.commit_sha}
+    entry = cache.lookup(url, params)
+    # Another worker's store evicts the entry between lookup and the 304
+    cache.max_bytes = 0
+    cache.evict()
+    assert not list((tmp_path / "http").iterdir())
+
+    not_modified = requests.get(url, params=params, headers=cache.conditional_headers(entry))
+    assert not_modified.status_code == 304
+    assert cache.replay(entry, not_modified).json()["path"] == readme_path("jdbc")
+
+
+def test_scheduler_waits_for_reset_once_budget_is_spent(stand_in):
+    server = stand_in(rate_limit=2, rate_limit_window=2)
+    scheduler = RateLimitScheduler(reserve=0)
+    client = GitHubClient(base_url=server.url, scheduler=scheduler)
+
+    for library in ("grpc-1.6", "jdbc", "kafka-clients-2.6"):
+        assert fetch_readme(client, server, library) is not None
+
+    # X-RateLimit-Remaining reached 0, so the third request waited instead of drawing a 403
+    assert server.state.stats()["statuses"] == {"200": 3}
+    assert scheduler.waited > 0
+    assert scheduler.retries == 0
+
+
+def test_exhausted_limit_is_retried_after_reset(stand_in):
+    server = stand_in(rate_limit=1, rate_limit_window=2)
+    # Another client spends the shared budget first
+    fetch_readme(GitHubClient(base_url=server.url), server, "grpc-1.6")
+    scheduler = RateLimitScheduler()
+    client = GitHubClient(base_url=server.url, scheduler=scheduler)
+
+    assert fetch_readme(client, server, "jdbc") is not None
+    assert server.state.stats()["statuses"] == {"200": 2, "403": 1}
+    assert scheduler.retries == 1
+    assert scheduler.waited > 0
+
+
+def test_secondary_limit_honours_retry_after(stand_in):
+    server = stand_in(error_403_rate=0.5, seed=FAIL_ONCE_SEED)
+    scheduler = RateLimitScheduler()
+    client = GitHubClient(base_url=server.url, scheduler=scheduler)
+
+    assert fetch_readme(client, server, "jdbc") is not None
+    assert server.state.stats()["statuses"] == {"200": 1, "403": 1}
+    assert scheduler.retries == 1
+    # The stand-in sends Retry-After: 1
+    assert scheduler.waited >= 0.9
+
+
+def test_server_error_is_retried_with_backoff(stand_in):
+    server = stand_in(error_5xx_rate=0.5, seed=FAIL_ONCE_SEED)
+    scheduler = RateLimitScheduler(backoff_base=0.01)
+    client = GitHubClient(base_url=server.url, scheduler=scheduler)
+
+    assert fetch_readme(client, server, "jdbc") is not None
+    assert server.state.stats()["statuses"] == {"200": 1, "502": 1}
+    assert scheduler.retries == 1
+    assert scheduler.waited < 1
+
+
+def test_annotated_tags_are_dereferenced_once(stand_in, tmp_path):
+    server = stand_in(old_tags=3)
+    client = GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json"))
+
+    assert client.get_commit_sha_for_tag(REPO, "v1.1.0") == server.state.fixture.commit_sha
+    assert client.get_commit_sha_for_tag(REPO, "v1.2.0") == server.state.fixture.commit_sha
+    assert server.state.stats()["endpoints"] == {"latest_release": 1, "matching_refs": 1, "tag_objects": 3}
+
+    # Relisting reuses the saved tag objects: they never change
+    server.state.reset_stats()
+    client = GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json"))
+    assert client.refresh_tag_index(REPO)
+    assert server.state.stats()["endpoints"] == {"latest_release": 1, "matching_refs": 1}
+
+
+def test_expired_tag_index_is_revalidated(stand_in, tmp_path):
+    server = stand_in()
+    fixture = server.state.fixture
+    GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json")).refresh_tag_index(REPO)
+
+    # Within the TTL the index answers without a request
+    server.state.reset_stats()
+    client = GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json"))
+    assert client.get_latest_release_tag(REPO) == fixture.tag
+    assert client.get_commit_sha_for_tag(REPO, "v1.0.0") == fixture.commit_sha
+    assert server.state.stats()["total"] == 0
+
+    # Once expired, an unchanged release costs one 304 and keeps the tags
+    expire_tag_index(tmp_path / "tags.json")
+    client = GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json"))
+    assert client.get_latest_release_tag(REPO) == fixture.tag
+    assert client.get_commit_sha_for_tag(REPO, "v1.0.0") == fixture.commit_sha
+    assert server.state.stats()["statuses"] == {"304": 1}
+
+
+def test_new_release_relists_tags(stand_in, tmp_path):
+    server = stand_in()
+    fixture = server.state.fixture
+    GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json")).refresh_tag_index(REPO)
+    expire_tag_index(tmp_path / "tags.json")
+
+    fixture.tag = "v2.26.0"
+    server.state.reset_stats()
+    client = GitHubClient(base_url=server.url, tag_index=TagIndex(tmp_path / "tags.json"))
+    assert client.get_latest_release_tag(REPO) == "v2.26.0"
+    assert client.get_commit_sha_for_tag(REPO, "v2.26.0") == fixture.commit_sha
+    # The changed release is a full response, the tags are listed again, known tag objects are not
+    assert server.state.stats()["statuses"] == {"200": 3}
+    assert server.state.stats()["endpoints"] == {"latest_release": 2, "matching_refs": 1}
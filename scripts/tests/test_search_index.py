@@ -0,0 +1,75 @@
+"""Tests for the README versions of search-index.py."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_common import load_script  # noqa: E402
+
+SNAPSHOT = """\
+libraries:
+  jdbc:
+  - name: jdbc
+    description: Instruments JDBC drivers.
+"""
+
+
+@pytest.fixture(scope="module")
+def search_index():
+    return load_script("search-index")
+
+
+@pytest.fixture
+def project(tmp_path):
+    for version in ("2.24", "2.25"):
+        (tmp_path / f"instrumentation-list-{version}.yaml").write_text(SNAPSHOT)
+    (tmp_path / "data" / "library_readme").mkdir(parents=True)
+    (tmp_path / "data" / "library_readme" / "jdbc-0123456789ab.md").write_text("# JDBC\n\nConnection pooling.\n")
+    (tmp_path / "data" / "library_readme" / "jdbc-ba9876543210.md").write_text("# JDBC\n\nStatement sanitizer.\n")
+    return tmp_path
+
+
+def write_manifest(project_root, current, versions):
+    manifest = {
+        "current": {"jdbc": current},
+        "versions": {version: {"readmes": {"jdbc": filename}} for version, filename in versions.items()},
+    }
+    (project_root / "data" / "library_readme_manifest.json").write_text(json.dumps(manifest))
+
+
+def search(search_index, project_root, query, version=None):
+    output_dir = project_root / "search-index"
+    search_index.update_index(project_root, output_dir, project_root / "sources.json")
+    results = search_index.SearchIndex(output_dir).search(query, version=version)
+    return {result["library"]: result["readmes"] for result in results}
+
+
+def test_readme_matches_snapshot_version_of_its_release(search_index, project):
+    write_manifest(project, "jdbc-0123456789ab.md", {"2.25.0": "jdbc-0123456789ab.md"})
+
+    assert search(search_index, project, "pooling", version="2.25") == {"jdbc": ["jdbc-0123456789ab.md"]}
+    assert search(search_index, project, "pooling", version="v2.25.0") == {"jdbc": ["jdbc-0123456789ab.md"]}
+
+
+def test_newest_patch_release_wins(search_index, project):
+    write_manifest(project, "jdbc-ba9876543210.md",
+                   {"2.25.0": "jdbc-0123456789ab.md", "2.25.1": "jdbc-ba9876543210.md"})
+
+    assert search(search_index, project, "pooling", version="2.25") == {}
+    assert search(search_index, project, "sanitizer", version="2.25") == {"jdbc": ["jdbc-ba9876543210.md"]}
+
+
+def test_version_missing_from_manifest_uses_current(search_index, project):
+    write_manifest(project, "jdbc-ba9876543210.md", {"2.25.0": "jdbc-0123456789ab.md"})
+
+    assert search(search_index, project, "sanitizer", version="2.24") == {"jdbc": ["jdbc-ba9876543210.md"]}
+    assert search(search_index, project, "pooling", version="2.24") == {}
+
+
+def test_without_manifest_readmes_match_every_version(search_index, project):
+    assert search(search_index, project, "pooling", version="2.24") == {"jdbc": ["jdbc-0123456789ab.md"]}
+    assert search(search_index, project, "sanitizer", version="2.25") == {"jdbc": ["jdbc-ba9876543210.md"]}
@@ -0,0 +1,142 @@
+"""Tests for the stage cache and library change set of update-instrumentation-list.py."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_common import load_script  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def updater():
+    return load_script("update-instrumentation-list")
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "data-processing-v2" / "src").mkdir(parents=True)
+    (tmp_path / "data-processing-v2" / "src" / "index.ts").write_text("export {};\n")
+    (tmp_path / "data" / "library_readme").mkdir(parents=True)
+    (tmp_path / "data" / "library_readme" / "jdbc-0123456789ab.md").write_text("# JDBC\n")
+    (tmp_path / "data" / "library_readme" / "jdbc-ba9876543210.md").write_text("# JDBC, older\n")
+    write_manifest(tmp_path, "jdbc-0123456789ab.md")
+    (tmp_path / "frontend" / "public" / "data").mkdir(parents=True)
+    (tmp_path / "frontend" / "public" / "data" / "index.json").write_text("{}\n")
+    return tmp_path
+
+
+def write_manifest(project_root, filename):
+    manifest = {"current": {"jdbc": filename}, "versions": {"2.25": {"readmes": {"jdbc": filename}}}}
+    (project_root / "data" / "library_readme_manifest.json").write_text(json.dumps(manifest))
+
+
+def v2_stage_fresh(updater, project_root):
+    cache = updater.StageCache(project_root / "data" / "pipeline_stage_cache.json", project_root)
+    outputs = updater.list_files(project_root / "frontend" / "public" / "data")
+    return cache.is_fresh("data-processing-v2", updater.data_processing_v2_base_hash(project_root), outputs)
+
+
+def record_v2_stage(updater, project_root):
+    cache = updater.StageCache(project_root / "data" / "pipeline_stage_cache.json", project_root)
+    cache.record("data-processing-v2", updater.data_processing_v2_base_hash(project_root),
+                 updater.list_files(project_root / "frontend" / "public" / "data"))
+
+
+def test_v2_stage_is_fresh_when_nothing_changed(updater, project):
+    record_v2_stage(updater, project)
+    assert v2_stage_fresh(updater, project)
+
+
+def test_readme_manifest_change_alone_invalidates_v2_stage(updater, project):
+    record_v2_stage(updater, project)
+
+    # Point the library at a README that is already on disk: no .md file changes
+    write_manifest(project, "jdbc-ba9876543210.md")
+
+    assert not v2_stage_fresh(updater, project)
+
+
+def write_snapshot(path, libraries):
+    groups = "".join(
+        f"  {group}:\n" + "".join(f"  - name: {name}\n    description: {description}\n"
+                                 for name, description in entries)
+        for group, entries in libraries.items()
+    )
+    path.write_text(f"libraries:\n{groups}")
+
+
+def rewrite_snapshot(updater, changes, path, libraries):
+    """Rewrite a snapshot the way run_update does and fold it into the change set."""
+    old_hashes = updater.read_library_hashes(path)
+    write_snapshot(path, libraries)
+    changes.record(path.stem[len("instrumentation-list-"):], path, old_hashes, updater.read_library_hashes(path))
+
+
+def test_library_changes_list_only_the_changed_libraries(updater, tmp_path):
+    snapshot = tmp_path / "instrumentation-list-2.25.yaml"
+    write_snapshot(snapshot, {"jdbc": [("jdbc", "JDBC")],
+                              "kafka": [("kafka-clients", "Kafka"), ("kafka-streams", "Streams")]})
+    recorded = updater.snapshot_hashes(tmp_path)
+
+    changes = updater.LibraryChanges(tmp_path / "library_changes.json")
+    rewrite_snapshot(updater, changes, snapshot, {"jdbc": [("jdbc", "JDBC drivers")],
+                                                  "kafka": [("kafka-clients", "Kafka"), ("kafka-connect", "Connect")]})
+    changes.save()
+
+    saved = json.loads((tmp_path / "library_changes.json").read_text())["versions"]["2.25"]
+    assert saved["snapshot"] == "instrumentation-list-2.25.yaml"
+    assert saved["previous"] is True
+    assert (saved["added"], saved["changed"], saved["removed"]) == (["kafka-connect"], ["jdbc"], ["kafka-streams"])
+    assert changes.covers(updater.snapshot_hashes(tmp_path), recorded)
+
+
+def test_library_changes_accumulate_until_consumed(updater, tmp_path):
+    snapshot = tmp_path / "instrumentation-list-2.25.yaml"
+    write_snapshot(snapshot, {"jdbc": [("jdbc", "JDBC")], "kafka": [("kafka-clients", "Kafka")]})
+    recorded = updater.snapshot_hashes(tmp_path)
+    changes = updater.LibraryChanges(tmp_path / "library_changes.json")
+
+    # V2 failed after the first rewrite; the second run reloads the pending set
+    rewrite_snapshot(updater, changes, snapshot, {"jdbc": [("jdbc", "JDBC")], "grpc": [("grpc", "gRPC")]})
+    changes.save()
+    changes = updater.LibraryChanges(tmp_path / "library_changes.json")
+    rewrite_snapshot(updater, changes, snapshot, {"kafka": [("kafka-clients", "Kafka 2")]})
+
+    pending = changes.versions["2.25"]
+    # grpc came and went, kafka-clients was removed and then re-added with new content
+    assert (pending["added"], pending["changed"], pending["removed"]) == ([], ["kafka-clients"], ["jdbc"])
+    assert changes.covers(updater.snapshot_hashes(tmp_path), recorded)
+
+    changes.clear()
+    assert not (tmp_path / "library_changes.json").exists()
+
+
+def test_library_changes_do_not_cover_unrecorded_rewrites(updater, tmp_path):
+    snapshot = tmp_path / "instrumentation-list-2.25.yaml"
+    write_snapshot(snapshot, {"jdbc": [("jdbc", "JDBC")]})
+    write_snapshot(tmp_path / "instrumentation-list-2.24.yaml", {"jdbc": [("jdbc", "JDBC")]})
+    recorded = updater.snapshot_hashes(tmp_path)
+    changes = updater.LibraryChanges(tmp_path / "library_changes.json")
+    rewrite_snapshot(updater, changes, snapshot, {"jdbc": [("jdbc", "JDBC drivers")]})
+
+    # 2.24 changed behind the change set's back: V2 has to regenerate everything
+    write_snapshot(tmp_path / "instrumentation-list-2.24.yaml", {"jdbc": [("jdbc", "Old JDBC")]})
+    assert not changes.covers(updater.snapshot_hashes(tmp_path), recorded)
+
+    # A snapshot V2 published was deleted
+    (tmp_path / "instrumentation-list-2.24.yaml").unlink()
+    assert not changes.covers(updater.snapshot_hashes(tmp_path), recorded)
+
+
+def test_library_changes_for_a_new_snapshot_add_every_library(updater, tmp_path):
+    snapshot = tmp_path / "instrumentation-list-2.26.yaml"
+    changes = updater.LibraryChanges(tmp_path / "library_changes.json")
+    rewrite_snapshot(updater, changes, snapshot, {"jdbc": [("jdbc", "JDBC")], "kafka": [("kafka-clients", "Kafka")]})
+
+    pending = changes.versions["2.26"]
+    assert pending["previous"] is False
+    assert pending["added"] == ["jdbc", "kafka-clients"]
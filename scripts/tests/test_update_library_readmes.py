@@ -0,0 +1,127 @@
+"""Tests for tree discovery, the README store and garbage collection of update-library-readmes.py."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline_common import load_script  # noqa: E402
+from pipeline_github import GitHubClient  # noqa: E402
+
+# More subdirectories of instrumentation/ than SUBTREE_BATCH_THRESHOLD, so it is listed recursively
+MANY_LIBRARIES = tuple(f"library-{i:02d}" for i in range(12))
+
+
+@pytest.fixture
+def readmes(tmp_path):
+    module = load_script("update-library-readmes")
+    module.get_readme_dir = lambda: tmp_path / "data" / "library_readme"
+    module.update_search_index = lambda: None
+    return module
+
+
+@pytest.fixture
+def project(tmp_path):
+    for version in ("2.24", "2.25", "3.0"):
+        (tmp_path / f"instrumentation-list-{version}.yaml").write_text("libraries: {}\n")
+    readme_dir = tmp_path / "data" / "library_readme"
+    readme_dir.mkdir(parents=True)
+    for filename in ("jdbc-0123456789ab.md", "jdbc-ba9876543210.md", "kafka-000000000000.md"):
+        (readme_dir / filename).write_text(f"# {filename}\n")
+    return tmp_path
+
+
+def write_manifest(project_root, versions):
+    manifest = {
+        "current": versions[max(versions)],
+        "versions": {version: {"readmes": readmes} for version, readmes in versions.items()},
+    }
+    (project_root / "data" / "library_readme_manifest.json").write_text(json.dumps(manifest))
+
+
+def readme_files(project_root):
+    return sorted(path.name for path in (project_root / "data" / "library_readme").iterdir())
+
+
+def test_gc_refuses_partial_manifest(readmes, project):
+    # First run after the manifest landed: only the latest release is recorded,
+    # but 2.24 still uses jdbc-ba9876543210.md and kafka-000000000000.md
+    write_manifest(project, {"2.25.0": {"jdbc": "jdbc-0123456789ab.md"}})
+
+    assert readmes.uncovered_snapshot_versions(readmes.load_readme_manifest()) == ["2.24"]
+    assert not readmes.collect_readme_garbage()
+    assert readme_files(project) == ["jdbc-0123456789ab.md", "jdbc-ba9876543210.md", "kafka-000000000000.md"]
+
+
+def test_gc_removes_unreferenced_once_every_snapshot_is_covered(readmes, project):
+    # 3.0 is newer than any release and resolves through "current"
+    write_manifest(project, {
+        "2.24.0": {"jdbc": "jdbc-ba9876543210.md"},
+        "2.25.1": {"jdbc": "jdbc-0123456789ab.md"},
+    })
+
+    assert readmes.uncovered_snapshot_versions(readmes.load_readme_manifest()) == []
+    assert readmes.collect_readme_garbage()
+    assert readme_files(project) == ["jdbc-0123456789ab.md", "jdbc-ba9876543210.md"]
+
+
+@pytest.mark.parametrize("tree_mode", ["recursive", "subtree"])
+def test_truncated_tree_falls_back_to_listing_each_directory(readmes, stand_in, tree_mode):
+    server = stand_in(libraries=MANY_LIBRARIES, tree_limit=10)
+    client = GitHubClient(base_url=server.url)
+
+    libraries = readmes.discover_library_readmes(client, server.state.fixture.commit_sha, tree_mode)
+
+    assert sorted(name for name, _, _ in libraries) == list(MANY_LIBRARIES)
+    fixture = server.state.fixture
+    assert all(blob_sha == fixture.blob_shas[path] for _, path, blob_sha in libraries)
+    # instrumentation/ listed directly and (truncated) recursively, then one listing per library
+    assert client.tree_cache.listed == 2 + len(MANY_LIBRARIES)
+
+
+def test_unchanged_blob_sha_skips_the_download(readmes, stand_in, tmp_path):
+    server = stand_in()
+    fixture = server.state.fixture
+    assert readmes.process_single_version(GitHubClient(base_url=server.url), fixture.tag)
+    first = readme_files(tmp_path)
+    assert server.state.stats()["endpoints"]["contents"] == 3
+
+    server.state.reset_stats()
+    assert readmes.process_single_version(GitHubClient(base_url=server.url), fixture.tag)
+
+    assert "contents" not in server.state.stats()["endpoints"]
+    assert readme_files(tmp_path) == first
+    index = readmes.load_readme_index()
+    assert {library: entry["filename"] for library, entry in index.items()} == \
+        readmes.load_readme_manifest()["versions"]["2.25.0"]["readmes"]
+
+
+def test_journal_resumes_after_a_torn_last_line(readmes, stand_in, tmp_path):
+    server = stand_in()
+    fixture = server.state.fixture
+    journal_dir = tmp_path / "journal"
+    assert readmes.process_single_version(GitHubClient(base_url=server.url), fixture.tag, use_index=False,
+                                          journal=readmes.CheckpointJournal(journal_dir))
+
+    # Killed while appending the second entry
+    journal_path = journal_dir / f"{fixture.commit_sha}.jsonl"
+    first, second, _ = journal_path.read_bytes().splitlines(keepends=True)
+    journal_path.write_bytes(first + second[:len(second) // 2])
+
+    server.state.reset_stats()
+    journal = readmes.CheckpointJournal(journal_dir)
+    assert readmes.process_single_version(GitHubClient(base_url=server.url), fixture.tag, use_index=False,
+                                          journal=journal)
+    assert journal.resumed == 1
+    assert server.state.stats()["endpoints"]["contents"] == 2
+
+    # The entries appended after the fragment are intact
+    server.state.reset_stats()
+    journal = readmes.CheckpointJournal(journal_dir)
+    assert readmes.process_single_version(GitHubClient(base_url=server.url), fixture.tag, use_index=False,
+                                          journal=journal)
+    assert journal.resumed == 3
+    assert "contents" not in server.state.stats()["endpoints"]
@@ -4,6 +4,9 @@
 # 1. Expects YAML files to already be downloaded (by update-instrumentation-list.py)
 # 2. Generates V2 content-addressed data
 # 3. Copies it to frontend/public/data/
+#
+# With V2_CHANGES=<library change set> the existing frontend/public/data/ is
+# updated in place instead, rebuilding only the listed libraries.
 
 set -e  # Exit on error
 
@@ -31,8 +34,10 @@ if [ ! -d "node_modules" ]; then
   echo
 fi
 
-# Build if needed
-if [ ! -d "dist" ]; then
+# Build if missing or older than the sources: a stale dist would run old code
+# with the current flags (--changes, --output-dir)
+if [ ! -f "dist/src/index.js" ] || \
+   [ -n "$(find src package.json tsconfig.json -newer dist/src/index.js -print -quit)" ]; then
   echo "🔨 Building TypeScript..."
   npm run build
   echo
@@ -51,6 +56,12 @@ else
   INCLUDE_FLAG=""
 fi
 
+FRONTEND_DATA_DIR="$PROJECT_ROOT/frontend/public/data"
+if [ -n "$V2_CHANGES" ]; then
+  echo "🔁 Incremental update of $FRONTEND_DATA_DIR from $V2_CHANGES"
+  INCLUDE_FLAG="$INCLUDE_FLAG --changes $V2_CHANGES --output-dir $FRONTEND_DATA_DIR"
+fi
+
 case "$MODE" in
   latest)
     echo "📊 Processing: Latest version only"
@@ -70,9 +81,11 @@ case "$MODE" in
     ;;
 esac
 
-echo
-echo "📋 Copying data to frontend..."
-npm run copy-to-frontend
+if [ -z "$V2_CHANGES" ]; then
+  echo
+  echo "📋 Copying data to frontend..."
+  npm run copy-to-frontend
+fi
 
 echo
 echo "✅ V2 data processing complete!"
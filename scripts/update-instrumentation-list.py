@@ -4,6 +4,8 @@ Script to download the latest instrumentation list from OpenTelemetry Java Instr
 This script fetches the latest version from GitHub and saves it with the appropriate version number.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
@@ -11,217 +13,1060 @@ import requests
 import sys
 import yaml
 from pathlib import Path
+# Output always uses the pure-Python dumper: libyaml folds long quoted scalars
+# differently, which would rewrite the committed files.
+from yaml import SafeDumper as YamlDumper
 
+from pipeline_common import YamlLoader
+from pipeline_github import GitHubClient, TagIndex
+from pipeline_trace import SPAN_KIND_CLIENT, trace_to_file, tracer
+from pipeline_watch import ConditionalPoller, watch
 
-def get_latest_instrumentation_data():
-    """Download the latest instrumentation list from GitHub."""
-    url = "https://raw.githubusercontent.com/open-telemetry/opentelemetry-java-instrumentation/main/docs/instrumentation-list.yaml"
-    
+# Base URLs can be pointed at a stand-in server (see github-stand-in.py)
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip('/')
+GITHUB_RAW_URL = os.environ.get("GITHUB_RAW_URL", "https://raw.githubusercontent.com").rstrip('/')
+
+# Tag index shared with update-library-readmes.py (tag -> commit SHA, latest release)
+TAG_INDEX_PATH = Path(__file__).parent.parent / ".cache" / "github-tags.json"
+
+
+def instrumentation_list_url():
+    """URL of the upstream instrumentation list."""
+    return f"{GITHUB_RAW_URL}/open-telemetry/opentelemetry-java-instrumentation/main/docs/instrumentation-list.yaml"
+
+
+def latest_release_url():
+    """API URL of the upstream latest release."""
+    return f"{GITHUB_API_URL}/repos/open-telemetry/opentelemetry-java-instrumentation/releases/latest"
+
+
+def auth_headers():
+    """Authorization header for GitHub when GITHUB_TOKEN is set."""
     headers = {}
     github_token = os.environ.get("GITHUB_TOKEN")
     if github_token:
         headers["Authorization"] = f"token {github_token}"
+    return headers
+
+
+def get_latest_instrumentation_data(session=None):
+    """Download the latest instrumentation list from GitHub (through session, if given)."""
+    url = instrumentation_list_url()
+    headers = auth_headers()
     
-    try:
-        print("Downloading latest instrumentation list from GitHub...")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading instrumentation list: {e}")
-        sys.exit(1)
+    with tracer.span("download instrumentation-list", SPAN_KIND_CLIENT, **{"url.full": url}) as span:
+        try:
+            print("Downloading latest instrumentation list from GitHub...")
+            response = (session or requests).get(url, headers=headers)
+            span.set_attribute("http.response.status_code", response.status_code)
+            response.raise_for_status()
+            span.set_attribute("http.response.body.size", len(response.content))
+            return response.text
+        except requests.exceptions.RequestException as e:
+            print(f"Error downloading instrumentation list: {e}")
+            sys.exit(1)
+
+
+def version_from_tag(tag_name):
+    """Extract the version number from a release tag (e.g., "v2.10.0" -> "2.10"), or None."""
+    version_match = re.match(r"v?(\d+\.\d+)", tag_name)
+    if version_match:
+        return version_match.group(1)
+    print(f"Could not parse version from tag: {tag_name}")
+    return None
 
 
 def get_latest_release_version():
-    """Get the latest release version from GitHub API."""
-    url = "https://api.github.com/repos/open-telemetry/opentelemetry-java-instrumentation/releases/latest"
-    
-    headers = {}
-    github_token = os.environ.get("GITHUB_TOKEN")
-    if github_token:
-        headers["Authorization"] = f"token {github_token}"
-    
-    try:
+    """
+    Get the latest release version through the tag index shared with
+    update-library-readmes.py: answered from the index while it is fresh, and
+    otherwise by a conditional request that is a 304 while the release is unchanged.
+    """
+    github_client = GitHubClient(pool_size=1, base_url=GITHUB_API_URL, tag_index=TagIndex(TAG_INDEX_PATH))
+    with tracer.span("fetch latest release") as span:
         print("Fetching latest release version...")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        tag_name = data["tag_name"]
-        
-        # Extract version number from tag (e.g., "v2.10.0" -> "2.10")
-        version_match = re.match(r"v?(\d+\.\d+)", tag_name)
-        if version_match:
-            return version_match.group(1)
-        else:
-            print(f"Could not parse version from tag: {tag_name}")
+        tag_name = github_client.get_latest_release_tag("open-telemetry/opentelemetry-java-instrumentation")
+        if not tag_name:
+            span.set_error("latest release not found")
             return None
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching release info: {e}")
-        return None
+        span.set_attribute("refresh.tag", tag_name)
+        print(f"Latest release: {tag_name}")
+        return version_from_tag(tag_name)
 
 
-def save_instrumentation_file(content, version):
-    """Save the instrumentation content to a versioned file."""
+def save_instrumentation_file(content, version, directory=None):
+    """
+    Save the instrumentation content to a versioned file, in the project root
+    unless another directory is given.
+    """
     # Get the script directory and go up one level to the project root
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     
     filename = f"instrumentation-list-{version}.yaml"
-    filepath = project_root / filename
+    filepath = Path(directory or project_root) / filename
     
+    with tracer.span("save instrumentation-list", **{"file.path": str(filepath), "file.size": len(content)}):
+        try:
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            with open(filepath, 'w') as f:
+                f.write(content)
+            print(f"Saved instrumentation list to {filepath}")
+            return str(filepath)
+        except IOError as e:
+            print(f"Error saving file: {e}")
+            sys.exit(1)
+
+
+def parse_instrumentation_yaml(content):
+    """
+    Parse the instrumentation list once; the resulting document is shared by
+    validation and every transformation. Raises yaml.YAMLError if invalid.
+    """
+    with tracer.span("yaml parse", **{"refresh.bytes": len(content), "refresh.yaml.loader": YamlLoader.__name__}):
+        return yaml.load(content, Loader=YamlLoader)
+
+
+def validate_instrumentation_yaml(content):
+    """
+    Check the list is well-formed YAML without building the document (used with
+    --stream). Raises yaml.YAMLError if invalid.
+    """
+    with tracer.span("yaml validate", **{"refresh.bytes": len(content), "refresh.yaml.loader": YamlLoader.__name__}):
+        for _ in yaml.parse(content, Loader=YamlLoader):
+            pass
+
+
+def dump_instrumentation_yaml(data):
+    """Serialize an instrumentation list document back to YAML."""
+    with tracer.span("yaml dump", **{"refresh.yaml.dumper": YamlDumper.__name__}) as span:
+        content = yaml.dump(data, Dumper=YamlDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        span.set_attribute("refresh.bytes", len(content))
+        return content
+
+
+SEMCONV_OPT_IN_PREFIX = 'otel.semconv-stability.opt-in='
+
+
+class SyntheticVariant:
+    """
+    A rule describing one hypothetical future version: telemetry blocks behind the
+    semconv opt-in values it enables become the default telemetry.
+
+    opt_in_values is the set of enabled values, or None to enable every value
+    (the 3.0 variant). A block guarded by several values (e.g. database,service.peer)
+    is promoted only when all of them are enabled.
+    """
+
+    def __init__(self, name, opt_in_values=None):
+        self.name = name
+        self.opt_in_values = frozenset(opt_in_values) if opt_in_values is not None else None
+
+    def promotes(self, values):
+        """Return True if a block guarded by the given opt-in values becomes default."""
+        return self.opt_in_values is None or values <= self.opt_in_values
+
+
+VERSION_3_0 = SyntheticVariant("3.0")
+
+
+def parse_opt_in_values(when_condition):
+    """Return the opt-in values of a semconv opt-in condition, or None for other conditions."""
+    if not when_condition.startswith(SEMCONV_OPT_IN_PREFIX):
+        return None
+    values = when_condition[len(SEMCONV_OPT_IN_PREFIX):].split(',')
+    return frozenset(value.strip() for value in values if value.strip())
+
+
+def discover_opt_in_values(data):
+    """Return every semconv opt-in value used in the instrumentation list, sorted."""
+    found = set()
+    for library_versions in (data or {}).get('libraries', {}).values():
+        for library_version in library_versions:
+            for block in library_version.get('telemetry') or []:
+                found.update(parse_opt_in_values(block.get('when', '')) or ())
+    return sorted(found)
+
+
+def parse_variant_rules(spec, data):
+    """
+    Build variant rules from a --variants value: a comma-separated list of opt-in
+    values, '+' joining values enabled together (e.g. database,rpc,database+service.peer),
+    or 'all' for one variant per opt-in value found in the list.
+    """
+    if spec.strip() == 'all':
+        groups = [[value] for value in discover_opt_in_values(data)]
+    else:
+        groups = [[value.strip() for value in item.split('+') if value.strip()]
+                  for item in spec.split(',') if item.strip()]
+    return [SyntheticVariant(f"3.0-{'+'.join(values)}", values) for values in groups]
+
+
+def classify_telemetry(telemetry_blocks):
+    """
+    Split a library entry's telemetry once for all variants: returns
+    (default_block, [(block, opt_in_values or None)]) where the list holds every
+    non-default block in order.
+    """
+    default_block = None
+    blocks = []
+    for block in telemetry_blocks:
+        when_condition = block.get('when', '')
+        if when_condition == 'default':
+            default_block = block
+        else:
+            blocks.append((block, parse_opt_in_values(when_condition)))
+    return default_block, blocks
+
+
+def promote_telemetry(library_version, classified, variant):
+    """
+    Apply one variant to a classified library entry: the default telemetry block is
+    replaced by the promoted opt-in blocks' content and those blocks dropped.
+
+    Returns (entry, processed, promoted_sections). Copy-on-write: when the
+    telemetry comes out unchanged the original entry is returned, otherwise a
+    shallow copy; the input is never modified.
+    """
+    if classified is None:
+        return library_version, 0, 0
+
+    default_block, blocks = classified
+    new_telemetry_blocks = []
+    promoted_blocks = []
+    other_blocks = []
+    for block, values in blocks:
+        if values is not None and variant.promotes(values):
+            promoted_blocks.append(block)
+        else:
+            other_blocks.append(block)
+
+    processed = 0
+    if default_block and promoted_blocks:
+        # Replace default content with the promoted blocks' content (not merged)
+        new_default_block = {'when': 'default'}
+        for opt_in_block in promoted_blocks:
+            if 'metrics' in opt_in_block:
+                new_default_block['metrics'] = opt_in_block['metrics']
+            if 'spans' in opt_in_block:
+                new_default_block['spans'] = opt_in_block['spans']
+        new_telemetry_blocks.append(new_default_block)
+        processed = 1
+    elif default_block:
+        new_telemetry_blocks.append(default_block)
+    new_telemetry_blocks.extend(other_blocks)
+
+    telemetry_blocks = library_version['telemetry']
+    if (len(new_telemetry_blocks) == len(telemetry_blocks)
+            and all(new is old for new, old in zip(new_telemetry_blocks, telemetry_blocks))):
+        return library_version, processed, len(promoted_blocks)
+
+    new_library_version = dict(library_version)
+    new_library_version['telemetry'] = new_telemetry_blocks
+    return new_library_version, processed, len(promoted_blocks)
+
+
+def transform_library_version_3_0(library_version):
+    """
+    Apply the 3.0 transform to one library entry: the default telemetry block is
+    replaced by the semconv opt-in blocks' content and the opt-in blocks dropped.
+
+    Returns (new_entry, processed, opt_in_sections_found); the input is not modified.
+    """
+    if 'telemetry' not in library_version:
+        return library_version, 0, 0
+    classified = classify_telemetry(library_version['telemetry'])
+    return promote_telemetry(library_version, classified, VERSION_3_0)
+
+
+def generate_variants(data, variants):
+    """
+    Generate several synthetic versions in a single walk over the parsed list.
+
+    Each library entry's telemetry is classified once and every variant applied
+    to it. Untouched entries, and whole library groups with no touched entry, are
+    shared with the input rather than copied, so N variants cost little more
+    memory than one. Returns {variant name: document}, or None if the document
+    does not have the expected structure.
+    """
     try:
-        with open(filepath, 'w') as f:
-            f.write(content)
-        print(f"Saved instrumentation list to {filepath}")
-        return str(filepath)
-    except IOError as e:
-        print(f"Error saving file: {e}")
-        sys.exit(1)
+        if not data or 'libraries' not in data:
+            print("Warning: Invalid YAML structure for variant generation")
+            return None
+
+        stats = {variant.name: [0, 0] for variant in variants}
+        new_libraries = {variant.name: {} for variant in variants}
+
+        for library_name, library_versions in data['libraries'].items():
+            new_versions = {variant.name: [] for variant in variants}
+            changed = set()
+
+            for library_version in library_versions:
+                classified = None
+                if 'telemetry' in library_version:
+                    classified = classify_telemetry(library_version['telemetry'])
+                for variant in variants:
+                    new_library_version, processed, promoted = promote_telemetry(
+                        library_version, classified, variant)
+                    new_versions[variant.name].append(new_library_version)
+                    if new_library_version is not library_version:
+                        changed.add(variant.name)
+                    stats[variant.name][0] += processed
+                    stats[variant.name][1] += promoted
+
+            for variant in variants:
+                if variant.name in changed:
+                    new_libraries[variant.name][library_name] = new_versions[variant.name]
+                else:
+                    new_libraries[variant.name][library_name] = library_versions
+
+        results = {}
+        for variant in variants:
+            processed_count, opt_in_sections_found = stats[variant.name]
+            print(f"Generated {variant.name} version: processed {processed_count} libraries, "
+                  f"found {opt_in_sections_found} opt-in sections")
+            new_data = dict(data)
+            new_data['libraries'] = new_libraries[variant.name]
+            results[variant.name] = new_data
+        return results
+
+    except Exception as e:
+        print(f"Unexpected error during variant generation: {e}")
+        return None
 
 
-def generate_3_0_version(latest_content):
+def generate_3_0_version(data):
     """
     Generate a hypothetical 3.0 version where semconv opt-in features become defaults.
     
     This function processes the instrumentation data to simulate the upcoming 3.0 release
     where features previously behind feature flags will become the default behavior.
+
+    Takes the parsed instrumentation list and returns a new document; the input is
+    not modified, so it can be shared with other stages. Returns None if the
+    document does not have the expected structure.
+    """
+    results = generate_variants(data, [VERSION_3_0])
+    return results[VERSION_3_0.name] if results else None
+
+
+class EventComposer(yaml.composer.Composer, yaml.resolver.Resolver):
+    """Composes one node at a time from a loader's event stream."""
+
+    def __init__(self, loader):
+        yaml.composer.Composer.__init__(self)
+        yaml.resolver.Resolver.__init__(self)
+        self.loader = loader
+
+    def check_event(self, *choices):
+        return self.loader.check_event(*choices)
+
+    def peek_event(self):
+        return self.loader.peek_event()
+
+    def get_event(self):
+        return self.loader.get_event()
+
+    def load_fragment(self):
+        """Compose and construct the value starting at the next event."""
+        node = self.compose_node(None, None)
+        self.anchors = {}
+        return self.loader.construct_document(node)
+
+
+class EventSerializer(yaml.serializer.Serializer):
+    """Represents values one at a time and feeds their events to a dumper's emitter."""
+
+    def __init__(self, dumper):
+        self.dumper = dumper
+        self.anchors = {}
+        self.serialized_nodes = {}
+        self.last_anchor_id = 0
+
+    def emit(self, event):
+        self.dumper.emit(event)
+
+    def resolve(self, kind, value, implicit):
+        return self.dumper.resolve(kind, value, implicit)
+
+    def descend_resolver(self, current_node, current_index):
+        self.dumper.descend_resolver(current_node, current_index)
+
+    def ascend_resolver(self):
+        self.dumper.ascend_resolver()
+
+    def dump_fragment(self, value):
+        """Emit the events yaml.dump would produce for value at this position."""
+        self.dumper.represented_objects = {}
+        self.dumper.object_keeper = []
+        self.dumper.alias_key = None
+        node = self.dumper.represent_data(value)
+        self.anchor_node(node)
+        self.serialize_node(node, None, None)
+        self.anchors = {}
+        self.serialized_nodes = {}
+
+
+def stream_3_0_version(source, target_path):
     """
+    Streaming variant of generate_3_0_version + dump_instrumentation_yaml.
+
+    Reads the instrumentation list from the text stream `source` one library entry
+    at a time and writes the transformed YAML incrementally to target_path, so
+    memory stays flat as the list grows. The output is byte-identical to dumping
+    generate_3_0_version's result (anchors cannot span library entries, which the
+    upstream list does not use).
+
+    Returns True on success, or False (leaving target_path untouched) if the
+    document does not have the expected structure.
+    """
+    E = yaml.events
+    loader = YamlLoader(source)
+    target_path = Path(target_path)
+    tmp_path = target_path.with_name(target_path.name + ".tmp")
+    processed_count = 0
+    opt_in_sections_found = 0
+    saw_libraries = False
+
     try:
-        # Parse the YAML content
-        data = yaml.safe_load(latest_content)
-        
-        if not data or 'libraries' not in data:
-            print("Warning: Invalid YAML structure for 3.0 generation")
-            return latest_content
-        
-        processed_count = 0
-        opt_in_sections_found = 0
-        
-        # Process each library
-        for library_name, library_versions in data['libraries'].items():
-            for library_version in library_versions:
-                if 'telemetry' not in library_version:
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            dumper = YamlDumper(out, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            composer = EventComposer(loader)
+            serializer = EventSerializer(dumper)
+
+            loader.get_event()
+            if not loader.check_event(E.DocumentStartEvent):
+                print("Warning: Invalid YAML structure for 3.0 generation")
+                return False
+            loader.get_event()
+            if not loader.check_event(E.MappingStartEvent):
+                print("Warning: Invalid YAML structure for 3.0 generation")
+                return False
+            loader.get_event()
+
+            dumper.open()
+            dumper.emit(E.DocumentStartEvent(explicit=False))
+            dumper.emit(E.MappingStartEvent(None, yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, True, flow_style=False))
+
+            while not loader.check_event(E.MappingEndEvent):
+                key = composer.load_fragment()
+                serializer.dump_fragment(key)
+                if key != 'libraries':
+                    serializer.dump_fragment(composer.load_fragment())
                     continue
-                
-                telemetry_blocks = library_version['telemetry']
-                new_telemetry_blocks = []
-                
-                # Find default and opt-in sections
-                default_block = None
-                opt_in_blocks = []
-                other_blocks = []
-                
-                for block in telemetry_blocks:
-                    when_condition = block.get('when', '')
-                    
-                    if when_condition == 'default':
-                        default_block = block
-                    elif when_condition.startswith('otel.semconv-stability.opt-in='):
-                        opt_in_blocks.append(block)
-                        opt_in_sections_found += 1
-                    else:
-                        other_blocks.append(block)
-                
-                # If we have both default and opt-in blocks, replace default with opt-in content
-                if default_block and opt_in_blocks:
-                    # Create new default block by replacing with opt-in content
-                    new_default_block = {'when': 'default'}
-                    
-                    # Replace default content with content from all opt-in blocks
-                    for opt_in_block in opt_in_blocks:
-                        # Replace metrics (not merge)
-                        if 'metrics' in opt_in_block:
-                            new_default_block['metrics'] = opt_in_block['metrics']
-                        
-                        # Replace spans (not merge)
-                        if 'spans' in opt_in_block:
-                            new_default_block['spans'] = opt_in_block['spans']
-                    
-                    new_telemetry_blocks.append(new_default_block)
-                    processed_count += 1
-                    
-                elif default_block:
-                    # Keep default block as-is if no opt-in blocks
-                    new_telemetry_blocks.append(default_block)
-                
-                # Add other non-default, non-opt-in blocks
-                new_telemetry_blocks.extend(other_blocks)
-                
-                # Update the library's telemetry
-                library_version['telemetry'] = new_telemetry_blocks
-        
-        print(f"Generated 3.0 version: processed {processed_count} libraries, found {opt_in_sections_found} opt-in sections")
-        
-        # Convert back to YAML
-        return yaml.dump(data, default_flow_style=False, sort_keys=False, allow_unicode=True)
-        
-    except yaml.YAMLError as e:
-        print(f"Error processing YAML for 3.0 generation: {e}")
-        return latest_content
-    except Exception as e:
-        print(f"Unexpected error during 3.0 generation: {e}")
-        return latest_content
 
+                if not loader.check_event(E.MappingStartEvent):
+                    print("Warning: Invalid YAML structure for 3.0 generation")
+                    return False
+                saw_libraries = True
+                loader.get_event()
+                dumper.emit(E.MappingStartEvent(None, yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, True, flow_style=False))
+
+                # One library group, and one library entry, in memory at a time
+                while not loader.check_event(E.MappingEndEvent):
+                    serializer.dump_fragment(composer.load_fragment())
+                    if not loader.check_event(E.SequenceStartEvent):
+                        print("Warning: Invalid YAML structure for 3.0 generation")
+                        return False
+                    loader.get_event()
+                    dumper.emit(E.SequenceStartEvent(None, yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, True, flow_style=False))
+                    while not loader.check_event(E.SequenceEndEvent):
+                        library_version, processed, opt_in_found = transform_library_version_3_0(composer.load_fragment())
+                        processed_count += processed
+                        opt_in_sections_found += opt_in_found
+                        serializer.dump_fragment(library_version)
+                    loader.get_event()
+                    dumper.emit(E.SequenceEndEvent())
+
+                loader.get_event()
+                dumper.emit(E.MappingEndEvent())
+
+            loader.get_event()
+            dumper.emit(E.MappingEndEvent())
+            loader.get_event()
+            dumper.emit(E.DocumentEndEvent(explicit=False))
+            if not saw_libraries or not loader.check_event(E.StreamEndEvent):
+                print("Warning: Invalid YAML structure for 3.0 generation")
+                return False
+            dumper.close()
+
+        os.replace(tmp_path, target_path)
+    finally:
+        loader.dispose()
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    print(f"Generated 3.0 version: processed {processed_count} libraries, found {opt_in_sections_found} opt-in sections")
+    print(f"Saved instrumentation list to {target_path}")
+    return True
+
+
+def hash_text(text):
+    """Compute the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def hash_files(paths, root):
+    """
+    Compute one SHA-256 over a set of files (relative path + content).
+    Missing files hash as absent, so deleting an output invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(str(path.relative_to(root)).encode('utf-8'))
+        digest.update(b"\0")
+        if path.is_file():
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        else:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def list_files(directory, pattern="*"):
+    """List files under a directory recursively, or an empty list if it does not exist."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return [p for p in directory.rglob(pattern) if p.is_file()]
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stages.
+
+    Each stage records a hash of its inputs and a hash of the files it produced.
+    A stage is skipped when its inputs hash matches the recorded one and its
+    outputs still hash to what was recorded. The cache lives in data/ so it is
+    committed together with the generated data.
+    """
+
+    def __init__(self, cache_path, project_root, force=False):
+        self.cache_path = Path(cache_path)
+        self.project_root = Path(project_root)
+        self.force = force
+        self.entries = {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (IOError, ValueError) as e:
+            print(f"Warning: ignoring unreadable stage cache {self.cache_path}: {e}")
+
+    def is_fresh(self, stage, inputs_hash, outputs):
+        """Return True if the stage can be skipped."""
+        with tracer.span("stage cache lookup", **{"refresh.stage": stage}) as span:
+            fresh = False
+            entry = self.entries.get(stage)
+            if not self.force and entry and entry.get('inputs') == inputs_hash:
+                fresh = entry.get('outputs') == hash_files(outputs, self.project_root)
+            span.set_attribute("refresh.cache_hit", fresh)
+            return fresh
+
+    def outputs_match(self, stage, outputs):
+        """Return True if the files the stage last produced are still on disk unchanged."""
+        entry = self.entries.get(stage)
+        return bool(entry) and entry.get('outputs') == hash_files(outputs, self.project_root)
+
+    def record(self, stage, inputs_hash, outputs, **details):
+        """Record a completed stage (with any extra details) and persist the cache atomically."""
+        self.entries[stage] = {
+            **details,
+            'inputs': inputs_hash,
+            'outputs': hash_files(outputs, self.project_root),
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.cache_path)
+
+
+def transform_fingerprint():
+    """
+    Hash of the code and YAML backend that produce the 3.0 and variant files. The
+    whole script is hashed, so it does not matter how the module was loaded.
+    """
+    return hash_text(hashlib.sha256(Path(__file__).read_bytes()).hexdigest() + YamlDumper.__name__)
+
+
+def data_processing_v2_inputs(project_root):
+    """
+    Files the V2 generator reads besides the YAML snapshots: the README manifest
+    (which README applies to each library), the READMEs and its own sources.
+    """
+    v2_dir = project_root / "data-processing-v2"
+    return (
+        [project_root / "data" / "library_readme_manifest.json"]
+        + list_files(project_root / "data" / "library_readme", "*.md")
+        + list_files(v2_dir / "src")
+        + list_files(v2_dir / "scripts")
+        + [v2_dir / "package-lock.json", project_root / "scripts" / "update-instrumentation-list-v2.sh"]
+    )
+
+
+def data_processing_v2_base_hash(project_root):
+    """Hash of every V2 input except the YAML snapshots, including the V2_* settings of the wrapper script."""
+    settings = json.dumps({name: os.environ.get(name) for name in ("V2_MODE", "V2_COUNT", "V2_INCLUDE_3_0")}, sort_keys=True)
+    return hash_text(hash_files(data_processing_v2_inputs(project_root), project_root) + settings)
+
+
+def snapshot_hashes(project_root):
+    """Return {filename: sha256} for the instrumentation-list snapshots V2 publishes."""
+    return {
+        path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(project_root.glob("instrumentation-list-*.yaml"))
+    }
+
+
+def library_entry_hashes(data):
+    """
+    Return {library name: sha256} for each entry under `libraries:`. The group is
+    part of the hash, so moving a library between groups counts as a change.
+    """
+    hashes = {}
+    if not isinstance(data, dict) or not isinstance(data.get('libraries'), dict):
+        return hashes
+    for group, entries in data['libraries'].items():
+        for entry in entries or []:
+            if isinstance(entry, dict) and 'name' in entry:
+                hashes[str(entry['name'])] = hash_text(json.dumps([group, entry], sort_keys=True, default=str))
+    return hashes
+
+
+# Snapshot path -> (file SHA-256, library entry hashes); keeps watch mode from re-parsing unchanged snapshots
+_library_hashes_memo = {}
+
+
+def read_library_hashes(path):
+    """Library entry hashes of a snapshot on disk, or None if there is no snapshot."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    content = path.read_bytes()
+    file_hash = hashlib.sha256(content).hexdigest()
+    memo = _library_hashes_memo.get(str(path))
+    if memo and memo[0] == file_hash:
+        return memo[1]
+    with tracer.span("library hashes", **{"file.path": str(path)}):
+        hashes = library_entry_hashes(yaml.load(content, Loader=YamlLoader))
+    _library_hashes_memo[str(path)] = (file_hash, hashes)
+    return hashes
+
+
+def diff_library_hashes(old, new):
+    """Return the added, changed and removed library names between two sets of entry hashes."""
+    return {
+        'added': sorted(set(new) - set(old)),
+        'changed': sorted(name for name in set(new) & set(old) if new[name] != old[name]),
+        'removed': sorted(set(old) - set(new)),
+    }
+
+
+class LibraryChanges:
+    """
+    Per-library change set of the snapshots since the V2 data was last generated,
+    persisted as JSON for the V2 generator (--changes):
+
+        {"versions": {"2.25": {"snapshot": "instrumentation-list-2.25.yaml",
+                               "sha256": <snapshot hash after the change>,
+                               "previous": <whether V2 saw an earlier snapshot>,
+                               "added": [...], "changed": [...], "removed": [...]}}}
+
+    Changes accumulate across runs until V2 consumes them, so a failed V2 run
+    does not lose what the next one has to rebuild.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.versions = {}
+        try:
+            with open(self.path, 'r') as f:
+                self.versions = json.load(f).get('versions', {})
+        except FileNotFoundError:
+            pass
+        except (IOError, ValueError) as e:
+            print(f"Warning: ignoring unreadable library change set {self.path}: {e}")
 
-def run_data_processing_v2():
-    """Run the V2 data processing script to generate content-addressed JSON."""
+    def record(self, version, snapshot_path, old_hashes, new_hashes):
+        """Fold one snapshot rewrite (old_hashes None: no earlier snapshot) into the pending changes."""
+        snapshot_path = Path(snapshot_path)
+        diff = diff_library_hashes(old_hashes or {}, new_hashes)
+        pending = self.versions.get(version)
+        if pending is None:
+            pending = {'previous': old_hashes is not None, 'added': [], 'changed': [], 'removed': []}
+        added, changed, removed = set(pending['added']), set(pending['changed']), set(pending['removed'])
+        for name in diff['added']:
+            if name in removed:
+                removed.discard(name)
+                changed.add(name)
+            else:
+                added.add(name)
+        for name in diff['changed']:
+            if name not in added:
+                changed.add(name)
+        for name in diff['removed']:
+            changed.discard(name)
+            if name in added:
+                added.discard(name)
+            else:
+                removed.add(name)
+        self.versions[version] = {
+            'snapshot': snapshot_path.name,
+            'sha256': hashlib.sha256(snapshot_path.read_bytes()).hexdigest(),
+            'previous': pending['previous'],
+            'added': sorted(added),
+            'changed': sorted(changed),
+            'removed': sorted(removed),
+        }
+        print(f"Library changes in {snapshot_path.name}: "
+              + ", ".join(f"{len(self.versions[version][kind])} {kind}" for kind in ('added', 'changed', 'removed')))
+
+    def covers(self, snapshots, recorded):
+        """
+        True if every snapshot that differs from the hashes V2 last consumed
+        (recorded) is described by a pending change, so V2 can update incrementally.
+        """
+        if set(recorded) - set(snapshots):
+            return False
+        pending = {change['snapshot']: change['sha256'] for change in self.versions.values()}
+        return all(pending.get(name) == sha for name, sha in snapshots.items() if recorded.get(name) != sha)
+
+    def save(self):
+        """Persist the pending changes atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'versions': self.versions}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Drop the pending changes once V2 has consumed them."""
+        self.versions = {}
+        self.path.unlink(missing_ok=True)
+
+
+def run_streaming(command, cwd, env=None):
+    """
+    Run a command, printing its combined stdout/stderr line by line as it is
+    produced rather than after it exits. Returns the exit code.
+    """
+    import subprocess
+    process = subprocess.Popen(
+        command,
+        cwd=str(cwd),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    with process.stdout:
+        for line in process.stdout:
+            print(f"  {line}", end="", flush=True)
+    return process.wait()
+
+
+def run_data_processing_v2(changes_path=None):
+    """
+    Run the V2 data processing script to generate content-addressed JSON. With a
+    change set, V2 updates frontend/public/data in place, rebuilding only the
+    libraries it lists.
+    """
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     
     print("Running V2 data processing to generate content-addressed JSON...")
+    env = None
+    if changes_path:
+        print(f"Updating incrementally from {changes_path}")
+        env = dict(os.environ, V2_CHANGES=str(changes_path))
     
-    # Run the V2 data processing bash script
-    import subprocess
-    result = subprocess.run(
-        ["/bin/bash", str(script_dir / "update-instrumentation-list-v2.sh")],
-        cwd=str(project_root),
-        capture_output=True,
-        text=True
-    )
+    # Run the V2 data processing bash script, streaming its output
+    with tracer.span("data-processing-v2", **{"refresh.incremental": bool(changes_path)}) as span:
+        returncode = run_streaming(["/bin/bash", str(script_dir / "update-instrumentation-list-v2.sh")], project_root, env)
+        span.set_attribute("process.exit.code", returncode)
     
-    if result.returncode == 0:
+    if returncode == 0:
         print("V2 data processing completed successfully!")
-        print(result.stdout)
     else:
-        print("Error during V2 data processing:")
-        print(result.stderr)
+        print(f"Error during V2 data processing (exit code {returncode})")
         sys.exit(1)
 
 
+def run_search_index():
+    """Fold new or changed snapshots into the search index; it only re-tokenizes what changed."""
+    script_dir = Path(__file__).parent
+    
+    print("Updating the search index...")
+    
+    with tracer.span("search index") as span:
+        returncode = run_streaming([sys.executable, str(script_dir / "search-index.py"), "update"], script_dir.parent)
+        span.set_attribute("process.exit.code", returncode)
+    
+    if returncode != 0:
+        print(f"Error updating the search index (exit code {returncode})")
+        sys.exit(1)
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments (sys.argv unless argv is given)."""
+    parser = argparse.ArgumentParser(
+        description="Download the latest instrumentation list and regenerate the derived data"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the stage cache and run every stage."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Generate the 3.0 list with the streaming transform (flat memory, same output)."
+    )
+    parser.add_argument(
+        "--variants",
+        default=None,
+        help="Also generate synthetic variants into data/instrumentation_variants/: comma-separated "
+             "semconv opt-in values, '+' to enable several together (e.g. database,rpc,database+service.peer), "
+             "or 'all' for one variant per opt-in value."
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=None,
+        help="Write OTLP/JSON spans for every stage of the run to this file."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: poll the instrumentation list and latest release with conditional requests "
+             "and update whenever either changes."
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between polls in --watch mode (default: 300)."
+    )
+    parser.add_argument(
+        "--polls",
+        type=int,
+        default=None,
+        help="Stop --watch mode after this many polls (default: run until interrupted)."
+    )
+    return parser.parse_args(argv)
+
+
 def main():
-    """Main function to orchestrate the update process."""
+    """Main function: run the update, traced when --trace-file is given."""
+    args = parse_arguments()
+    with trace_to_file(args.trace_file, "update-instrumentation-list"):
+        if args.watch:
+            watch_updates(args)
+        else:
+            run_update(args)
+
+
+def watch_updates(args):
+    """
+    Poll the latest release and the instrumentation list with conditional requests
+    on one session, and run the update with the polled release tag and list
+    whenever either changes. Unchanged stages are skipped by the stage cache and
+    V2 is regenerated incrementally, so a small upstream change is published
+    within one interval.
+    """
+    session = requests.Session()
+    poller = ConditionalPoller(session.get, headers=auth_headers())
+    state = {"tag": None, "content": None}
+
+    def poll():
+        changed = []
+        release = poller.poll(latest_release_url())
+        if release is not None:
+            tag = release.json().get("tag_name")
+            if tag and tag != state["tag"]:
+                state["tag"] = tag
+                changed.append(f"release {tag}")
+        listing = poller.poll(instrumentation_list_url())
+        if listing is not None and listing.text != state["content"]:
+            state["content"] = listing.text
+            changed.append("instrumentation list")
+        if not changed or not state["tag"] or state["content"] is None:
+            return None
+        print(f"\nUpstream changed: {', '.join(changed)}")
+        return dict(state)
+
+    def refresh(change):
+        run_update(args, session=session, release_tag=change["tag"], content=change["content"])
+
+    watch("the instrumentation list and latest release", poll, refresh, args.interval, args.polls, poller.report)
+
+
+def run_update(args, session=None, release_tag=None, content=None, before_v2=None):
+    """
+    Orchestrate the update process. A caller running other jobs alongside can
+    share its requests session and pass the already resolved latest release tag
+    and downloaded list, and a before_v2 callable that blocks until jobs writing
+    the READMEs (which V2 reads) are done.
+    """
     print("Starting instrumentation list update process...")
+
+    project_root = Path(__file__).parent.parent
+    stage_cache = StageCache(project_root / "data" / "pipeline_stage_cache.json", project_root, force=args.force)
     
     # Get the latest version
-    version = get_latest_release_version()
+    version = version_from_tag(release_tag) if release_tag else get_latest_release_version()
     if not version:
         print("Could not determine latest version, using 'latest' as filename")
         version = "latest"
     
     # Download the latest instrumentation data
-    content = get_latest_instrumentation_data()
+    if content is None:
+        content = get_latest_instrumentation_data(session)
+    content_hash = hash_text(content)
+
+    latest_path = project_root / f"instrumentation-list-{version}.yaml"
+    version_3_0_path = project_root / "instrumentation-list-3.0.yaml"
+    latest_inputs = hash_text(f"{version}\n{content_hash}")
+    version_3_0_inputs = hash_text(f"{content_hash}\n{transform_fingerprint()}")
+    latest_fresh = stage_cache.is_fresh("instrumentation-list", latest_inputs, [latest_path])
+    version_3_0_fresh = stage_cache.is_fresh("generate-3.0", version_3_0_inputs, [version_3_0_path])
+
+    variants_dir = project_root / "data" / "instrumentation_variants"
+    variants_inputs = hash_text(f"{content_hash}\n{transform_fingerprint()}\n{args.variants}")
+    variants_fresh = not args.variants or stage_cache.is_fresh(
+        "generate-variants", variants_inputs, list_files(variants_dir, "instrumentation-list-*.yaml"))
+
+    data = None
+    if not (latest_fresh and version_3_0_fresh and variants_fresh):
+        # Parse once: validates the YAML and provides the document for the transforms.
+        # The streaming transform reads the saved file itself, so only validate here
+        # unless variants need the document.
+        try:
+            if args.stream and variants_fresh:
+                validate_instrumentation_yaml(content)
+            else:
+                data = parse_instrumentation_yaml(content)
+        except yaml.YAMLError as e:
+            print(f"Downloaded content is not valid YAML: {e}")
+            sys.exit(1)
+
+    # Every synthetic version that needs regenerating comes out of one walk of the list
+    variants = []
+    if not version_3_0_fresh and not args.stream:
+        variants.append(VERSION_3_0)
+    if not variants_fresh:
+        variants.extend(parse_variant_rules(args.variants, data))
+    generated = {}
+    if variants:
+        print(f"Generating synthetic versions in one pass: {', '.join(v.name for v in variants)}")
+        with tracer.span("yaml transform", **{"refresh.variants": [v.name for v in variants]}):
+            generated = generate_variants(data, variants)
     
-    # Validate that it's valid YAML
-    try:
-        yaml.safe_load(content)
-    except yaml.YAMLError as e:
-        print(f"Downloaded content is not valid YAML: {e}")
-        sys.exit(1)
+    # Library entry hashes of the snapshots about to be replaced, for the V2 change set
+    library_changes = LibraryChanges(project_root / "data" / "library_changes.json")
+    previous_hashes = {
+        path: read_library_hashes(path)
+        for path, fresh in ((latest_path, latest_fresh), (version_3_0_path, version_3_0_fresh)) if not fresh
+    }
     
     # Save the latest version file
-    filepath = save_instrumentation_file(content, version)
+    if latest_fresh:
+        print(f"Skipping save: instrumentation-list-{version}.yaml is unchanged")
+    else:
+        save_instrumentation_file(content, version)
+        stage_cache.record("instrumentation-list", latest_inputs, [latest_path])
+        library_changes.record(version, latest_path, previous_hashes[latest_path], read_library_hashes(latest_path))
     
     # Generate and save the hypothetical 3.0 version
-    print("Generating hypothetical 3.0 version with semconv opt-in features as defaults...")
-    version_3_0_content = generate_3_0_version(content)
-    save_instrumentation_file(version_3_0_content, "3.0")
+    if version_3_0_fresh:
+        print("Skipping 3.0 generation: upstream list and transform are unchanged")
+    else:
+        print("Generating hypothetical 3.0 version with semconv opt-in features as defaults...")
+        if args.stream:
+            try:
+                with tracer.span("yaml stream transform", **{"file.path": str(latest_path)}) as span, \
+                        open(latest_path, 'r', encoding='utf-8') as source:
+                    streamed = stream_3_0_version(source, version_3_0_path)
+                    span.set_attribute("refresh.streamed", streamed)
+            except yaml.YAMLError as e:
+                print(f"Error streaming the 3.0 transform: {e}")
+                sys.exit(1)
+            if not streamed:
+                save_instrumentation_file(content, "3.0")
+        else:
+            version_3_0_data = generated[VERSION_3_0.name] if generated else None
+            if version_3_0_data is None:
+                version_3_0_content = content
+            else:
+                version_3_0_content = dump_instrumentation_yaml(version_3_0_data)
+            save_instrumentation_file(version_3_0_content, "3.0")
+        stage_cache.record("generate-3.0", version_3_0_inputs, [version_3_0_path])
+        library_changes.record("3.0", version_3_0_path, previous_hashes[version_3_0_path],
+                               read_library_hashes(version_3_0_path))
+    if library_changes.versions:
+        library_changes.save()
+
+    # Save the synthetic variants outside the project root so V2 does not publish them
+    if variants_fresh:
+        if args.variants:
+            print("Skipping variant generation: upstream list, transform and rules are unchanged")
+    elif generated is None:
+        print("Skipping variants: the instrumentation list does not have the expected structure")
+    else:
+        saved = set()
+        for variant in variants:
+            if variant is VERSION_3_0:
+                continue
+            path = save_instrumentation_file(
+                dump_instrumentation_yaml(generated[variant.name]), variant.name, variants_dir)
+            saved.add(Path(path).name)
+        for path in list_files(variants_dir, "instrumentation-list-*.yaml"):
+            if path.name not in saved:
+                path.unlink()
+        stage_cache.record("generate-variants", variants_inputs, list_files(variants_dir, "instrumentation-list-*.yaml"))
     
-    # Run V2 data processing (this will process all YAML files including the new 3.0)
-    run_data_processing_v2()
+    # Search postings for the snapshots (incremental: only new or changed snapshots)
+    run_search_index()
+    
+    if before_v2:
+        before_v2()
+    
+    # Run V2 data processing (this will process all YAML files including the new 3.0).
+    # When only snapshots changed, and the change set describes all of them, V2
+    # rebuilds just the changed libraries.
+    v2_base = data_processing_v2_base_hash(project_root)
+    snapshots = snapshot_hashes(project_root)
+    v2_inputs = hash_text(v2_base + json.dumps(snapshots, sort_keys=True))
+    v2_outputs = list_files(project_root / "frontend" / "public" / "data")
+    if stage_cache.is_fresh("data-processing-v2", v2_inputs, v2_outputs):
+        print("Skipping V2 data processing: inputs and frontend/public/data are unchanged")
+        # Changes that were reverted before V2 ran are already reflected
+        library_changes.clear()
+    else:
+        v2_entry = stage_cache.entries.get("data-processing-v2", {})
+        incremental = (
+            not args.force
+            and v2_entry.get('base') == v2_base
+            and library_changes.covers(snapshots, v2_entry.get('snapshots', {}))
+            and stage_cache.outputs_match("data-processing-v2", v2_outputs)
+        )
+        if library_changes.versions and not incremental:
+            print("Regenerating all V2 data: inputs other than the listed library changes differ")
+        run_data_processing_v2(library_changes.path if incremental else None)
+        stage_cache.record("data-processing-v2", v2_inputs, list_files(project_root / "frontend" / "public" / "data"),
+                           base=v2_base, snapshots=snapshots)
+        library_changes.clear()
     
-    print(f"Update complete!")
+    print("Update complete!")
     print(f"- Latest version saved as: instrumentation-list-{version}.yaml")
-    print(f"- Hypothetical 3.0 version saved as: instrumentation-list-3.0.yaml")
+    print("- Hypothetical 3.0 version saved as: instrumentation-list-3.0.yaml")
+    if args.variants:
+        print("- Synthetic variants are in data/instrumentation_variants/")
+    print("- The search index has been updated in frontend/public/search-index/")
     print("- The V2 content-addressed data has been updated in frontend/public/data/")
 
 
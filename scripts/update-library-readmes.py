@@ -6,178 +6,219 @@ with ID-prefixed content-hashed filenames in a shared directory.
 """
 
 import argparse
-import base64
 import hashlib
+import json
 import os
-import requests
+import re
 import sys
+import tarfile
+import threading
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
+from pipeline_common import list_snapshots, load_script, version_key
+from pipeline_github import GitHubClient, HTTPCache, TagIndex, TreeCache
+from pipeline_trace import trace_to_file, tracer
+from pipeline_watch import ConditionalPoller, watch
 
-class GitHubClient:
-    """Simple GitHub API client for fetching repository data."""
-    
-    def __init__(self):
-        self.session = requests.Session()
-        github_token = os.environ.get("GITHUB_TOKEN")
-        if github_token:
-            self.session.headers.update({'Authorization': f'Bearer {github_token}'})
-        self.base_url = 'https://api.github.com'
-    
-    def _get(self, url, params=None):
-        """Make a GET request with error handling."""
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Error making request to {url}: {e}")
-            return None
-    
-    def get_most_recent_commit(self, repo: str, branch: str = "main"):
-        """Get the most recent commit SHA for a branch."""
-        api_url = f"{self.base_url}/repos/{repo}/commits"
-        params = {
-            "per_page": 1,
-            "sha": branch
-        }
-        
-        response = self._get(api_url, params=params)
-        if response and response.status_code == 200:
-            commits = response.json()
-            if commits:
-                return commits[0]['sha']
+
+def get_library_name_from_readme_path(path: str) -> Optional[str]:
+    """
+    Return the library name for an instrumentation library README path, or None.
+    Uses the final library segment only, e.g.:
+    "instrumentation/apache-httpclient/apache-httpclient-4.3/library/README.md" -> "apache-httpclient-4.3"
+    "instrumentation/apache-dbcp-2.0/library/README.md" -> "apache-dbcp-2.0"
+    """
+    if not (path.startswith("instrumentation/") and path.lower().endswith("/library/readme.md")):
         return None
-    
-    def get_commit_sha_for_tag(self, repo: str, tag: str):
-        """Get the commit SHA for a specific tag."""
-        # Try the specific tag ref endpoint first
-        api_url = f"{self.base_url}/repos/{repo}/git/refs/tags/{tag}"
-        
-        response = self._get(api_url)
-        if response and response.status_code == 200:
-            ref_data = response.json()
-            
-            # Handle case where API returns a list of refs
-            if isinstance(ref_data, list):
-                if not ref_data:
-                    return None
-                # Find exact match or take the first one
-                for ref in ref_data:
-                    if ref["ref"] == f"refs/tags/{tag}":
-                        ref_data = ref
-                        break
-                else:
-                    ref_data = ref_data[0]
-            
-            # Handle both lightweight and annotated tags
-            if ref_data["object"]["type"] == "commit":
-                return ref_data["object"]["sha"]
-            elif ref_data["object"]["type"] == "tag":
-                # For annotated tags, we need to get the commit from the tag object
-                tag_url = ref_data["object"]["url"]
-                tag_response = self._get(tag_url)
-                if tag_response and tag_response.status_code == 200:
-                    tag_data = tag_response.json()
-                    return tag_data["object"]["sha"]
-        
-        # Fallback: try to get commit SHA from releases API
-        releases_url = f"{self.base_url}/repos/{repo}/releases/tags/{tag}"
-        response = self._get(releases_url)
-        if response and response.status_code == 200:
-            release_data = response.json()
-            return release_data.get("target_commitish")
-            
+    parts = path.split("/")
+    if len(parts) < 3:
         return None
-    
-    def get_latest_release_tag(self, repo: str):
-        """Get the latest release tag."""
-        api_url = f"{self.base_url}/repos/{repo}/releases/latest"
-        
-        response = self._get(api_url)
-        if response and response.status_code == 200:
-            release_data = response.json()
-            return release_data["tag_name"]
+    return parts[-3]  # The directory just before '/library/README.md'
+
+
+# A tree with more unlisted subdirectories than this is listed recursively in one request
+SUBTREE_BATCH_THRESHOLD = 8
+
+
+def is_readme_candidate(relative_path: str) -> bool:
+    """True for README.md, or .../library/README.md, relative to some tree."""
+    parts = relative_path.split("/")
+    return parts[-1].lower() == "readme.md" and (len(parts) == 1 or parts[-2] == "library")
+
+
+def list_tree_recursive(github_client: GitHubClient, repo: str, tree_sha: str,
+                        tree_cache: TreeCache) -> Optional[List[List[str]]]:
+    """
+    List a tree recursively in one streamed request and cache it and its direct
+    subtrees. Returns its README candidates, or None if the listing was truncated
+    (or failed) and the tree has to be walked instead.
+    """
+    listing = github_client.stream_tree(repo, tree_sha, recursive=True)
+    if listing is None:
         return None
-    
-    def get_repository_tree(self, repository: str, commit_sha: str):
-        """Get the complete repository tree structure at a specific commit."""
-        api_url = f"{self.base_url}/repos/{repository}/git/trees/{commit_sha}?recursive=1"
-        
-        response = self._get(api_url)
-        if response and response.status_code == 200:
-            return response.json()
+    tree_cache.note_listing()
+    readmes = []
+    subtrees = {}
+    for entry in listing:
+        path = entry.get("path", "")
+        if entry.get("type") == "tree" and "/" not in path:
+            subtrees[path] = entry.get("sha")
+        elif entry.get("type") == "blob" and is_readme_candidate(path):
+            readmes.append([path, entry.get("sha", "")])
+    if listing.truncated:
+        print(f"  Tree {tree_sha[:8]} listing was truncated, walking its subtrees instead")
         return None
-    
-    def get_file_content(self, repository: str, filepath: str, commit_sha: str):
-        """Get file content at a specific commit."""
-        api_url = f"{self.base_url}/repos/{repository}/contents/{filepath}"
-        
-        response = self._get(api_url, params={"ref": commit_sha})
-        if response and response.status_code == 200:
-            # File content is base64 encoded, decode it
-            content = response.json().get("content", "")
-            try:
-                decoded_content = base64.b64decode(content)
-                return decoded_content.decode('utf-8')
-            except Exception as e:
-                print(f"Error decoding content for {filepath}: {e}")
-                return None
-        elif response and response.status_code == 403:
-            # Rate limited - wait and retry once
-            print(f"  Rate limited, waiting 60 seconds before retry...")
-            time.sleep(60)
-            response = self._get(api_url, params={"ref": commit_sha})
-            if response and response.status_code == 200:
-                content = response.json().get("content", "")
-                try:
-                    decoded_content = base64.b64decode(content)
-                    return decoded_content.decode('utf-8')
-                except Exception as e:
-                    print(f"Error decoding content for {filepath}: {e}")
-                    return None
+
+    for name, sha in subtrees.items():
+        prefix = f"{name}/"
+        tree_cache.put(sha, [[path[len(prefix):], blob_sha] for path, blob_sha in readmes if path.startswith(prefix)])
+    tree_cache.put(tree_sha, readmes)
+    return readmes
+
+
+def walk_tree_readmes(github_client: GitHubClient, repo: str, tree_sha: str, tree_cache: TreeCache) -> Optional[List[List[str]]]:
+    """
+    Return the README candidates below a tree, listing only what the cache lacks.
+    The tree's direct entries are listed; cached subdirectories are reused, and
+    the rest are listed recursively, one request each or in a single request for
+    the whole tree when many are missing. Truncated listings fall back to walking
+    one level down. Returns None if a request failed.
+    """
+    cached = tree_cache.get(tree_sha)
+    if cached is not None:
+        return cached
+
+    listing = github_client.stream_tree(repo, tree_sha)
+    if listing is None:
         return None
+    tree_cache.note_listing()
+    readmes = []
+    subtrees = []
+    for entry in listing:
+        if entry.get("type") == "tree":
+            subtrees.append((entry.get("path", ""), entry.get("sha")))
+        elif entry.get("type") == "blob" and is_readme_candidate(entry.get("path", "")):
+            readmes.append([entry["path"], entry.get("sha", "")])
 
+    missing = [sha for _, sha in subtrees if sha not in tree_cache]
+    if len(missing) > SUBTREE_BATCH_THRESHOLD:
+        listed = list_tree_recursive(github_client, repo, tree_sha, tree_cache)
+        if listed is not None:
+            return listed
 
+    for name, sha in subtrees:
+        below = tree_cache.get(sha)
+        if below is None:
+            below = list_tree_recursive(github_client, repo, sha, tree_cache)
+        if below is None:
+            below = walk_tree_readmes(github_client, repo, sha, tree_cache)
+        if below is None:
+            return None
+        readmes.extend([f"{name}/{path}", blob_sha] for path, blob_sha in below)
+
+    tree_cache.put(tree_sha, readmes)
+    return readmes
 
 
-def discover_library_readmes(github_client: GitHubClient, commit_sha: str) -> List[Tuple[str, str]]:
+def walk_library_readmes(github_client: GitHubClient, commit_sha: str,
+                         tree_cache: TreeCache) -> Optional[List[Tuple[str, str, str]]]:
     """
-    Discover all library README files using GitHub API tree structure.
-    Returns list of tuples: (library_name, readme_path)
+    Discover library READMEs by walking only the instrumentation/ subtree.
+    Returns (library_name, readme_path, blob_sha) tuples, or None if a request failed.
     """
     repo = "open-telemetry/opentelemetry-java-instrumentation"
-    
-    print("Fetching repository tree structure...")
-    tree_data = github_client.get_repository_tree(repo, commit_sha)
-    
-    if not tree_data:
-        print("Error: Could not fetch repository tree")
-        return []
-    
+
+    root = github_client.stream_tree(repo, commit_sha)
+    if root is None:
+        return None
+    instrumentation_sha = None
+    for entry in root:
+        if entry.get("path") == "instrumentation" and entry.get("type") == "tree":
+            instrumentation_sha = entry.get("sha")
+    if not instrumentation_sha:
+        print("Error: instrumentation/ not found in the repository tree")
+        return None
+
+    readmes = walk_tree_readmes(github_client, repo, instrumentation_sha, tree_cache)
+    tree_cache.save()
+    if readmes is None:
+        return None
+
     library_readmes = []
+    for path, blob_sha in readmes:
+        full_path = f"instrumentation/{path}"
+        library_name = get_library_name_from_readme_path(full_path)
+        if library_name:
+            library_readmes.append((library_name, full_path, blob_sha))
+    return library_readmes
+
+
+def discover_library_readmes(github_client: GitHubClient, commit_sha: str,
+                             tree_mode: str = "subtree") -> List[Tuple[str, str, str]]:
+    """
+    Discover all library README files using GitHub API tree structure.
+    Returns list of tuples: (library_name, readme_path, blob_sha)
+
+    tree_mode "subtree" walks only instrumentation/, streaming each listing and
+    skipping directories whose tree SHA is in the client's tree cache.
+    "recursive" fetches the whole repository tree in one response, and falls
+    back to the walk if GitHub truncated it.
+    """
+    repo = "open-telemetry/opentelemetry-java-instrumentation"
     
-    # Filter for library README files
-    for item in tree_data.get("tree", []):
-        path = item["path"]
-        
-        # Look for README.md files in library directories
-        if (path.startswith("instrumentation/") and 
-            path.lower().endswith("/library/readme.md") and
-            item["type"] == "blob"):
+    with tracer.span("tree discovery", **{"vcs.ref.head.revision": commit_sha, "refresh.tree.mode": tree_mode}) as span:
+        library_readmes = None
+        if tree_mode == "recursive":
+            print("Fetching repository tree structure...")
+            tree_data = github_client.get_repository_tree(repo, commit_sha)
             
-            # Extract library name from path - use final segment only
-            # e.g., "instrumentation/apache-httpclient/apache-httpclient-4.3/library/README.md" -> "apache-httpclient-4.3"
-            # e.g., "instrumentation/apache-dbcp-2.0/library/README.md" -> "apache-dbcp-2.0"
-            parts = path.split("/")
-            if len(parts) >= 3:
-                library_name = parts[-3]  # The directory just before '/library/README.md'
-                library_readmes.append((library_name, path))
-    
-    print(f"Found {len(library_readmes)} library README files")
-    return library_readmes
+            if not tree_data:
+                span.set_error("tree not fetched")
+                print("Error: Could not fetch repository tree")
+                return []
+            
+            span.set_attributes(**{
+                "refresh.tree.entries": len(tree_data.get("tree", [])),
+                "refresh.tree.truncated": bool(tree_data.get("truncated")),
+            })
+            if tree_data.get("truncated"):
+                # GitHub silently drops entries past its limit; the walk sees every library
+                print("Repository tree was truncated by GitHub, walking instrumentation/ instead...")
+            else:
+                library_readmes = []
+                
+                # Filter for library README files
+                for item in tree_data.get("tree", []):
+                    path = item["path"]
+                    
+                    # Look for README.md files in library directories
+                    if item["type"] == "blob":
+                        library_name = get_library_name_from_readme_path(path)
+                        if library_name:
+                            library_readmes.append((library_name, path, item.get("sha", "")))
+
+        if library_readmes is None:
+            print("Walking the instrumentation/ tree...")
+            tree_cache = github_client.tree_cache
+            hits, listed = tree_cache.hits, tree_cache.listed
+            library_readmes = walk_library_readmes(github_client, commit_sha, tree_cache)
+            if library_readmes is None:
+                span.set_error("tree not fetched")
+                print("Error: Could not walk the repository tree")
+                return []
+            print(f"Listed {tree_cache.listed - listed} trees, reused {tree_cache.hits - hits} unchanged from the tree cache")
+            span.set_attributes(**{
+                "refresh.tree.listed": tree_cache.listed - listed,
+                "refresh.tree.cache_hits": tree_cache.hits - hits,
+            })
+        
+        span.set_attribute("refresh.readmes", len(library_readmes))
+        print(f"Found {len(library_readmes)} library README files")
+        return library_readmes
 
 
 def download_readme_content(github_client: GitHubClient, readme_path: str, commit_sha: str, library_name: str) -> Optional[str]:
@@ -198,79 +239,730 @@ def compute_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
 
 
-def save_readme(content: str, library_name: str) -> Tuple[str, str, bool]:
-    """
-    Save README with ID-prefixed content hash.
-    Returns (hash, filename, is_new).
-    """
+def compute_git_blob_sha(content: bytes) -> str:
+    """Compute the git blob SHA-1 of some content, as reported in tree listings."""
+    header = f"blob {len(content)}\0".encode('utf-8')
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def get_readme_dir() -> Path:
+    """Get the shared library_readme directory."""
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
+    return project_root / "data" / "library_readme"
+
 
-    # Create shared library_readme directory (no version subdirs)
-    readme_dir = project_root / "data" / "library_readme"
-    readme_dir.mkdir(parents=True, exist_ok=True)
+class ReadmeStore:
+    """
+    The shared README directory, scanned once.
 
-    # Compute hash and create filename with ID prefix
-    content_hash = compute_content_hash(content)
-    filename = f"{library_name}-{content_hash}.md"
-    filepath = readme_dir / filename
+    Saving checks the in-memory file set instead of stat-ing the disk, and files
+    are written to a temporary name and renamed into place so a crash never
+    leaves a truncated README behind. Safe to use from several worker threads.
+    """
 
-    # Check if file already exists (same content)
-    if filepath.exists():
-        print(f"  ✓ README unchanged: {filename}")
-        return content_hash, filename, False
+    def __init__(self, readme_dir: Path):
+        self.readme_dir = readme_dir
+        self.readme_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(self.readme_dir) as entries:
+            self.filenames = {entry.name for entry in entries if entry.is_file() and entry.name.endswith('.md')}
+        self._lock = threading.Lock()
 
-    # Write new file
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def library_files(self, library_name: str) -> List[str]:
+        """Return the stored filenames for a library."""
+        # stem[:-13] strips "-<hash>" so "jdbc" does not match "jdbc-datasource-..."
+        return sorted(name for name in self.filenames if name[:-3][:-13] == library_name)
+
+    def save(self, content: str, library_name: str) -> Tuple[str, str, bool]:
+        """Save README content under its ID-prefixed hash. Returns (hash, filename, is_new)."""
+        content_hash = compute_content_hash(content)
+        filename = f"{library_name}-{content_hash}.md"
+
+        with self._lock:
+            if filename in self.filenames:
+                print(f"  ✓ README unchanged: {filename}")
+                return content_hash, filename, False
+
+        filepath = self.readme_dir / filename
+        tmp_path = filepath.with_name(f".{filename}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, filepath)
+        except IOError as e:
+            print(f"  ✗ Error saving README for {library_name}: {e}")
+            return "", "", False
+
+        with self._lock:
+            self.filenames.add(filename)
         print(f"  ✓ Saved: {filename}")
         return content_hash, filename, True
+
+    def gc(self, referenced: set, dry_run: bool = False) -> List[str]:
+        """Delete READMEs not in referenced; returns the (would-be) removed filenames."""
+        with self._lock:
+            unreferenced = sorted(self.filenames - referenced)
+            if not dry_run:
+                for filename in unreferenced:
+                    try:
+                        (self.readme_dir / filename).unlink()
+                    except FileNotFoundError:
+                        pass
+                    self.filenames.discard(filename)
+        return unreferenced
+
+
+_readme_stores: Dict[Path, ReadmeStore] = {}
+
+
+def get_readme_store() -> ReadmeStore:
+    """Return the store for the README directory, scanning it on first use."""
+    readme_dir = get_readme_dir()
+    if readme_dir not in _readme_stores:
+        _readme_stores[readme_dir] = ReadmeStore(readme_dir)
+    return _readme_stores[readme_dir]
+
+
+def get_readme_index_path() -> Path:
+    """Get the path of the blob SHA index kept next to the README directory."""
+    return get_readme_dir().parent / "library_readme_index.json"
+
+
+def load_readme_index() -> Dict[str, Dict[str, str]]:
+    """
+    Load the README index: library -> {"blob_sha": ..., "filename": ...}.
+    Returns an empty index if the file does not exist or cannot be parsed.
+    """
+    index_path = get_readme_index_path()
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (IOError, ValueError) as e:
+        print(f"Warning: could not read README index {index_path}: {e}")
+        return {}
+
+
+def save_readme_index(index: Dict[str, Dict[str, str]]):
+    """Write the README index atomically with stable ordering."""
+    index_path = get_readme_index_path()
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, index_path)
     except IOError as e:
-        print(f"  ✗ Error saving README for {library_name}: {e}")
-        return "", "", False
+        print(f"Error saving README index: {e}")
+
 
-def process_readmes(github_client: GitHubClient, commit_sha: str, libraries: List[Tuple[str, str]], delay: float = 0.5):
+def find_indexed_readme(index: Dict[str, Dict[str, str]], library_name: str, blob_sha: str) -> Optional[str]:
     """
-    Process README files for all libraries using GitHub API.
-    Downloads and saves all README files with ID-prefixed content hashing.
+    Return the local filename of a README whose upstream blob SHA matches, or None.
+
+    Libraries missing from the index are looked up by computing the blob SHA of
+    their existing local files, so a fresh index still avoids re-downloading.
     """
-    print(f"\nProcessing {len(libraries)} libraries...")
-    print(f"Using {delay}s delay between requests to respect API limits...")
+    if not blob_sha:
+        return None
+
+    store = get_readme_store()
+    entry = index.get(library_name)
+    if entry and entry.get("blob_sha") == blob_sha:
+        if entry["filename"] in store.filenames:
+            return entry["filename"]
+        return None
+
+    for filename in store.library_files(library_name):
+        if compute_git_blob_sha((store.readme_dir / filename).read_bytes()) == blob_sha:
+            return filename
+    return None
+
+
+def save_readme(content: str, library_name: str) -> Tuple[str, str, bool]:
+    """
+    Save README with ID-prefixed content hash in the shared directory.
+    Returns (hash, filename, is_new).
+    """
+    with tracer.span("readme save", **{"refresh.library": library_name, "refresh.bytes": len(content)}) as span:
+        content_hash, filename, is_new = get_readme_store().save(content, library_name)
+        span.set_attributes(**{"file.name": filename, "refresh.new_file": is_new})
+        return content_hash, filename, is_new
+
+
+def iter_archive_readmes(fileobj: BinaryIO) -> Iterator[Tuple[str, str, str]]:
+    """
+    Stream a gzipped tar archive of the repository and yield library READMEs.
+    Members are read one at a time, so the archive is never held in memory.
+    Yields tuples: (library_name, readme_path, content)
+    """
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            # Archive members are prefixed with "<owner>-<repo>-<sha>/"
+            path = member.name.split("/", 1)[-1]
+            library_name = get_library_name_from_readme_path(path)
+            if not library_name:
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is None:
+                continue
+            try:
+                content = extracted.read().decode('utf-8')
+            except UnicodeDecodeError as e:
+                print(f"Error decoding content for {path}: {e}")
+                continue
+            yield library_name, path, content
+
+
+def iter_zip_archive_readmes(archive_path: Path) -> Iterator[Tuple[str, str, str]]:
+    """
+    Read library READMEs from a zipball on disk, decompressing only matching members.
+    Yields tuples: (library_name, readme_path, content)
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            path = info.filename.split("/", 1)[-1]
+            library_name = get_library_name_from_readme_path(path)
+            if not library_name:
+                continue
+            try:
+                content = archive.read(info).decode('utf-8')
+            except UnicodeDecodeError as e:
+                print(f"Error decoding content for {path}: {e}")
+                continue
+            yield library_name, path, content
+
+
+def process_archive_readmes(readmes: Iterator[Tuple[str, str, str]], use_index: bool = True,
+                            readme_files: Optional[Dict[str, str]] = None):
+    """
+    Save README files from an archive iterator with ID-prefixed content hashing.
+    Returns the same counters as process_readmes; fills readme_files like process_readmes.
+    """
+    index = load_readme_index() if use_index else None
 
     successful_downloads = 0
     new_files = 0
     unchanged_files = 0
     failed_downloads = 0
 
-    for i, (library_name, readme_path) in enumerate(libraries):
-        print(f"[{i+1}/{len(libraries)}] Processing {library_name}")
+    for library_name, readme_path, content in readmes:
+        print(f"[{successful_downloads + failed_downloads + 1}] Extracted {library_name}")
+        content_hash, filename, is_new = save_readme(content, library_name)
+        if not filename:
+            failed_downloads += 1
+            continue
+
+        successful_downloads += 1
+        if is_new:
+            new_files += 1
+        else:
+            unchanged_files += 1
+
+        if readme_files is not None:
+            readme_files[library_name] = filename
+        if index is not None:
+            blob_sha = compute_git_blob_sha(content.encode('utf-8'))
+            index[library_name] = {"blob_sha": blob_sha, "filename": filename}
+
+    if index is not None:
+        save_readme_index(index)
+
+    return successful_downloads, new_files, unchanged_files, failed_downloads
+
+
+def process_local_archive(archive_path: Path, use_index: bool = True) -> bool:
+    """Process README files from a repository tarball or zipball on disk."""
+    print(f"\n{'='*60}")
+    print(f"Processing archive: {archive_path}")
+    print(f"{'='*60}")
+
+    try:
+        if zipfile.is_zipfile(archive_path):
+            counters = process_archive_readmes(iter_zip_archive_readmes(archive_path), use_index)
+        else:
+            with open(archive_path, 'rb') as f:
+                counters = process_archive_readmes(iter_archive_readmes(f), use_index)
+    except (IOError, tarfile.TarError, zipfile.BadZipFile) as e:
+        print(f"Error reading archive {archive_path}: {e}")
+        return False
+
+    print_summary(str(archive_path), None, *counters)
+    update_search_index()
+    return True
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the libraries a README run has finished, one JSON-lines
+    file per commit SHA, so an interrupted or cancelled run resumes where it stopped:
+
+        {"library": ..., "blob_sha": ..., "hash": <content hash>, "filename": ..., "status": ...}
+
+    Each entry is a single O_APPEND write, so parallel runs on the same commit can
+    share a journal without tearing lines; entries other runs appended are read
+    before each library, so no run repeats a library another one finished. A
+    partial last line left by a killed run is skipped and that library redone.
+    Failed libraries are not recorded and are retried. Only the newest `keep`
+    journals are kept.
+    """
+
+    def __init__(self, directory: Optional[Path], keep: int = 20):
+        self.directory = Path(directory) if directory else None
+        self.resumed = 0
+        self._entries: Dict[str, Dict[str, dict]] = {}
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            journals = sorted(self.directory.glob("*.jsonl"), key=lambda path: path.stat().st_mtime, reverse=True)
+            for path in journals[keep:]:
+                path.unlink(missing_ok=True)
+
+    def _path(self, commit_sha: str) -> Path:
+        return self.directory / f"{commit_sha}.jsonl"
+
+    def _read_new_entries(self, commit_sha: str):
+        """Read entries appended (by this or another run) since the last read. Caller holds the lock."""
+        entries = self._entries.setdefault(commit_sha, {})
+        offset = self._offsets.get(commit_sha, 0)
+        try:
+            with open(self._path(commit_sha), 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # A line still being written by another run is picked up next time
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                entry = json.loads(line)
+                entries[entry["library"]] = entry
+            except (ValueError, KeyError):
+                continue
+        self._offsets[commit_sha] = offset + len(complete)
+
+    def completed(self, commit_sha: str, library_name: str, blob_sha: str = "") -> Optional[str]:
+        """Return the saved filename if the library is finished for this commit and its README is still on disk."""
+        if not self.directory:
+            return None
+        with self._lock:
+            self._read_new_entries(commit_sha)
+            entry = self._entries[commit_sha].get(library_name)
+            if not entry or (blob_sha and entry.get("blob_sha") and entry["blob_sha"] != blob_sha):
+                return None
+            if entry.get("filename") not in get_readme_store().filenames:
+                return None
+            self.resumed += 1
+            return entry["filename"]
+
+    def record(self, commit_sha: str, library_name: str, blob_sha: str, filename: str, status: str):
+        """Append a finished library to the commit's journal."""
+        if not self.directory:
+            return
+        content_hash = filename[:-3][-12:]
+        entry = {"library": library_name, "blob_sha": blob_sha, "hash": content_hash, "filename": filename,
+                 "status": status}
+        line = (json.dumps(entry, sort_keys=True) + "\n").encode('utf-8')
+        with self._lock:
+            fd = os.open(self._path(commit_sha), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    # A run killed mid-write left a partial line; end it, so this entry is not merged into it
+                    line = b"\n" + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def report(self):
+        """Print how many libraries were resumed from the journal."""
+        if self.directory and self.resumed:
+            print(f"Checkpoint journal: {self.resumed} libraries already finished by an earlier or parallel run")
+
+
+def process_library_readme(github_client: GitHubClient, commit_sha: str, library_name: str, readme_path: str,
+                           blob_sha: str = "", index: Optional[Dict[str, Dict[str, str]]] = None,
+                           journal: Optional[CheckpointJournal] = None) -> Tuple[str, str]:
+    """
+    Download and save the README for a single library.
+    Libraries the checkpoint journal lists as finished for this commit, and READMEs
+    whose upstream blob SHA is already in the index, are not downloaded.
+    Returns (status, filename) where status is 'new', 'unchanged', 'failed',
+    'indexed' (unchanged, no request made) or 'resumed' (finished by an earlier
+    or parallel run, no request made).
+    """
+    with tracer.span("readme", **{"refresh.library": library_name, "file.path": readme_path}) as span:
+        if journal is not None:
+            resumed_filename = journal.completed(commit_sha, library_name, blob_sha)
+            if resumed_filename:
+                print(f"  ✓ Already finished for {commit_sha[:8]}: {resumed_filename}")
+                span.set_attributes(**{"refresh.status": "resumed", "refresh.cache_hit": True})
+                return 'resumed', resumed_filename
+
+        if index is not None:
+            indexed_filename = find_indexed_readme(index, library_name, blob_sha)
+            if indexed_filename:
+                print(f"  ✓ README unchanged (blob {blob_sha[:8]}): {indexed_filename}")
+                span.set_attributes(**{"refresh.status": "indexed", "refresh.cache_hit": True})
+                if journal is not None:
+                    journal.record(commit_sha, library_name, blob_sha, indexed_filename, 'indexed')
+                return 'indexed', indexed_filename
 
         # Download README content
         content = download_readme_content(github_client, readme_path, commit_sha, library_name)
 
-        if content is not None:
-            # Save README file with ID-prefixed content hash
-            content_hash, filename, is_new = save_readme(content, library_name)
-            if filename:
-                successful_downloads += 1
-                if is_new:
-                    new_files += 1
-                else:
-                    unchanged_files += 1
-            else:
-                failed_downloads += 1
-        else:
+        if content is None:
             print(f"  ✗ Skipping {library_name} (README not found)")
-            failed_downloads += 1
+            span.set_error("README not found")
+            return 'failed', ""
+
+        # Save README file with ID-prefixed content hash
+        content_hash, filename, is_new = save_readme(content, library_name)
+        if not filename:
+            span.set_error("README not saved")
+            return 'failed', ""
+        status = 'new' if is_new else 'unchanged'
+        span.set_attribute("refresh.status", status)
+        if journal is not None:
+            journal.record(commit_sha, library_name, blob_sha, filename, status)
+        return status, filename
 
-        # Rate limiting - sleep between requests except for the last one
-        if i < len(libraries) - 1:
+
+def fetch_library_readmes(github_client: GitHubClient, jobs: List[Tuple[str, str, str, str]], delay: float = 0.0,
+                          workers: int = 1, index: Optional[Dict[str, Dict[str, str]]] = None,
+                          journal: Optional[CheckpointJournal] = None) -> List[Tuple[str, str]]:
+    """
+    Download and save READMEs for a list of jobs: (commit_sha, library_name, readme_path, blob_sha).
+    Returns one (status, filename) tuple per job, in job order.
+    """
+    if workers > 1:
+        print(f"Downloading concurrently with {workers} workers...")
+
+        def worker(job):
+            commit_sha, library_name, readme_path, blob_sha = job
+            status, filename = process_library_readme(github_client, commit_sha, library_name, readme_path, blob_sha,
+                                                      index, journal)
+            if status not in ('indexed', 'resumed'):
+                time.sleep(delay)
+            return status, filename
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="readmes") as executor:
+            return list(executor.map(tracer.wrap(worker), jobs))
+
+    results = []
+    requested = False
+    for i, (commit_sha, library_name, readme_path, blob_sha) in enumerate(jobs):
+        # Rate limiting - sleep between requests
+        if requested:
             time.sleep(delay)
+        print(f"[{i+1}/{len(jobs)}] Processing {library_name}")
+        result = process_library_readme(github_client, commit_sha, library_name, readme_path, blob_sha, index, journal)
+        results.append(result)
+        requested = result[0] not in ('indexed', 'resumed')
+    return results
 
+
+def count_statuses(statuses: List[str]) -> Tuple[int, int, int, int]:
+    """Turn per-library statuses into (successful, new, unchanged, failed) counters."""
+    new_files = statuses.count('new')
+    unchanged_files = statuses.count('unchanged') + statuses.count('indexed') + statuses.count('resumed')
+    failed_downloads = statuses.count('failed')
+    successful_downloads = new_files + unchanged_files
     return successful_downloads, new_files, unchanged_files, failed_downloads
 
 
+def process_readmes(github_client: GitHubClient, commit_sha: str, libraries: List[Tuple[str, str, str]], delay: float = 0.0, workers: int = 1,
+                    use_index: bool = True, readme_files: Optional[Dict[str, str]] = None,
+                    journal: Optional[CheckpointJournal] = None):
+    """
+    Process README files for all libraries using GitHub API.
+    Downloads and saves all README files with ID-prefixed content hashing.
+
+    With workers > 1 the downloads run on a bounded thread pool sharing the
+    client's session; each worker still waits `delay` seconds between its requests.
+
+    With use_index, READMEs whose blob SHA matches data/library_readme_index.json
+    are skipped without a request, and the index is updated afterwards.
+
+    With a checkpoint journal, libraries an interrupted or parallel run already
+    finished for this commit are skipped without a request.
+
+    If readme_files is given, it is filled with library -> saved filename.
+    """
+    print(f"\nProcessing {len(libraries)} libraries...")
+    if delay:
+        print(f"Using {delay}s delay between requests...")
+
+    index = load_readme_index() if use_index else None
+    jobs = [(commit_sha, library_name, readme_path, blob_sha) for library_name, readme_path, blob_sha in libraries]
+    results = fetch_library_readmes(github_client, jobs, delay, workers, index, journal)
+
+    for (library_name, _, blob_sha), (status, filename) in zip(libraries, results):
+        if not filename:
+            continue
+        if readme_files is not None:
+            readme_files[library_name] = filename
+        if index is not None and blob_sha:
+            index[library_name] = {"blob_sha": blob_sha, "filename": filename}
+
+    if index is not None:
+        save_readme_index(index)
+
+    return count_statuses([status for status, _ in results])
+
+
+def get_readme_manifest_path() -> Path:
+    """Get the path of the README manifest kept next to the README directory."""
+    return get_readme_dir().parent / "library_readme_manifest.json"
+
+
+def manifest_version_key(version: str) -> Tuple[int, List[int]]:
+    """Order manifest versions; non-numeric ones (main, latest) sort newest."""
+    parts = version.split('.')
+    if all(part.isdigit() for part in parts):
+        return 0, [int(part) for part in parts]
+    return 1, []
+
+
+def load_readme_manifest() -> Dict:
+    """
+    Load the README manifest:
+    {"current": {library: filename}, "versions": {version: {"source", "commit_sha", "readmes"}}}.
+    """
+    manifest_path = get_readme_manifest_path()
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+    except (IOError, ValueError) as e:
+        print(f"Warning: could not read README manifest {manifest_path}: {e}")
+        manifest = {}
+    manifest.setdefault("current", {})
+    manifest.setdefault("versions", {})
+    return manifest
+
+
+def save_version_manifest(version: str, source: str, commit_sha: str, readme_files: Dict[str, str]):
+    """
+    Record which hashed README applies to each library in a version, and
+    refresh "current" from the newest recorded version. Written atomically.
+    """
+    manifest = load_readme_manifest()
+    manifest["versions"][version] = {
+        "source": source,
+        "commit_sha": commit_sha,
+        "readmes": dict(sorted(readme_files.items())),
+    }
+    newest = max(manifest["versions"], key=manifest_version_key)
+    manifest["current"] = manifest["versions"][newest]["readmes"]
+    manifest["versions"] = dict(sorted(manifest["versions"].items(), key=lambda item: manifest_version_key(item[0])))
+
+    manifest_path = get_readme_manifest_path()
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, manifest_path)
+    except IOError as e:
+        print(f"Error saving README manifest for {version}: {e}")
+        return
+    update_search_index()
+
+
+_search_index_module = None
+
+
+def update_search_index():
+    """
+    Fold README files saved under new content hashes (and the manifest's
+    versions) into the search index. Only new README files are tokenized; see
+    search-index.py.
+    """
+    global _search_index_module
+    if _search_index_module is None:
+        _search_index_module = load_script("search-index")
+    with tracer.span("search index"):
+        _search_index_module.update_index()
+
+
+def uncovered_snapshot_versions(manifest: Dict) -> List[str]:
+    """
+    Return the snapshot versions (instrumentation-list-*.yaml) up to the newest
+    release in the manifest that have no release recorded in it. The V2 data
+    still resolves their READMEs from files the manifest does not list. Newer
+    snapshots, such as the synthetic 3.0, use "current".
+    """
+    releases = [version for version in manifest["versions"] if manifest_version_key(version)[0] == 0]
+    minors = {".".join(release.split(".")[:2]) for release in releases}
+    newest = max((version_key(release) for release in releases), default=None)
+    return [
+        version for version, _ in list_snapshots(get_readme_dir().parent.parent)
+        if version not in minors and (newest is None or version_key(version) <= newest)
+    ]
+
+
+def collect_readme_garbage(dry_run: bool = False) -> bool:
+    """
+    Delete README files that no version in the manifest references, and drop
+    blob index entries that point at them. Refuses to run until the manifest
+    covers every snapshot version, since until then it does not know every
+    README in use.
+    """
+    manifest = load_readme_manifest()
+    if not manifest["versions"]:
+        print("README manifest has no versions yet; skipping garbage collection")
+        return False
+    uncovered = uncovered_snapshot_versions(manifest)
+    if uncovered:
+        print(f"README manifest has no release for {', '.join(uncovered)}; skipping garbage collection. "
+              f"Backfill them first, e.g. --versions {uncovered[0]}..{uncovered[-1]}")
+        return False
+
+    referenced = {filename for entry in manifest["versions"].values() for filename in entry["readmes"].values()}
+    removed = get_readme_store().gc(referenced, dry_run=dry_run)
+
+    verb = "Would remove" if dry_run else "Removed"
+    for filename in removed:
+        print(f"  {verb}: {filename}")
+    print(f"{verb} {len(removed)} unreferenced README files, kept {len(referenced)}")
+
+    if removed and not dry_run:
+        index = load_readme_index()
+        stale = [library for library, entry in index.items() if entry.get("filename") in removed]
+        if stale:
+            for library in stale:
+                del index[library]
+            save_readme_index(index)
+    if removed and not dry_run:
+        update_search_index()
+    return True
+
+
+def expand_version_spec(spec: str) -> List[str]:
+    """
+    Expand a comma-separated list and/or minor-version ranges into release tags.
+    e.g. "2.19..2.21" -> ["v2.19.0", "v2.20.0", "v2.21.0"]; "v2.22.1,2.23" -> ["v2.22.1", "v2.23.0"]
+    """
+    tags = []
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        if ".." in part:
+            start, end = (x.strip().lstrip('v') for x in part.split("..", 1))
+            start_major, start_minor = (int(x) for x in start.split(".")[:2])
+            end_major, end_minor = (int(x) for x in end.split(".")[:2])
+            if start_major != end_major:
+                raise ValueError(f"Version ranges must stay within one major version: {part}")
+            tags.extend(f"v{start_major}.{minor}.0" for minor in range(start_minor, end_minor + 1))
+        elif re.fullmatch(r"v?\d+\.\d+", part):
+            tags.append(f"v{part.lstrip('v')}.0")
+        else:
+            tags.append(part)
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(tags))
+
+
+def resolve_tag_commit_sha(github_client: GitHubClient, version_or_tag: str) -> Optional[str]:
+    """Resolve a tag to a commit SHA, retrying with a 'v' prefix if needed."""
+    repo = "open-telemetry/opentelemetry-java-instrumentation"
+
+    prefixed_tag = f"v{version_or_tag}" if not version_or_tag.startswith('v') else version_or_tag
+
+    # Check both spellings in the tag index before relisting tags or asking the API
+    if github_client._tag_index_ready(repo):
+        commit_sha = github_client.tag_index.lookup(repo, version_or_tag) or github_client.tag_index.lookup(repo, prefixed_tag)
+        if commit_sha:
+            return commit_sha
+
+    # Try to get commit SHA from tag first
+    print(f"Fetching commit SHA for tag: {version_or_tag}")
+    commit_sha = github_client.get_commit_sha_for_tag(repo, version_or_tag)
+
+    if not commit_sha:
+        # If tag doesn't exist, try with 'v' prefix
+        print(f"Tag not found, trying with prefix: {prefixed_tag}")
+        commit_sha = github_client.get_commit_sha_for_tag(repo, prefixed_tag)
+
+    return commit_sha
+
+
+def process_multiple_versions(github_client: GitHubClient, tags: List[str], workers: int = 1, use_index: bool = True,
+                              delay: float = 0.0, tree_mode: str = "subtree",
+                              journal: Optional[CheckpointJournal] = None) -> bool:
+    """
+    Process README files for several versions at once.
+    Tags are resolved and their trees discovered concurrently; each unique README
+    (library + blob SHA) is downloaded once across all versions, and a manifest is
+    written per version.
+    """
+    print(f"\n{'='*60}")
+    print(f"Processing {len(tags)} versions: {', '.join(tags)}")
+    print(f"{'='*60}")
+
+    def resolve(tag):
+        commit_sha = resolve_tag_commit_sha(github_client, tag)
+        if not commit_sha:
+            print(f"Error: Could not resolve tag {tag}")
+            return tag, None, []
+        return tag, commit_sha, discover_library_readmes(github_client, commit_sha, tree_mode)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tags))), thread_name_prefix="readmes") as executor:
+        resolved = list(executor.map(tracer.wrap(resolve), tags))
+
+    # Deduplicate README fetches across versions by (library, blob SHA)
+    unique_jobs: Dict[Tuple[str, str], Tuple[str, str, str, str]] = {}
+    references = 0
+    for tag, commit_sha, libraries in resolved:
+        for library_name, readme_path, blob_sha in libraries:
+            references += 1
+            key = (library_name, blob_sha or f"{commit_sha}:{readme_path}")
+            unique_jobs.setdefault(key, (commit_sha, library_name, readme_path, blob_sha))
+
+    print(f"\n{references} README references across {len(tags)} versions, {len(unique_jobs)} unique")
+
+    index = load_readme_index() if use_index else None
+    results = dict(zip(unique_jobs.keys(), fetch_library_readmes(github_client, list(unique_jobs.values()), delay, workers,
+                                                                 index, journal)))
+
+    all_ok = True
+    for tag, commit_sha, libraries in resolved:
+        if not commit_sha:
+            all_ok = False
+            continue
+
+        readme_files = {}
+        statuses = []
+        for library_name, readme_path, blob_sha in libraries:
+            status, filename = results[(library_name, blob_sha or f"{commit_sha}:{readme_path}")]
+            statuses.append(status)
+            if filename:
+                readme_files[library_name] = filename
+                # Later versions in the list win, so the index tracks the newest README
+                if index is not None and blob_sha:
+                    index[library_name] = {"blob_sha": blob_sha, "filename": filename}
+
+        clean_version = tag.lstrip('v')
+        save_version_manifest(clean_version, tag, commit_sha, readme_files)
+        print(f"\nVersion {clean_version}:")
+        print_summary(tag, commit_sha, *count_statuses(statuses))
+
+    if index is not None:
+        save_readme_index(index)
+
+    new_files = sum(1 for status, _ in results.values() if status == 'new')
+    print(f"\nDownloaded {sum(1 for status, _ in results.values() if status in ('new', 'unchanged'))} unique READMEs "
+          f"({new_files} new), skipped {sum(1 for status, _ in results.values() if status == 'indexed')} by blob SHA"
+          f" and {sum(1 for status, _ in results.values() if status == 'resumed')} already finished")
+    print("- Manifest saved to: data/library_readme_manifest.json")
+    return all_ok
 
 
 def parse_arguments():
@@ -283,16 +975,154 @@ def parse_arguments():
         type=str, 
         help="Version/tag to process (e.g., 'v2.9.0', '2.19'). If not specified, uses latest release."
     )
+    parser.add_argument(
+        "--versions",
+        type=str,
+        help="Comma-separated versions/tags and/or minor ranges to backfill together "
+             "(e.g., '2.19..2.25' or 'v2.20.0,v2.21.1')."
+    )
     parser.add_argument(
         "--commit-sha",
         type=str,
         help="Specific commit SHA to use. Overrides version/tag if specified."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent README downloads (default: 1, sequential)."
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.0,
+        help="Extra seconds to wait between README requests (per worker), on top of the "
+             "rate-limit scheduler's pacing (default: 0)."
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Download one repository tarball and extract the READMEs instead of one API call per README."
+    )
+    parser.add_argument(
+        "--archive",
+        type=str,
+        help="Read READMEs from a local repository tarball or zipball instead of GitHub."
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Ignore data/library_readme_index.json and download every README."
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-http"),
+        help="Directory for the conditional-request HTTP cache (default: .cache/github-http)."
+    )
+    parser.add_argument(
+        "--tree-mode",
+        choices=("subtree", "recursive"),
+        default="subtree",
+        help="How to discover READMEs: walk only instrumentation/, reusing unchanged subtrees from the tree "
+             "cache (subtree, default), or list the whole repository at once (recursive; falls back to the "
+             "walk if GitHub truncates the listing)."
+    )
+    parser.add_argument(
+        "--tree-cache",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-trees.json"),
+        help="File caching the README candidates of each tree SHA (default: .cache/github-trees.json)."
+    )
+    parser.add_argument(
+        "--tag-index",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "github-tags.json"),
+        help="File indexing every tag's commit SHA and the latest release (default: .cache/github-tags.json)."
+    )
+    parser.add_argument(
+        "--tag-index-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds before the tag index is listed again (default: 3600). Unknown tags always trigger a listing."
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=100,
+        help="Maximum size of the HTTP cache in MB before old entries are evicted (default: 100)."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the conditional-request HTTP cache, the tree cache and the tag index."
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=str(Path(__file__).parent.parent / ".cache" / "readme-checkpoints"),
+        help="Directory of per-commit journals of finished libraries, used to resume interrupted runs "
+             "(default: .cache/readme-checkpoints)."
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not resume from or write to the checkpoint journal."
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="After processing, delete README files no version in data/library_readme_manifest.json references."
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        help="Write OTLP/JSON spans for the run (requests, tree discovery, README fetch/save) to this file."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: poll the latest release with conditional requests and fetch the READMEs of each "
+             "new release (ignores --version/--versions)."
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between polls in --watch mode (default: 300)."
+    )
+    parser.add_argument(
+        "--polls",
+        type=int,
+        default=None,
+        help="Stop --watch mode after this many polls (default: run until interrupted)."
+    )
+    parser.add_argument(
+        "--gc-dry-run",
+        action="store_true",
+        help="Only list the README files garbage collection would delete; nothing is downloaded."
+    )
     
     return parser.parse_args()
 
 
-def process_single_version(github_client: GitHubClient, version_or_tag: str, commit_sha: str = None):
+def print_summary(source: str, commit_sha: Optional[str], successful_downloads: int, new_files: int,
+                  unchanged_files: int, failed_downloads: int):
+    """Print the counters of a README run."""
+    print(f"- Source: {source}")
+    if commit_sha:
+        print(f"- Commit SHA: {commit_sha[:8]}...")
+    print(f"- Libraries processed: {successful_downloads + failed_downloads}")
+    print(f"- Successful downloads: {successful_downloads}")
+    print(f"  - New/changed files: {new_files}")
+    print(f"  - Unchanged files: {unchanged_files}")
+    print(f"- Failed downloads: {failed_downloads}")
+    print(f"- Files saved to: data/library_readme/")
+
+
+def process_single_version(github_client: GitHubClient, version_or_tag: str, commit_sha: str = None, workers: int = 1,
+                           use_index: bool = True, bulk: bool = False, delay: float = 0.0, tree_mode: str = "subtree",
+                           journal: Optional[CheckpointJournal] = None):
     """Process README files for a single version/tag."""
     repo = "open-telemetry/opentelemetry-java-instrumentation"
     
@@ -303,15 +1133,7 @@ def process_single_version(github_client: GitHubClient, version_or_tag: str, com
     # Get commit SHA if not provided
     if not commit_sha:
         if version_or_tag:
-            # Try to get commit SHA from tag first
-            print(f"Fetching commit SHA for tag: {version_or_tag}")
-            commit_sha = github_client.get_commit_sha_for_tag(repo, version_or_tag)
-            
-            if not commit_sha:
-                # If tag doesn't exist, try with 'v' prefix
-                prefixed_tag = f"v{version_or_tag}" if not version_or_tag.startswith('v') else version_or_tag
-                print(f"Tag not found, trying with prefix: {prefixed_tag}")
-                commit_sha = github_client.get_commit_sha_for_tag(repo, prefixed_tag)
+            commit_sha = resolve_tag_commit_sha(github_client, version_or_tag)
         
         if not commit_sha:
             print("Tag not found, falling back to latest commit from main branch...")
@@ -325,9 +1147,32 @@ def process_single_version(github_client: GitHubClient, version_or_tag: str, com
     
     # Extract version for directory naming (remove 'v' prefix if present)
     clean_version = version_or_tag.lstrip('v') if version_or_tag else "latest"
+
+    if bulk:
+        # One streamed archive download instead of a contents request per README
+        print("Streaming repository archive...")
+        stream = github_client.open_archive(repo, commit_sha)
+        if stream is None:
+            print("Error: Could not download repository archive")
+            return False
+        readme_files = {}
+        try:
+            with tracer.span("archive extract", **{"vcs.ref.head.revision": commit_sha}) as span:
+                counters = process_archive_readmes(iter_archive_readmes(stream), use_index, readme_files)
+                span.set_attribute("refresh.readmes", counters[0] + counters[3])
+        except tarfile.TarError as e:
+            print(f"Error reading repository archive: {e}")
+            return False
+        finally:
+            stream.close()
+        save_version_manifest(clean_version, version_or_tag, commit_sha, readme_files)
+
+        print(f"\nREADME download process complete for version {clean_version}!")
+        print_summary(version_or_tag, commit_sha, *counters)
+        return True
     
     # Discover library README files
-    libraries = discover_library_readmes(github_client, commit_sha)
+    libraries = discover_library_readmes(github_client, commit_sha, tree_mode)
     if not libraries:
         print("No library README files found")
         return False
@@ -335,32 +1180,22 @@ def process_single_version(github_client: GitHubClient, version_or_tag: str, com
     print(f"Found {len(libraries)} library README files to process")
 
     # Process README files
-    successful_downloads, new_files, unchanged_files, failed_downloads = process_readmes(github_client, commit_sha, libraries)
+    readme_files = {}
+    successful_downloads, new_files, unchanged_files, failed_downloads = process_readmes(
+        github_client, commit_sha, libraries, delay=delay, workers=workers, use_index=use_index, readme_files=readme_files,
+        journal=journal)
+    save_version_manifest(clean_version, version_or_tag, commit_sha, readme_files)
 
     print(f"\nREADME download process complete for version {clean_version}!")
-    print(f"- Source: {version_or_tag}")
-    print(f"- Commit SHA: {commit_sha[:8]}...")
-    print(f"- Libraries processed: {len(libraries)}")
-    print(f"- Successful downloads: {successful_downloads}")
-    print(f"  - New/changed files: {new_files}")
-    print(f"  - Unchanged files: {unchanged_files}")
-    print(f"- Failed downloads: {failed_downloads}")
-    print(f"- Files saved to: data/library_readme/")
+    print_summary(version_or_tag, commit_sha, successful_downloads, new_files, unchanged_files, failed_downloads)
 
     return True
 
 
-def main():
-    """Main function to orchestrate the README download process."""
-    print("Starting library README download process...")
-    
-    # Parse command line arguments
-    args = parse_arguments()
-    
-    # Initialize GitHub client
-    github_client = GitHubClient()
+def process_latest_or_single_version(github_client: GitHubClient, args, journal: Optional[CheckpointJournal] = None):
+    """Process the version given on the command line, or the latest release."""
     repo = "open-telemetry/opentelemetry-java-instrumentation"
-    
+
     # Determine version/tag to process
     version_or_tag = args.version
     commit_sha = args.commit_sha
@@ -374,14 +1209,111 @@ def main():
             version_or_tag = "main"
     
     # Process the specified version/tag
-    process_single_version(github_client, version_or_tag, commit_sha)
+    process_single_version(github_client, version_or_tag, commit_sha, workers=args.workers,
+                           use_index=not args.no_index, bulk=args.bulk, delay=args.delay, tree_mode=args.tree_mode,
+                           journal=journal)
+
+
+def watch_releases(github_client: GitHubClient, args, journal: Optional[CheckpointJournal] = None):
+    """
+    Poll the latest release with conditional requests through the client (sharing
+    its session, rate-limit scheduler, caches and tag index), and fetch the READMEs
+    of each release that appears. Between releases a poll is a single 304.
+    """
+    repo = "open-telemetry/opentelemetry-java-instrumentation"
+    poller = ConditionalPoller(github_client._send)
+    url = f"{github_client.base_url}/repos/{repo}/releases/latest"
+    state = {"tag": None}
+
+    def poll():
+        response = poller.poll(url)
+        tag = response.json().get("tag_name") if response is not None else None
+        if not tag or tag == state["tag"]:
+            return None
+        state["tag"] = tag
+        print(f"\nLatest release: {tag}")
+        return tag
+
+    def refresh(tag):
+        github_client.invalidate_tag_index(repo)
+        if not process_single_version(github_client, tag, workers=args.workers, use_index=not args.no_index,
+                                      bulk=args.bulk, delay=args.delay, tree_mode=args.tree_mode, journal=journal):
+            raise RuntimeError(f"README update for {tag} failed")
+        if args.gc:
+            print("\nCollecting unreferenced README files...")
+            with tracer.span("readme gc"):
+                collect_readme_garbage()
+
+    def report():
+        poller.report()
+        github_client.scheduler.report()
+
+    watch("the latest release", poll, refresh, args.interval, args.polls, report)
+
+
+def main():
+    """Main function: run the README download, traced when --trace-file is given."""
+    args = parse_arguments()
+    with trace_to_file(args.trace_file, "update-library-readmes"):
+        run_readme_update(args)
+
+
+def run_readme_update(args):
+    """Orchestrate the README download process."""
+    print("Starting library README download process...")
+
+    if args.gc_dry_run:
+        collect_readme_garbage(dry_run=True)
+        return
     
+    if args.archive:
+        process_local_archive(Path(args.archive), use_index=not args.no_index)
+        print(f"\n{'='*60}")
+        print("PROCESS COMPLETE")
+        print(f"{'='*60}")
+        return
+
+    # Initialize GitHub client
+    cache = None if args.no_cache else HTTPCache(Path(args.cache_dir), max_bytes=args.cache_max_mb * 1024 * 1024)
+    tree_cache = TreeCache(None if args.no_cache else Path(args.tree_cache))
+    tag_index = None if args.no_cache else TagIndex(Path(args.tag_index), ttl=args.tag_index_ttl)
+    github_client = GitHubClient(pool_size=max(args.workers, 10), cache=cache, tree_cache=tree_cache,
+                                 tag_index=tag_index)
+    journal = CheckpointJournal(None if args.no_checkpoint else Path(args.checkpoint_dir))
+
+    if args.watch:
+        watch_releases(github_client, args, journal)
+        return
+    
+    if args.versions:
+        try:
+            tags = expand_version_spec(args.versions)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        process_multiple_versions(github_client, tags, workers=args.workers, use_index=not args.no_index,
+                                  delay=args.delay, tree_mode=args.tree_mode, journal=journal)
+    else:
+        process_latest_or_single_version(github_client, args, journal)
+
+    if args.gc:
+        print("\nCollecting unreferenced README files...")
+        with tracer.span("readme gc"):
+            collect_readme_garbage()
+
     print(f"\n{'='*60}")
     print("PROCESS COMPLETE")
     print(f"{'='*60}")
     print("All README files have been downloaded to the data directory.")
     print("Use 'git diff' to check for changes and create a PR if needed.")
 
+    print()
+    github_client.scheduler.report()
+    journal.report()
+    if cache:
+        print()
+        cache.report()
+
 
 if __name__ == "__main__":
     main()